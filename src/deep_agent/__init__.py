@@ -3,12 +3,25 @@
 A production-grade research agent built with DeepAgents and Ollama.
 """
 
+import importlib
+from typing import TYPE_CHECKING, Any
+
 from deep_agent.config.settings import Settings
 from deep_agent.config.constants import DEFAULT_SYSTEM_PROMPT
-from deep_agent.core.agent import AgentFactory, create_agent
-from deep_agent.storage.chroma import ChromaStorage, initialize_chroma
 
-__version__ = "0.1.0"
+# The agent factory pulls in DeepAgents and the model clients, and the Chroma
+# helpers pull in chromadb; both load on first use so `import deep_agent` is fast.
+_LAZY_EXPORTS = {
+    "AgentFactory": "deep_agent.core.agent",
+    "create_agent": "deep_agent.core.agent",
+    "ChromaStorage": "deep_agent.storage.chroma",
+    "initialize_chroma": "deep_agent.storage.chroma",
+}
+
+if TYPE_CHECKING:
+    from deep_agent.core.agent import AgentFactory, create_agent
+    from deep_agent.storage.chroma import ChromaStorage, initialize_chroma
+
 __all__ = [
     "Settings",
     "DEFAULT_SYSTEM_PROMPT",
@@ -17,3 +30,15 @@ __all__ = [
     "ChromaStorage",
     "initialize_chroma",
 ]
+
+
+def __getattr__(name: str) -> Any:
+    if name in _LAZY_EXPORTS:
+        value = getattr(importlib.import_module(_LAZY_EXPORTS[name]), name)
+        globals()[name] = value
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def __dir__() -> list[str]:
+    return sorted(set(globals()) | set(__all__))
@@ -5,6 +5,11 @@ from deep_agent.config.settings import (
     BackendConfig,
     OllamaConfig,
     LoggingConfig,
+    SearchConfig,
+    ScraperConfig,
+    BrowserToolsConfig,
+    CheckpointerConfig,
+    ToolRetrievalConfig,
 )
 from deep_agent.config.models import (
     AgentConfig,
@@ -18,6 +23,11 @@ __all__ = [
     "AgentConfig",
     "BackendConfig",
     "LoggingConfig",
+    "SearchConfig",
+    "ScraperConfig",
+    "BrowserToolsConfig",
+    "CheckpointerConfig",
+    "ToolRetrievalConfig",
     "ModelConfig",
     "DEFAULT_SYSTEM_PROMPT",
 ]
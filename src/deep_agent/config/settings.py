@@ -3,7 +3,7 @@ Configuration management using Pydantic settings.
 Loads from environment variables with validation.
 """
 
-from typing import Optional
+from typing import Literal, Optional
 from pydantic import BaseModel, Field
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
@@ -20,6 +20,8 @@ class OllamaConfig(BaseModel):
     temperature_planning: float = 0.0
     temperature_execution: float = 0.1
 
+    embedding_model_name: str = "nomic-embed-text:latest"
+
 
 class BackendConfig(BaseModel):
     """Backend configuration."""
@@ -27,6 +29,106 @@ class BackendConfig(BaseModel):
     type: str = "state"
     persist_directory: str = "./data/chroma"
     routes: Optional[dict] = None
+    vector_store: Literal["chroma", "numpy"] = "chroma"
+    vector_dtype: Literal["float32", "float16"] = "float32"
+
+
+class SearchConfig(BaseModel):
+    """Semantic search configuration."""
+
+    max_open_collections: int = 32
+    embedding_cache_size: int = 10_000
+
+    index_batch_size: int = 64
+    index_max_concurrency: int = 4
+    upsert_chunk_size: int = 256
+    index_queue_size: int = 64
+    index_queue_workers: int = 1
+    index_queue_timeout: float = 30.0
+
+    chunk_size: int = 1500
+    chunk_overlap: int = 200
+    dedup_threshold: float = 0.9
+
+    result_cache_size: int = 1024
+    result_cache_ttl: float = 300.0
+    max_fanout_concurrency: int = 8
+    snippet_chars: int = 300
+    stats_cache_ttl: float = 60.0
+
+
+class ScraperConfig(BaseModel):
+    """Web scraper configuration."""
+
+    headless: bool = True
+    crawler_pool_size: int = 2
+    max_pages_per_crawler: int = 50
+    max_memory_percent: float = 85.0
+
+    cache_enabled: bool = True
+    cache_path: str = "./data/scrape_cache.sqlite3"
+    cache_ttl: float = 86_400.0
+    cache_domain_ttls: dict[str, float] = Field(default_factory=dict)
+    cache_max_bytes: int = 256 * 1024 * 1024
+    revalidate_timeout: float = 10.0
+
+    batch_max_urls: int = 20
+    batch_max_concurrency: int = 5
+    batch_per_domain_limit: int = 2
+    batch_domain_delay: float = 0.5
+    url_timeout: float = 60.0
+
+    # Token budgets for returned content; 0 returns pages in full.
+    max_tokens: int = 4000
+    batch_max_tokens: int = 12000
+    full_text_dir: str = "/scrapes"
+
+
+class BrowserToolsConfig(BaseModel):
+    """Playwright browser tools configuration."""
+
+    headless: bool = True
+    max_contexts: int = 8
+    context_ttl: float = 900.0
+    max_pages_per_context: int = 3
+    navigation_timeout: float = 30.0
+
+    # Request blocking for the browser tools and the crawl4ai scraper.
+    block_resources: bool = True
+    blocked_resource_types: list[str] = Field(default_factory=lambda: ["image", "media", "font"])
+    blocked_domains: list[str] = Field(
+        default_factory=lambda: [
+            "doubleclick.net",
+            "googlesyndication.com",
+            "google-analytics.com",
+            "googletagmanager.com",
+            "connect.facebook.net",
+            "hotjar.com",
+            "scorecardresearch.com",
+        ]
+    )
+    wait_until: Literal["commit", "domcontentloaded", "load", "networkidle"] = "domcontentloaded"
+
+
+class CheckpointerConfig(BaseModel):
+    """Agent checkpointer configuration."""
+
+    type: Literal["memory", "sqlite"] = "memory"
+    path: str = "./data/checkpoints.sqlite3"
+    flush_interval: float = 1.0
+    batch_size: int = 256
+    keep_last: int = 20
+    thread_ttl: float = 30 * 86_400.0
+    compact_interval: float = 600.0
+
+
+class ToolRetrievalConfig(BaseModel):
+    """Per-turn tool retrieval configuration."""
+
+    enabled: bool = False
+    top_k: int = 4
+    min_similarity: float = 0.35
+    pinned: list[str] = Field(default_factory=lambda: ["web_scraper", "semantic_search"])
 
 
 class LoggingConfig(BaseModel):
@@ -43,10 +145,20 @@ class Settings(BaseSettings):
     model_config = SettingsConfigDict(
         env_file=".env",
         env_file_encoding="utf-8",
+        # SECTION_FIELD variables, e.g. BACKEND_VECTOR_STORE=numpy or OLLAMA_BASE_URL=...
+        env_nested_delimiter="_",
+        env_nested_max_split=1,
         case_sensitive=False,
         extra="ignore",
     )
 
     ollama: OllamaConfig = Field(default_factory=OllamaConfig)
     backend: BackendConfig = Field(default_factory=BackendConfig)
+    search: SearchConfig = Field(default_factory=SearchConfig)
+    scraper: ScraperConfig = Field(default_factory=ScraperConfig)
+    browser: BrowserToolsConfig = Field(default_factory=BrowserToolsConfig)
+    checkpointer: CheckpointerConfig = Field(default_factory=CheckpointerConfig)
+    tool_retrieval: ToolRetrievalConfig = Field(default_factory=ToolRetrievalConfig)
     logging_config: LoggingConfig = Field(default_factory=LoggingConfig)
+
+    agent_cache_size: int = 16
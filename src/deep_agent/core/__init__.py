@@ -1,6 +1,8 @@
 """Core layer."""
 
-from deep_agent.core.agent import AgentFactory, create_agent
+import importlib
+from typing import TYPE_CHECKING, Any
+
 from deep_agent.core.exceptions import (
     BackendError,
     ConfigurationError,
@@ -9,12 +11,40 @@ from deep_agent.core.exceptions import (
     ToolError,
 )
 
+# AgentFactory imports DeepAgents, LangGraph and the model clients; load it on first use.
+_LAZY_EXPORTS = {
+    "AgentFactory": "deep_agent.core.agent",
+    "AgentCache": "deep_agent.core.agent",
+    "clear_agent_cache": "deep_agent.core.agent",
+    "create_agent": "deep_agent.core.agent",
+    "ToolRetrievalMiddleware": "deep_agent.core.tool_retrieval",
+}
+
+if TYPE_CHECKING:
+    from deep_agent.core.agent import AgentCache, AgentFactory, clear_agent_cache, create_agent
+    from deep_agent.core.tool_retrieval import ToolRetrievalMiddleware
+
 __all__ = [
     "AgentFactory",
+    "AgentCache",
+    "clear_agent_cache",
     "create_agent",
+    "ToolRetrievalMiddleware",
     "BackendError",
     "ConfigurationError",
     "DeepAgentError",
     "ModelError",
     "ToolError",
 ]
+
+
+def __getattr__(name: str) -> Any:
+    if name in _LAZY_EXPORTS:
+        value = getattr(importlib.import_module(_LAZY_EXPORTS[name]), name)
+        globals()[name] = value
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def __dir__() -> list[str]:
+    return sorted(set(globals()) | set(__all__))
@@ -2,30 +2,175 @@
 Agent factory and initialization logic.
 """
 
-from typing import Optional
+import hashlib
+import json
+import re
+import threading
+from collections import OrderedDict
+from typing import Any, Optional
 import uuid
 from langchain_ollama import ChatOllama
+from langgraph.checkpoint.base import BaseCheckpointSaver
 from langgraph.checkpoint.memory import MemorySaver
+from langgraph.config import get_config
+from langgraph.graph.state import CompiledStateGraph
 from langgraph.store.memory import InMemoryStore
 from deepagents import create_deep_agent
-from deepagents.backends import StateBackend, StoreBackend, CompositeBackend
+from deepagents.backends import BackendProtocol, StateBackend, StoreBackend, CompositeBackend
 from deep_agent.config.settings import Settings
 from deep_agent.config.models import AgentConfig, ModelConfig
 from deep_agent.config.constants import DEFAULT_SYSTEM_PROMPT
 from deep_agent.core.exceptions import ModelError, ConfigurationError
+from deep_agent.core.tool_retrieval import ToolRetrievalMiddleware
+from deep_agent.storage.checkpointer import get_checkpointer
 from deep_agent.utils.logging import setup_logging
-from deep_agent.tools.registry import get_available_tools
+from deep_agent.tools.registry import get_tools, log_tool_costs
 from loguru import logger
 
+# Settings that shape the compiled graph; tools read the others when they run.
+_GRAPH_SETTINGS = {"ollama", "backend", "checkpointer", "tool_retrieval"}
+
+_NAMESPACE_UNSAFE = re.compile(r"[^A-Za-z0-9\-_.@+:~]")
+
+
+def memory_namespace(_runtime: Any = None) -> tuple[str, ...]:
+    """Store namespace for ``/memories/`` files of the current run.
+
+    Runs with a ``user_id`` in their configurable share that user's memories
+    across threads; other runs only see the memories of their own thread.
+    """
+    try:
+        configurable = get_config().get("configurable") or {}
+    except RuntimeError:
+        configurable = {}
+    if user_id := configurable.get("user_id"):
+        scope = f"user:{user_id}"
+    else:
+        scope = f"thread:{configurable.get('thread_id') or 'default'}"
+    return ("filesystem", _NAMESPACE_UNSAFE.sub("_", scope))
+
+
+class AgentCache:
+    """Bounded LRU cache of compiled agents keyed by configuration hash.
+
+    A compiled agent holds no per-conversation state of its own (that lives
+    in the checkpointer under each ``thread_id``), so one instance can serve
+    every request with the same configuration.
+    """
+
+    def __init__(self, max_size: int = 16):
+        self.max_size = max_size
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+        self._agents: OrderedDict[str, Any] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[Any]:
+        """Return the cached agent for a key, or None."""
+        with self._lock:
+            agent = self._agents.get(key)
+            if agent is None:
+                self.misses += 1
+                return None
+            self._agents.move_to_end(key)
+            self.hits += 1
+            return agent
+
+    def put(self, key: str, agent: Any) -> Any:
+        """Cache an agent and return the one to use (an earlier entry for the key wins)."""
+        if self.max_size <= 0:
+            return agent
+        with self._lock:
+            agent = self._agents.setdefault(key, agent)
+            self._agents.move_to_end(key)
+            while len(self._agents) > self.max_size:
+                evicted, _ = self._agents.popitem(last=False)
+                self.evictions += 1
+                logger.debug(f"Evicted cached agent {evicted[:12]}")
+            return agent
+
+    def resize(self, max_size: int) -> None:
+        """Change the bound, evicting the least recently used agents beyond it."""
+        with self._lock:
+            self.max_size = max_size
+            while len(self._agents) > max(max_size, 0):
+                self._agents.popitem(last=False)
+                self.evictions += 1
+
+    def invalidate(self, key: str) -> bool:
+        """Drop one cached agent; returns whether it was cached."""
+        with self._lock:
+            return self._agents.pop(key, None) is not None
+
+    def clear(self) -> None:
+        with self._lock:
+            self._agents.clear()
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "size": len(self._agents),
+                "max_size": self.max_size,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+            }
+
+
+_agent_cache: Optional[AgentCache] = None
+_agent_cache_lock = threading.Lock()
+
+
+def get_agent_cache(settings: Optional[Settings] = None) -> AgentCache:
+    """Get the process-wide agent cache, creating it on first use.
+
+    The cache is sized from ``agent_cache_size`` of the settings it is first
+    created with; later settings do not change it. Call
+    :meth:`AgentCache.resize` to change the bound explicitly.
+    """
+    global _agent_cache
+    with _agent_cache_lock:
+        if _agent_cache is None:
+            _agent_cache = AgentCache((settings or Settings()).agent_cache_size)
+        return _agent_cache
+
+
+def clear_agent_cache() -> None:
+    """Drop all cached agents, e.g. after tools or prompts change at runtime."""
+    get_agent_cache().clear()
+
 
 class AgentFactory:
-    """Factory for creating Deep Agents with proper configuration."""
+    """Factory for creating Deep Agents with proper configuration.
+
+    Compiled agents are cached process-wide by a hash of the agent config and
+    the graph-relevant settings, so repeated ``create_agent`` calls with the
+    same configuration return the same agent. Conversations are kept apart by
+    the ``thread_id`` in the run config; ``/memories/`` files are scoped by
+    :func:`memory_namespace`.
+    """
 
-    def __init__(self, settings: Optional[Settings] = None):
+    def __init__(self, settings: Optional[Settings] = None, cache: Optional[AgentCache] = None):
         self.settings = settings or Settings()
+        self.cache = cache or get_agent_cache(self.settings)
         setup_logging(self.settings.logging_config)
 
-    def _create_model(self, config: ModelConfig):
+    def cache_key(self, config: Optional[AgentConfig] = None) -> str:
+        """Stable hash of an agent config and the settings the compiled graph depends on."""
+        payload = {
+            "agent": config.model_dump(mode="json") if config else None,
+            "settings": self.settings.model_dump(mode="json", include=_GRAPH_SETTINGS),
+        }
+        encoded = json.dumps(payload, sort_keys=True, default=repr).encode()
+        return hashlib.sha256(encoded).hexdigest()
+
+    def invalidate(self, config: Optional[AgentConfig] = None) -> bool:
+        """Drop the cached agent for a config; returns whether one was cached."""
+        return self.cache.invalidate(self.cache_key(config))
+
+    def _create_model(self, config: ModelConfig) -> ChatOllama:
         """Create a LangChain model from configuration."""
         if config.provider != "ollama":
             raise ConfigurationError(f"Unsupported model provider: {config.provider}")
@@ -41,31 +186,38 @@ class AgentFactory:
         except Exception as e:
             raise ModelError(f"Failed to create model: {e}")
 
-    def _create_backend_factory(self):
-        """Create a backend factory based on configuration."""
+    def _create_checkpointer(self) -> BaseCheckpointSaver:
+        """Create the checkpointer selected in settings."""
+        checkpointer = get_checkpointer(self.settings)
+        if checkpointer is None:
+            logger.debug("Enabled checkpointer with MemorySaver")
+            return MemorySaver()
+        logger.debug(f"Enabled SQLite checkpointer at {checkpointer.path}")
+        return checkpointer
+
+    def _create_backend(self) -> BackendProtocol:
+        """Create the filesystem backend based on configuration.
+
+        Route values of None in ``backend.routes`` use the store backend.
+        """
         backend_type = self.settings.backend.type
         routes = self.settings.backend.routes
 
         if routes and backend_type == "composite":
-
-            def backend_factory(runtime):
-                backend = CompositeBackend(
-                    default=StateBackend(runtime),
-                    routes={"/memories/": StoreBackend(runtime), **routes},
-                )
-                logger.info(f"Created CompositeBackend with routes: {list(routes.keys())}")
-                return backend
-
-            return backend_factory
+            routes = {"/memories/": None, **routes}
+            backend = CompositeBackend(
+                default=StateBackend(),
+                routes={
+                    prefix: route or StoreBackend(namespace=memory_namespace)
+                    for prefix, route in routes.items()
+                },
+            )
+            logger.info(f"Created CompositeBackend with routes: {list(routes.keys())}")
+            return backend
 
         elif backend_type == "state":
-
-            def backend_factory(runtime):
-                backend = StateBackend(runtime)
-                logger.debug("Using StateBackend for filesystem")
-                return backend
-
-            return backend_factory
+            logger.debug("Using StateBackend for filesystem")
+            return StateBackend()
 
         else:
             raise ConfigurationError(f"Unsupported backend type: {backend_type}")
@@ -73,9 +225,26 @@ class AgentFactory:
     def create_agent(
         self,
         config: Optional[AgentConfig] = None,
-    ):
-        """Create a Deep Agent with specified configuration."""
+        use_cache: bool = True,
+    ) -> CompiledStateGraph:
+        """Create a Deep Agent with specified configuration.
+
+        Returns the cached agent for an identical configuration unless
+        ``use_cache`` is False.
+        """
+        if not use_cache:
+            return self._build_agent(config)
 
+        key = self.cache_key(config)
+        agent: Optional[CompiledStateGraph] = self.cache.get(key)
+        if agent is not None:
+            logger.debug(f"Using cached agent {key[:12]}")
+            return agent
+        agent = self.cache.put(key, self._build_agent(config))
+        return agent
+
+    def _build_agent(self, config: Optional[AgentConfig] = None) -> CompiledStateGraph:
+        """Build and compile a new Deep Agent."""
         try:
             # Create model from settings
             if config and config.model:
@@ -93,8 +262,7 @@ class AgentFactory:
             checkpointer = None
             checkpointer_enabled = config.checkpointer_enabled if config else True
             if checkpointer_enabled:
-                checkpointer = MemorySaver()
-                logger.debug("Enabled checkpointer with MemorySaver")
+                checkpointer = self._create_checkpointer()
 
             # Create store for composite backend
             store = None
@@ -102,18 +270,28 @@ class AgentFactory:
                 store = InMemoryStore()
                 logger.info("Created InMemoryStore for composite backend")
 
-            # Get custom tools
-            custom_tools = get_available_tools()
-            tool_names = [t.name if hasattr(t, "name") else t.__name__ for t in custom_tools]
-            logger.info(f"Loaded {len(custom_tools)} custom tools: {tool_names}")
+            # Get custom tools: names or groups from config.tools, all tools if empty
+            custom_tools = get_tools(config.tools if config else None)
+            log_tool_costs(custom_tools)
+
+            middleware = []
+            if self.settings.tool_retrieval.enabled:
+                middleware.append(
+                    ToolRetrievalMiddleware.from_settings(custom_tools, self.settings)
+                )
+                logger.info(
+                    f"Tool retrieval enabled: top {self.settings.tool_retrieval.top_k} tools "
+                    f"per call, pinned {self.settings.tool_retrieval.pinned}"
+                )
 
             # Create agent
-            agent_kwargs = {
+            agent_kwargs: dict[str, Any] = {
                 "model": model,
                 "system_prompt": config.system_prompt if config else DEFAULT_SYSTEM_PROMPT,
-                "backend": self._create_backend_factory(),
+                "backend": self._create_backend(),
                 "checkpointer": checkpointer,
                 "tools": custom_tools,
+                "middleware": middleware,
             }
 
             if store is not None:
@@ -129,11 +307,20 @@ class AgentFactory:
             logger.error(f"Failed to create agent: {e}")
             raise
 
-    def create_config_for_thread(self, thread_id: Optional[str] = None) -> dict:
-        """Create config dict for a thread."""
+    def create_config_for_thread(
+        self, thread_id: Optional[str] = None, user_id: Optional[str] = None
+    ) -> dict:
+        """Create config dict for a thread.
+
+        With a ``user_id``, the thread shares ``/memories/`` with the user's
+        other threads.
+        """
         if thread_id is None:
             thread_id = str(uuid.uuid4())
-        return {"configurable": {"thread_id": thread_id}}
+        configurable = {"thread_id": thread_id}
+        if user_id is not None:
+            configurable["user_id"] = user_id
+        return {"configurable": configurable}
 
 
 # Convenience function
@@ -0,0 +1,202 @@
+"""
+Per-turn tool retrieval: bind only the tools relevant to the current step.
+"""
+
+import threading
+from typing import Any, Awaitable, Callable, Optional, Sequence
+
+import numpy as np
+from langchain.agents.middleware import AgentMiddleware, ModelRequest, ModelResponse
+from langchain_core.embeddings import Embeddings
+from langchain_core.messages import AIMessage, AnyMessage, HumanMessage
+from langchain_core.tools import BaseTool
+from loguru import logger
+
+from deep_agent.config.settings import Settings, ToolRetrievalConfig
+from deep_agent.tools.registry import tool_schema_tokens
+
+_MAX_QUERY_CHARS = 2000
+
+
+def _message_text(message: AnyMessage) -> str:
+    content = message.content
+    if isinstance(content, list):
+        content = " ".join(
+            part.get("text", "") if isinstance(part, dict) else str(part) for part in content
+        )
+    return str(content).strip()
+
+
+def _latest_query(messages: list[AnyMessage]) -> str:
+    """Text of the latest user or assistant message that has any."""
+    for message in reversed(messages):
+        if isinstance(message, (HumanMessage, AIMessage)):
+            text = _message_text(message)
+            if text:
+                return text[-_MAX_QUERY_CHARS:]
+    return ""
+
+
+def _recent_tool_calls(messages: list[AnyMessage]) -> set[str]:
+    """Tools called by the latest assistant message, so follow-up calls stay possible."""
+    for message in reversed(messages):
+        if isinstance(message, AIMessage):
+            return {call["name"] for call in message.tool_calls}
+    return set()
+
+
+class ToolRetrievalMiddleware(AgentMiddleware):
+    """Bind the top-k tools most similar to the latest message on each model call.
+
+    Only the given tools are candidates; other tools in the request (the
+    built-in filesystem, todo and subagent tools) are always kept. Pinned
+    tools and tools called in the previous step are always bound. When no
+    candidate reaches ``min_similarity``, or embedding fails, the full tool
+    set is bound instead.
+
+    Tool descriptions are embedded once, on first use, and kept in memory.
+    """
+
+    def __init__(
+        self,
+        tools: Sequence[BaseTool],
+        embeddings: Optional[Embeddings] = None,
+        top_k: int = 4,
+        min_similarity: float = 0.35,
+        pinned: Optional[list[str]] = None,
+    ):
+        super().__init__()
+        self._tools = {tool.name: tool for tool in tools}
+        self.top_k = top_k
+        self.min_similarity = min_similarity
+        self.pinned = set(pinned or []) & set(self._tools)
+        self._embeddings = embeddings
+        self._names = [name for name in self._tools if name not in self.pinned]
+        self._vectors: Optional[np.ndarray] = None
+        self._costs = {name: tool_schema_tokens(tool) for name, tool in self._tools.items()}
+        self._lock = threading.Lock()
+        self.calls = 0
+        self.fallbacks = 0
+        self.schema_tokens_saved = 0
+
+    @classmethod
+    def from_settings(
+        cls, tools: Sequence[BaseTool], settings: Optional[Settings] = None
+    ) -> "ToolRetrievalMiddleware":
+        """Create the middleware from application settings."""
+        config: ToolRetrievalConfig = (settings or Settings()).tool_retrieval
+        return cls(
+            tools,
+            top_k=config.top_k,
+            min_similarity=config.min_similarity,
+            pinned=config.pinned,
+        )
+
+    @property
+    def embeddings(self) -> Embeddings:
+        if self._embeddings is None:
+            from deep_agent.storage.pool import get_vectorstore_pool
+
+            self._embeddings = get_vectorstore_pool().embeddings
+        return self._embeddings
+
+    def _tool_texts(self) -> list[str]:
+        return [f"{name}: {self._tools[name].description}" for name in self._names]
+
+    def _set_vectors(self, vectors: list[list[float]]) -> np.ndarray:
+        matrix = np.asarray(vectors, dtype=np.float32)
+        norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+        with self._lock:
+            self._vectors = matrix / np.where(norms == 0, 1, norms)
+        return self._vectors
+
+    def _rank(self, vectors: np.ndarray, query_vector: list[float]) -> Optional[set[str]]:
+        """Names of the retrieved tools, or None to fall back to the full set."""
+        query = np.asarray(query_vector, dtype=np.float32)
+        norm = np.linalg.norm(query)
+        if norm == 0:
+            return None
+        scores = vectors @ (query / norm)
+        order = np.argsort(-scores)[: self.top_k]
+        selected = {self._names[i] for i in order if scores[i] >= self.min_similarity}
+        if not selected:
+            logger.debug(f"No tool above similarity {self.min_similarity}; binding all tools")
+            return None
+        return selected
+
+    def _apply(self, request: ModelRequest, selected: Optional[set[str]]) -> ModelRequest:
+        with self._lock:
+            self.calls += 1
+            if selected is None:
+                self.fallbacks += 1
+                return request
+
+        keep = selected | self.pinned | _recent_tool_calls(request.messages)
+        tools, dropped = [], []
+        for tool in request.tools:
+            name = tool.get("name") if isinstance(tool, dict) else tool.name
+            if name in self._tools and name not in keep:
+                dropped.append(name)
+            else:
+                tools.append(tool)
+
+        saved = sum(self._costs[name] for name in dropped)
+        with self._lock:
+            self.schema_tokens_saved += saved
+        logger.debug(f"Bound tools {sorted(keep & set(self._tools))}; ~{saved} schema tokens saved")
+        return request.override(tools=tools)
+
+    def _candidates(self, request: ModelRequest) -> Optional[str]:
+        if not self._names or len(self._names) <= self.top_k:
+            return None
+        return _latest_query(request.messages) or None
+
+    def wrap_model_call(
+        self,
+        request: ModelRequest,
+        handler: Callable[[ModelRequest], ModelResponse],
+    ) -> ModelResponse:
+        """Narrow the request's tools to the retrieved set before calling the model."""
+        query = self._candidates(request)
+        if query is None:
+            return handler(request)
+
+        selected = None
+        try:
+            vectors = self._vectors
+            if vectors is None:
+                vectors = self._set_vectors(self.embeddings.embed_documents(self._tool_texts()))
+            selected = self._rank(vectors, self.embeddings.embed_query(query))
+        except Exception as e:
+            logger.warning(f"Tool retrieval failed, binding all tools: {e}")
+        return handler(self._apply(request, selected))
+
+    async def awrap_model_call(
+        self,
+        request: ModelRequest,
+        handler: Callable[[ModelRequest], Awaitable[ModelResponse]],
+    ) -> ModelResponse:
+        """Async version of :meth:`wrap_model_call`."""
+        query = self._candidates(request)
+        if query is None:
+            return await handler(request)
+
+        selected = None
+        try:
+            vectors = self._vectors
+            if vectors is None:
+                texts = self._tool_texts()
+                vectors = self._set_vectors(await self.embeddings.aembed_documents(texts))
+            selected = self._rank(vectors, await self.embeddings.aembed_query(query))
+        except Exception as e:
+            logger.warning(f"Tool retrieval failed, binding all tools: {e}")
+        return await handler(self._apply(request, selected))
+
+    def stats(self) -> dict[str, Any]:
+        """Return model calls seen, full-set fallbacks and schema tokens saved."""
+        with self._lock:
+            return {
+                "calls": self.calls,
+                "fallbacks": self.fallbacks,
+                "schema_tokens_saved": self.schema_tokens_saved,
+            }
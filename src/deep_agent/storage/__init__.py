@@ -1,12 +1,102 @@
 """Storage layer."""
 
-from deep_agent.storage.base import StorageBackend
-from deep_agent.storage.chroma import ChromaStorage, initialize_chroma
-from deep_agent.storage.composite import create_composite_backend
+import importlib
+from typing import TYPE_CHECKING, Any
+
+# Submodules import chromadb and numpy; each one loads on first attribute access.
+_LAZY_EXPORTS = {
+    "StorageBackend": "deep_agent.storage.base",
+    "ChromaStorage": "deep_agent.storage.chroma",
+    "CollectionStats": "deep_agent.storage.chroma",
+    "initialize_chroma": "deep_agent.storage.chroma",
+    "SqliteCheckpointer": "deep_agent.storage.checkpointer",
+    "get_checkpointer": "deep_agent.storage.checkpointer",
+    "create_composite_backend": "deep_agent.storage.composite",
+    "chunk_documents": "deep_agent.storage.chunking",
+    "CachedEmbeddings": "deep_agent.storage.embedding_cache",
+    "IndexJob": "deep_agent.storage.index_queue",
+    "IndexQueue": "deep_agent.storage.index_queue",
+    "get_index_queue": "deep_agent.storage.index_queue",
+    "IngestionPipeline": "deep_agent.storage.ingestion",
+    "LexicalIndex": "deep_agent.storage.lexical",
+    "NumpyCollection": "deep_agent.storage.numpy_store",
+    "NumpyStorage": "deep_agent.storage.numpy_store",
+    "VectorStorePool": "deep_agent.storage.pool",
+    "get_vectorstore_pool": "deep_agent.storage.pool",
+    "close_vectorstore_pool": "deep_agent.storage.pool",
+    "QueryResultCache": "deep_agent.storage.result_cache",
+    "ScrapeCache": "deep_agent.storage.scrape_cache",
+    "canonicalize_url": "deep_agent.storage.scrape_cache",
+    "get_scrape_cache": "deep_agent.storage.scrape_cache",
+    "SearchHit": "deep_agent.storage.search",
+    "SearchParams": "deep_agent.storage.search",
+    "search_collection": "deep_agent.storage.search",
+    "search_collections": "deep_agent.storage.search",
+}
+
+if TYPE_CHECKING:
+    from deep_agent.storage.base import StorageBackend
+    from deep_agent.storage.chroma import ChromaStorage, CollectionStats, initialize_chroma
+    from deep_agent.storage.checkpointer import SqliteCheckpointer, get_checkpointer
+    from deep_agent.storage.composite import create_composite_backend
+    from deep_agent.storage.chunking import chunk_documents
+    from deep_agent.storage.embedding_cache import CachedEmbeddings
+    from deep_agent.storage.index_queue import IndexJob, IndexQueue, get_index_queue
+    from deep_agent.storage.ingestion import IngestionPipeline
+    from deep_agent.storage.lexical import LexicalIndex
+    from deep_agent.storage.numpy_store import NumpyCollection, NumpyStorage
+    from deep_agent.storage.pool import (
+        VectorStorePool,
+        get_vectorstore_pool,
+        close_vectorstore_pool,
+    )
+    from deep_agent.storage.result_cache import QueryResultCache
+    from deep_agent.storage.scrape_cache import ScrapeCache, canonicalize_url, get_scrape_cache
+    from deep_agent.storage.search import (
+        SearchHit,
+        SearchParams,
+        search_collection,
+        search_collections,
+    )
 
 __all__ = [
     "StorageBackend",
     "ChromaStorage",
+    "CollectionStats",
     "initialize_chroma",
+    "SqliteCheckpointer",
+    "get_checkpointer",
     "create_composite_backend",
+    "chunk_documents",
+    "CachedEmbeddings",
+    "IndexJob",
+    "IndexQueue",
+    "get_index_queue",
+    "IngestionPipeline",
+    "LexicalIndex",
+    "NumpyCollection",
+    "NumpyStorage",
+    "VectorStorePool",
+    "get_vectorstore_pool",
+    "close_vectorstore_pool",
+    "QueryResultCache",
+    "ScrapeCache",
+    "canonicalize_url",
+    "get_scrape_cache",
+    "SearchHit",
+    "SearchParams",
+    "search_collection",
+    "search_collections",
 ]
+
+
+def __getattr__(name: str) -> Any:
+    if name in _LAZY_EXPORTS:
+        value = getattr(importlib.import_module(_LAZY_EXPORTS[name]), name)
+        globals()[name] = value
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def __dir__() -> list[str]:
+    return sorted(set(globals()) | set(__all__))
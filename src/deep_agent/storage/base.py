@@ -3,7 +3,7 @@ Abstract storage interface for type safety.
 """
 
 from abc import ABC, abstractmethod
-from typing import Any
+from typing import Any, Protocol
 
 
 class StorageBackend(ABC):
@@ -23,3 +23,26 @@ class StorageBackend(ABC):
     def close(self) -> None:
         """Close connections and cleanup."""
         pass
+
+
+class VectorCollection(Protocol):
+    """The subset of the ``chromadb.Collection`` API used by the pool and search tools.
+
+    Implemented by Chroma collections and by ``NumpyCollection``.
+    """
+
+    @property
+    def name(self) -> str: ...
+
+    @property
+    def id(self) -> Any: ...
+
+    def count(self) -> int: ...
+
+    def get(self, *args: Any, **kwargs: Any) -> Any: ...
+
+    def query(self, *args: Any, **kwargs: Any) -> Any: ...
+
+    def upsert(self, *args: Any, **kwargs: Any) -> Any: ...
+
+    def delete(self, *args: Any, **kwargs: Any) -> Any: ...
@@ -0,0 +1,575 @@
+"""
+Durable LangGraph checkpointer on SQLite with batched writes and retention.
+"""
+
+import asyncio
+import atexit
+import os
+import random
+import sqlite3
+import threading
+import time
+from collections.abc import AsyncIterator, Iterator, Sequence
+from typing import Any, Optional
+
+from langchain_core.runnables import RunnableConfig
+from langgraph.checkpoint.base import (
+    WRITES_IDX_MAP,
+    BaseCheckpointSaver,
+    ChannelVersions,
+    Checkpoint,
+    CheckpointMetadata,
+    CheckpointTuple,
+    get_checkpoint_id,
+    get_checkpoint_metadata,
+)
+from loguru import logger
+
+from deep_agent.config.settings import CheckpointerConfig, Settings
+from deep_agent.core.exceptions import BackendError
+
+_SCHEMA = (
+    "CREATE TABLE IF NOT EXISTS checkpoints ("
+    "thread_id TEXT, checkpoint_ns TEXT, checkpoint_id TEXT, parent_checkpoint_id TEXT, "
+    "type TEXT, checkpoint BLOB, metadata_type TEXT, metadata BLOB, "
+    "PRIMARY KEY (thread_id, checkpoint_ns, checkpoint_id))",
+    "CREATE TABLE IF NOT EXISTS blobs ("
+    "thread_id TEXT, checkpoint_ns TEXT, channel TEXT, version TEXT, type TEXT, blob BLOB, "
+    "PRIMARY KEY (thread_id, checkpoint_ns, channel, version))",
+    "CREATE TABLE IF NOT EXISTS writes ("
+    "thread_id TEXT, checkpoint_ns TEXT, checkpoint_id TEXT, task_id TEXT, idx INTEGER, "
+    "channel TEXT, type TEXT, value BLOB, task_path TEXT, "
+    "PRIMARY KEY (thread_id, checkpoint_ns, checkpoint_id, task_id, idx))",
+    "CREATE TABLE IF NOT EXISTS threads (thread_id TEXT PRIMARY KEY, updated_at REAL)",
+    "CREATE INDEX IF NOT EXISTS threads_updated ON threads (updated_at)",
+)
+
+
+class SqliteCheckpointer(BaseCheckpointSaver[str]):
+    """Checkpoint saver that keeps agent threads in a SQLite database (WAL mode).
+
+    Writes are buffered and committed in one transaction every
+    ``flush_interval`` seconds, or as soon as ``batch_size`` statements are
+    pending; reads flush first, so they always see earlier writes. A crash
+    can lose at most the last ``flush_interval`` seconds of checkpoints.
+
+    Channel values are stored once per version, so unchanged state is not
+    copied into every checkpoint. Every ``compact_interval`` seconds a
+    background thread keeps only the newest ``keep_last`` checkpoints of each
+    thread, deletes threads idle for longer than ``thread_ttl`` seconds, and
+    returns the freed pages to the file system.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        flush_interval: float = 1.0,
+        batch_size: int = 256,
+        keep_last: int = 20,
+        thread_ttl: float = 0.0,
+        compact_interval: float = 600.0,
+    ):
+        super().__init__()
+        self.path = path
+        self.flush_interval = flush_interval
+        self.batch_size = batch_size
+        self.keep_last = keep_last
+        self.thread_ttl = thread_ttl
+        self.compact_interval = compact_interval
+        self.flushes = 0
+        self.compactions = 0
+        self.pruned_checkpoints = 0
+        self.expired_threads = 0
+
+        self._conn: Optional[sqlite3.Connection] = None
+        self._pending: list[tuple[str, tuple]] = []
+        self._lock = threading.RLock()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._last_compaction = time.monotonic()
+
+    @classmethod
+    def from_config(cls, config: CheckpointerConfig) -> "SqliteCheckpointer":
+        """Create a checkpointer from checkpointer settings."""
+        return cls(
+            path=config.path,
+            flush_interval=config.flush_interval,
+            batch_size=config.batch_size,
+            keep_last=config.keep_last,
+            thread_ttl=config.thread_ttl,
+            compact_interval=config.compact_interval,
+        )
+
+    @property
+    def conn(self) -> sqlite3.Connection:
+        return self._ensure_open()
+
+    def _ensure_open(self) -> sqlite3.Connection:
+        """Open the database and start the maintenance thread on first use."""
+        with self._lock:
+            if self._conn is None:
+                try:
+                    os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+                    conn = sqlite3.connect(self.path, check_same_thread=False)
+                    # Must precede table creation to take effect on a new database.
+                    conn.execute("PRAGMA auto_vacuum=INCREMENTAL")
+                    conn.execute("PRAGMA journal_mode=WAL")
+                    conn.execute("PRAGMA synchronous=NORMAL")
+                    for statement in _SCHEMA:
+                        conn.execute(statement)
+                    conn.commit()
+                    self._conn = conn
+                    logger.debug(f"Opened checkpoint database: {self.path}")
+                except sqlite3.Error as e:
+                    raise BackendError(f"Failed to open checkpoint database {self.path}: {e}")
+                self._thread = threading.Thread(
+                    target=self._maintain, name="checkpoint-maintenance", daemon=True
+                )
+                self._thread.start()
+            return self._conn
+
+    def _maintain(self) -> None:
+        while not self._stop.wait(self.flush_interval):
+            try:
+                self.flush()
+                if time.monotonic() - self._last_compaction >= self.compact_interval:
+                    self.compact()
+            except Exception as e:
+                logger.warning(f"Checkpoint maintenance failed: {e}")
+
+    def _queue(self, statements: list[tuple[str, tuple]]) -> None:
+        with self._lock:
+            self._ensure_open()
+            self._pending.extend(statements)
+            if len(self._pending) >= self.batch_size:
+                self.flush()
+
+    def flush(self) -> int:
+        """Commit pending writes in one transaction; returns the statements written.
+
+        On failure the writes stay pending and are retried by the next flush.
+        """
+        with self._lock:
+            if not self._pending:
+                return 0
+            try:
+                with self.conn:
+                    for sql, params in self._pending:
+                        self.conn.execute(sql, params)
+            except sqlite3.Error as e:
+                raise BackendError(f"Failed to write checkpoints: {e}")
+            written, self._pending = len(self._pending), []
+            self.flushes += 1
+            return written
+
+    def _load_blobs(self, thread_id: str, checkpoint_ns: str, versions: ChannelVersions) -> dict:
+        values = {}
+        for channel, version in versions.items():
+            row = self.conn.execute(
+                "SELECT type, blob FROM blobs "
+                "WHERE thread_id = ? AND checkpoint_ns = ? AND channel = ? AND version = ?",
+                (thread_id, checkpoint_ns, channel, str(version)),
+            ).fetchone()
+            if row is not None and row[0] != "empty":
+                values[channel] = self.serde.loads_typed((row[0], row[1]))
+        return values
+
+    def _tuple(self, thread_id: str, checkpoint_ns: str, row: tuple) -> CheckpointTuple:
+        checkpoint_id, parent_id, type_, blob, metadata_type, metadata = row
+        checkpoint: Checkpoint = self.serde.loads_typed((type_, blob))
+        writes = self.conn.execute(
+            "SELECT task_id, channel, type, value FROM writes "
+            "WHERE thread_id = ? AND checkpoint_ns = ? AND checkpoint_id = ? "
+            "ORDER BY task_path, task_id, idx",
+            (thread_id, checkpoint_ns, checkpoint_id),
+        ).fetchall()
+        return CheckpointTuple(
+            config={
+                "configurable": {
+                    "thread_id": thread_id,
+                    "checkpoint_ns": checkpoint_ns,
+                    "checkpoint_id": checkpoint_id,
+                }
+            },
+            checkpoint={
+                **checkpoint,
+                "channel_values": self._load_blobs(
+                    thread_id, checkpoint_ns, checkpoint["channel_versions"]
+                ),
+            },
+            metadata=self.serde.loads_typed((metadata_type, metadata)),
+            parent_config=(
+                {
+                    "configurable": {
+                        "thread_id": thread_id,
+                        "checkpoint_ns": checkpoint_ns,
+                        "checkpoint_id": parent_id,
+                    }
+                }
+                if parent_id
+                else None
+            ),
+            pending_writes=[
+                (task_id, channel, self.serde.loads_typed((type_, value)))
+                for task_id, channel, type_, value in writes
+            ],
+        )
+
+    def get_tuple(self, config: RunnableConfig) -> Optional[CheckpointTuple]:
+        """Get the requested checkpoint, or the thread's latest one."""
+        thread_id = config["configurable"]["thread_id"]
+        checkpoint_ns = config["configurable"].get("checkpoint_ns", "")
+        columns = "checkpoint_id, parent_checkpoint_id, type, checkpoint, metadata_type, metadata"
+        with self._lock:
+            self.flush()
+            if checkpoint_id := get_checkpoint_id(config):
+                row = self.conn.execute(
+                    f"SELECT {columns} FROM checkpoints "
+                    "WHERE thread_id = ? AND checkpoint_ns = ? AND checkpoint_id = ?",
+                    (thread_id, checkpoint_ns, checkpoint_id),
+                ).fetchone()
+            else:
+                row = self.conn.execute(
+                    f"SELECT {columns} FROM checkpoints WHERE thread_id = ? AND checkpoint_ns = ? "
+                    "ORDER BY checkpoint_id DESC LIMIT 1",
+                    (thread_id, checkpoint_ns),
+                ).fetchone()
+            return self._tuple(thread_id, checkpoint_ns, row) if row else None
+
+    def list(
+        self,
+        config: Optional[RunnableConfig],
+        *,
+        filter: Optional[dict[str, Any]] = None,
+        before: Optional[RunnableConfig] = None,
+        limit: Optional[int] = None,
+    ) -> Iterator[CheckpointTuple]:
+        """List checkpoints, newest first, optionally filtered by metadata."""
+        clauses, params = [], []
+        if config:
+            clauses.append("thread_id = ?")
+            params.append(config["configurable"]["thread_id"])
+            if (checkpoint_ns := config["configurable"].get("checkpoint_ns")) is not None:
+                clauses.append("checkpoint_ns = ?")
+                params.append(checkpoint_ns)
+            if checkpoint_id := get_checkpoint_id(config):
+                clauses.append("checkpoint_id = ?")
+                params.append(checkpoint_id)
+        if before and (before_id := get_checkpoint_id(before)):
+            clauses.append("checkpoint_id < ?")
+            params.append(before_id)
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+        # Metadata filters are applied after decoding, so only unfiltered queries can limit in SQL
+        limit_sql = ""
+        if limit is not None and not filter:
+            limit_sql = " LIMIT ?"
+            params.append(limit)
+
+        with self._lock:
+            self.flush()
+            rows = self.conn.execute(
+                "SELECT thread_id, checkpoint_ns, checkpoint_id, parent_checkpoint_id, type, "
+                f"checkpoint, metadata_type, metadata FROM checkpoints {where} "
+                f"ORDER BY checkpoint_id DESC{limit_sql}",
+                params,
+            ).fetchall()
+            results: list[CheckpointTuple] = []
+            for thread_id, checkpoint_ns, *row in rows:
+                if limit is not None and len(results) >= limit:
+                    break
+                if filter:
+                    metadata = self.serde.loads_typed((row[4], row[5]))
+                    if not all(metadata.get(key) == value for key, value in filter.items()):
+                        continue
+                results.append(self._tuple(thread_id, checkpoint_ns, tuple(row)))
+        yield from results
+
+    def put(
+        self,
+        config: RunnableConfig,
+        checkpoint: Checkpoint,
+        metadata: CheckpointMetadata,
+        new_versions: ChannelVersions,
+    ) -> RunnableConfig:
+        """Queue a checkpoint and its changed channel values for writing."""
+        thread_id = config["configurable"]["thread_id"]
+        checkpoint_ns = config["configurable"]["checkpoint_ns"]
+        values = checkpoint["channel_values"]
+        stored = {key: value for key, value in checkpoint.items() if key != "channel_values"}
+
+        statements: list[tuple[str, tuple]] = []
+        for channel, version in new_versions.items():
+            type_, blob = (
+                self.serde.dumps_typed(values[channel]) if channel in values else ("empty", b"")
+            )
+            statements.append(
+                (
+                    "INSERT OR REPLACE INTO blobs VALUES (?, ?, ?, ?, ?, ?)",
+                    (thread_id, checkpoint_ns, channel, str(version), type_, blob),
+                )
+            )
+        type_, blob = self.serde.dumps_typed(stored)
+        metadata_type, metadata_blob = self.serde.dumps_typed(
+            get_checkpoint_metadata(config, metadata)
+        )
+        statements.append(
+            (
+                "INSERT OR REPLACE INTO checkpoints VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (
+                    thread_id,
+                    checkpoint_ns,
+                    checkpoint["id"],
+                    config["configurable"].get("checkpoint_id"),
+                    type_,
+                    blob,
+                    metadata_type,
+                    metadata_blob,
+                ),
+            )
+        )
+        statements.append(
+            ("INSERT OR REPLACE INTO threads VALUES (?, ?)", (thread_id, time.time()))
+        )
+        self._queue(statements)
+        return {
+            "configurable": {
+                "thread_id": thread_id,
+                "checkpoint_ns": checkpoint_ns,
+                "checkpoint_id": checkpoint["id"],
+            }
+        }
+
+    def put_writes(
+        self,
+        config: RunnableConfig,
+        writes: Sequence[tuple[str, Any]],
+        task_id: str,
+        task_path: str = "",
+    ) -> None:
+        """Queue intermediate writes of a task for writing."""
+        thread_id = config["configurable"]["thread_id"]
+        checkpoint_ns = config["configurable"].get("checkpoint_ns", "")
+        checkpoint_id = config["configurable"]["checkpoint_id"]
+        statements: list[tuple[str, tuple]] = []
+        for idx, (channel, value) in enumerate(writes):
+            idx = WRITES_IDX_MAP.get(channel, idx)
+            # Special writes (errors, interrupts) replace earlier ones; regular writes don't.
+            verb = "INSERT OR REPLACE" if idx < 0 else "INSERT OR IGNORE"
+            type_, blob = self.serde.dumps_typed(value)
+            statements.append(
+                (
+                    f"{verb} INTO writes VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                    (
+                        thread_id,
+                        checkpoint_ns,
+                        checkpoint_id,
+                        task_id,
+                        idx,
+                        channel,
+                        type_,
+                        blob,
+                        task_path,
+                    ),
+                )
+            )
+        self._queue(statements)
+
+    def delete_thread(self, thread_id: str) -> None:
+        """Delete all checkpoints and writes of a thread."""
+        with self._lock:
+            self.flush()
+            with self.conn:
+                for table in ("checkpoints", "blobs", "writes", "threads"):
+                    self.conn.execute(f"DELETE FROM {table} WHERE thread_id = ?", (thread_id,))
+
+    async def aget_tuple(self, config: RunnableConfig) -> Optional[CheckpointTuple]:
+        return await asyncio.to_thread(self.get_tuple, config)
+
+    async def alist(
+        self,
+        config: Optional[RunnableConfig],
+        *,
+        filter: Optional[dict[str, Any]] = None,
+        before: Optional[RunnableConfig] = None,
+        limit: Optional[int] = None,
+    ) -> AsyncIterator[CheckpointTuple]:
+        items = await asyncio.to_thread(
+            lambda: list(self.list(config, filter=filter, before=before, limit=limit))
+        )
+        for item in items:
+            yield item
+
+    async def aput(
+        self,
+        config: RunnableConfig,
+        checkpoint: Checkpoint,
+        metadata: CheckpointMetadata,
+        new_versions: ChannelVersions,
+    ) -> RunnableConfig:
+        return await asyncio.to_thread(self.put, config, checkpoint, metadata, new_versions)
+
+    async def aput_writes(
+        self,
+        config: RunnableConfig,
+        writes: Sequence[tuple[str, Any]],
+        task_id: str,
+        task_path: str = "",
+    ) -> None:
+        await asyncio.to_thread(self.put_writes, config, writes, task_id, task_path)
+
+    async def adelete_thread(self, thread_id: str) -> None:
+        await asyncio.to_thread(self.delete_thread, thread_id)
+
+    def get_next_version(self, current: Optional[str], channel: None) -> str:
+        if current is None:
+            current_v = 0
+        elif isinstance(current, int):
+            current_v = current
+        else:
+            current_v = int(current.split(".")[0])
+        return f"{current_v + 1:032}.{random.random():016}"
+
+    def _prune(self) -> int:
+        """Drop checkpoints beyond keep_last per thread, with their writes and unused blobs."""
+        rows = self.conn.execute(
+            "SELECT thread_id, checkpoint_ns, checkpoint_id FROM ("
+            "SELECT thread_id, checkpoint_ns, checkpoint_id, ROW_NUMBER() OVER ("
+            "PARTITION BY thread_id, checkpoint_ns ORDER BY checkpoint_id DESC) AS position "
+            "FROM checkpoints) WHERE position > ?",
+            (self.keep_last,),
+        ).fetchall()
+        if not rows:
+            return 0
+
+        with self.conn:
+            self.conn.executemany(
+                "DELETE FROM checkpoints "
+                "WHERE thread_id = ? AND checkpoint_ns = ? AND checkpoint_id = ?",
+                rows,
+            )
+            self.conn.executemany(
+                "DELETE FROM writes "
+                "WHERE thread_id = ? AND checkpoint_ns = ? AND checkpoint_id = ?",
+                rows,
+            )
+            for thread_id in {row[0] for row in rows}:
+                self._collect_blobs(thread_id)
+        return len(rows)
+
+    def _collect_blobs(self, thread_id: str) -> None:
+        referenced: set[tuple[str, str, str]] = set()
+        for checkpoint_ns, type_, blob in self.conn.execute(
+            "SELECT checkpoint_ns, type, checkpoint FROM checkpoints WHERE thread_id = ?",
+            (thread_id,),
+        ).fetchall():
+            versions = self.serde.loads_typed((type_, blob))["channel_versions"]
+            referenced.update((checkpoint_ns, ch, str(v)) for ch, v in versions.items())
+        unused = [
+            (thread_id, *key)
+            for key in self.conn.execute(
+                "SELECT checkpoint_ns, channel, version FROM blobs WHERE thread_id = ?",
+                (thread_id,),
+            ).fetchall()
+            if key not in referenced
+        ]
+        self.conn.executemany(
+            "DELETE FROM blobs "
+            "WHERE thread_id = ? AND checkpoint_ns = ? AND channel = ? AND version = ?",
+            unused,
+        )
+
+    def compact(self) -> dict:
+        """Apply the retention policy now and release free pages to the file system."""
+        with self._lock:
+            self.flush()
+            expired = []
+            if self.thread_ttl > 0:
+                expired = [
+                    row[0]
+                    for row in self.conn.execute(
+                        "SELECT thread_id FROM threads WHERE updated_at < ?",
+                        (time.time() - self.thread_ttl,),
+                    ).fetchall()
+                ]
+                for thread_id in expired:
+                    self.delete_thread(thread_id)
+            pruned = self._prune() if self.keep_last > 0 else 0
+
+            self.conn.execute("PRAGMA incremental_vacuum")
+            self.conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+            self.compactions += 1
+            self.pruned_checkpoints += pruned
+            self.expired_threads += len(expired)
+            self._last_compaction = time.monotonic()
+        if pruned or expired:
+            logger.info(f"Compacted checkpoints: {pruned} pruned, {len(expired)} threads expired")
+        return {"pruned": pruned, "expired_threads": len(expired)}
+
+    def stats(self) -> dict:
+        """Return thread and checkpoint counts, pending writes and maintenance counters."""
+        with self._lock:
+            threads = self.conn.execute("SELECT COUNT(*) FROM threads").fetchone()[0]
+            checkpoints = self.conn.execute("SELECT COUNT(*) FROM checkpoints").fetchone()[0]
+            return {
+                "threads": threads,
+                "checkpoints": checkpoints,
+                "pending": len(self._pending),
+                "flushes": self.flushes,
+                "compactions": self.compactions,
+                "pruned_checkpoints": self.pruned_checkpoints,
+                "expired_threads": self.expired_threads,
+                "bytes": os.path.getsize(self.path) if os.path.exists(self.path) else 0,
+            }
+
+    def close(self) -> None:
+        """Stop maintenance, write pending checkpoints and close the database."""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+        with self._lock:
+            if self._conn is not None:
+                try:
+                    self.flush()
+                finally:
+                    self._conn.close()
+                    self._conn = None
+
+
+# One checkpointer, and the config it was created from, per database file.
+_checkpointers: dict[str, tuple[CheckpointerConfig, SqliteCheckpointer]] = {}
+_checkpointers_lock = threading.Lock()
+
+
+def get_checkpointer(settings: Optional[Settings] = None) -> Optional[SqliteCheckpointer]:
+    """Get the process-wide SQLite checkpointer for the configured path.
+
+    Returns None when the configured checkpointer type is ``"memory"``. A
+    database file has a single writer, so a different config for a path
+    already in use gets the existing checkpointer, with a warning.
+    """
+    config = (settings or Settings()).checkpointer
+    if config.type != "sqlite":
+        return None
+    path = os.path.abspath(config.path)
+    with _checkpointers_lock:
+        if path not in _checkpointers:
+            _checkpointers[path] = (config, SqliteCheckpointer.from_config(config))
+        existing, checkpointer = _checkpointers[path]
+        if config != existing:
+            logger.warning(
+                f"Checkpointer for {path} already open with {existing.model_dump()}; "
+                f"ignoring {config.model_dump()}"
+            )
+        return checkpointer
+
+
+def close_checkpointers() -> None:
+    """Flush and close all process-wide checkpointers."""
+    with _checkpointers_lock:
+        for _, checkpointer in _checkpointers.values():
+            checkpointer.close()
+        _checkpointers.clear()
+
+
+# Write buffered checkpoints before the interpreter exits.
+atexit.register(close_checkpointers)
@@ -2,12 +2,25 @@
 ChromaDB storage backend for semantic search.
 """
 
+import os
+import sqlite3
+from typing import Optional
 import chromadb
+from pydantic import BaseModel
 from deep_agent.storage.base import StorageBackend
 from deep_agent.core.exceptions import BackendError
 from loguru import logger
 
 
+class CollectionStats(BaseModel):
+    """Document count and on-disk footprint of a collection."""
+
+    name: str
+    count: int
+    size_bytes: int = 0
+    last_modified: Optional[float] = None
+
+
 class ChromaStorage(StorageBackend):
     """ChromaDB storage backend with proper error handling."""
 
@@ -35,6 +48,44 @@ class ChromaStorage(StorageBackend):
         except Exception as e:
             raise BackendError(f"Failed to get collection {name}: {e}")
 
+    def list_collections(self) -> list[chromadb.Collection]:
+        """List all collections in the database."""
+        if self.client is None:
+            raise BackendError("ChromaDB not initialized. Call initialize() first.")
+
+        try:
+            return list(self.client.list_collections())
+        except Exception as e:
+            raise BackendError(f"Failed to list collections: {e}")
+
+    def segment_directories(self) -> dict[str, list[str]]:
+        """Map collection ids to their vector segment directories.
+
+        Reads Chroma's SQLite catalog directly (read-only) so no collection or
+        embedding function has to be opened.
+        """
+        catalog = os.path.join(self.persist_directory, "chroma.sqlite3")
+        if not os.path.exists(catalog):
+            return {}
+        try:
+            conn = sqlite3.connect(f"file:{catalog}?mode=ro", uri=True)
+            try:
+                rows = conn.execute(
+                    "SELECT collection, id FROM segments WHERE scope = 'VECTOR'"
+                ).fetchall()
+            finally:
+                conn.close()
+        except sqlite3.Error as e:
+            logger.warning(f"Could not read ChromaDB segment catalog: {e}")
+            return {}
+
+        directories: dict[str, list[str]] = {}
+        for collection_id, segment_id in rows:
+            directories.setdefault(collection_id, []).append(
+                os.path.join(self.persist_directory, segment_id)
+            )
+        return directories
+
     def close(self) -> None:
         """Cleanup ChromaDB client."""
         if self.client:
@@ -47,3 +98,21 @@ def initialize_chroma(persist_directory: str = "./data/chroma") -> ChromaStorage
     storage = ChromaStorage(persist_directory)
     storage.initialize()
     return storage
+
+
+def disk_usage(paths: list[str]) -> tuple[int, Optional[float]]:
+    """Total size in bytes and latest modification time of files under paths."""
+    size = 0
+    last_modified = None
+    for path in paths:
+        if os.path.isfile(path):
+            entries = [path]
+        elif os.path.isdir(path):
+            entries = [e.path for e in os.scandir(path) if e.is_file()]
+        else:
+            continue
+        for entry in entries:
+            stat = os.stat(entry)
+            size += stat.st_size
+            last_modified = max(last_modified or stat.st_mtime, stat.st_mtime)
+    return size, last_modified
@@ -0,0 +1,263 @@
+"""
+Markdown-aware chunking and near-duplicate removal before indexing.
+"""
+
+import hashlib
+import re
+from typing import Optional, Sequence
+
+import numpy as np
+from pydantic import BaseModel, Field
+
+from deep_agent.storage.embedding_cache import normalize_text
+
+_HEADING = re.compile(r"^(#{1,6})\s+(.+?)\s*#*\s*$")
+_FENCE = re.compile(r"^\s*(```|~~~)")
+_PARAGRAPH_BREAK = re.compile(r"\n\s*\n")
+_SENTENCE_BREAK = re.compile(r"(?<=[.!?])\s+")
+_WORD = re.compile(r"\w+")
+
+_MERSENNE_PRIME = (1 << 31) - 1
+
+
+class Chunk(BaseModel):
+    """A piece of a source document ready for embedding."""
+
+    text: str
+    metadata: dict = Field(default_factory=dict)
+
+
+class ChunkingResult(BaseModel):
+    """Chunks produced from a batch of documents."""
+
+    chunks: list[Chunk] = Field(default_factory=list)
+    documents: int = 0
+    exact_duplicates: int = 0
+    near_duplicates: int = 0
+
+    @property
+    def duplicates(self) -> int:
+        return self.exact_duplicates + self.near_duplicates
+
+
+def split_sections(text: str) -> list[tuple[str, str]]:
+    """Split markdown into (heading path, section text) pairs."""
+    sections: list[tuple[str, str]] = []
+    headings: list[tuple[int, str]] = []
+    current: list[str] = []
+    path = ""
+    in_fence = False
+
+    for line in text.splitlines():
+        if _FENCE.match(line):
+            in_fence = not in_fence
+        match = None if in_fence else _HEADING.match(line)
+        if match:
+            if "".join(current).strip():
+                sections.append((path, "\n".join(current).strip()))
+            level = len(match.group(1))
+            headings = [h for h in headings if h[0] < level] + [(level, match.group(2))]
+            path = " > ".join(h[1] for h in headings)
+            current = [line]
+        else:
+            current.append(line)
+
+    if "".join(current).strip():
+        sections.append((path, "\n".join(current).strip()))
+    return sections
+
+
+def _pieces(text: str, limit: int) -> list[tuple[str, str]]:
+    """Break text into (separator, piece) pairs no longer than limit.
+
+    Pieces prefer paragraph boundaries, then sentence boundaries, then spaces.
+    The separator is what joins the piece to the one before it.
+    """
+    pieces = []
+    for paragraph in _PARAGRAPH_BREAK.split(text):
+        paragraph = paragraph.strip()
+        if not paragraph:
+            continue
+        if len(paragraph) <= limit:
+            pieces.append(("\n\n", paragraph))
+            continue
+        sep = "\n\n"
+        for sentence in _SENTENCE_BREAK.split(paragraph):
+            while len(sentence) > limit:
+                cut = sentence.rfind(" ", 0, limit)
+                cut = cut if cut > 0 else limit
+                pieces.append((sep, sentence[:cut].strip()))
+                sentence = sentence[cut:].strip()
+                sep = " "
+            if sentence:
+                pieces.append((sep, sentence))
+                sep = " "
+    return pieces
+
+
+def _join(pieces: list[tuple[str, str]]) -> str:
+    return "".join(sep + piece for sep, piece in pieces)[len(pieces[0][0]) :] if pieces else ""
+
+
+class MarkdownChunker:
+    """Split documents at markdown headings, then pack pieces into overlapping chunks."""
+
+    def __init__(self, chunk_size: int = 1500, chunk_overlap: int = 200):
+        if chunk_overlap >= chunk_size:
+            raise ValueError("chunk_overlap must be smaller than chunk_size")
+        self.chunk_size = chunk_size
+        self.chunk_overlap = chunk_overlap
+
+    def split_text(self, text: str) -> list[tuple[str, str]]:
+        """Split text into (heading path, chunk text) pairs."""
+        chunks: list[tuple[str, str]] = []
+        for path, section in self._merge_small(split_sections(text)):
+            if len(section) <= self.chunk_size:
+                chunks.append((path, section))
+                continue
+
+            window: list[tuple[str, str]] = []
+            for piece in _pieces(section, self.chunk_size):
+                if window and len(_join(window + [piece])) > self.chunk_size:
+                    chunks.append((path, _join(window)))
+                    overlap: list[tuple[str, str]] = []
+                    for previous in reversed(window):
+                        if len(_join([previous] + overlap)) > self.chunk_overlap:
+                            break
+                        overlap.insert(0, previous)
+                    if len(_join(overlap + [piece])) > self.chunk_size:
+                        overlap = []
+                    window = overlap
+                window.append(piece)
+            if window:
+                chunks.append((path, _join(window)))
+        return chunks
+
+    def _merge_small(self, sections: list[tuple[str, str]]) -> list[tuple[str, str]]:
+        """Merge consecutive sections while they fit in a single chunk."""
+        merged: list[tuple[str, str]] = []
+        for path, section in sections:
+            if merged and len(merged[-1][1]) + len(section) + 2 <= self.chunk_size:
+                merged[-1] = (merged[-1][0], merged[-1][1] + "\n\n" + section)
+            else:
+                merged.append((path, section))
+        return merged
+
+
+class MinHashDeduplicator:
+    """Detect exact and near-duplicate texts with MinHash signatures and LSH banding."""
+
+    def __init__(
+        self,
+        threshold: float = 0.9,
+        num_perm: int = 64,
+        bands: int = 16,
+        shingle_size: int = 5,
+        seed: int = 1,
+    ):
+        if num_perm % bands:
+            raise ValueError("num_perm must be divisible by bands")
+        self.threshold = threshold
+        self.num_perm = num_perm
+        self.bands = bands
+        self.rows = num_perm // bands
+        self.shingle_size = shingle_size
+
+        rng = np.random.default_rng(seed)
+        self._a = rng.integers(1, _MERSENNE_PRIME, size=num_perm, dtype=np.uint64)
+        self._b = rng.integers(0, _MERSENNE_PRIME, size=num_perm, dtype=np.uint64)
+        self._exact: set[str] = set()
+        self._buckets: dict[tuple[int, bytes], list[int]] = {}
+        self._signatures: list[np.ndarray] = []
+
+    def signature(self, text: str) -> np.ndarray:
+        """Compute the MinHash signature of a text's word shingles."""
+        words = _WORD.findall(text.lower())
+        size = self.shingle_size
+        shingles = {" ".join(words[i : i + size]) for i in range(max(1, len(words) - size + 1))}
+        hashes = np.fromiter(
+            (
+                int.from_bytes(hashlib.blake2b(s.encode("utf-8"), digest_size=4).digest(), "big")
+                & _MERSENNE_PRIME
+                for s in shingles
+            ),
+            dtype=np.uint64,
+            count=len(shingles),
+        )
+        permuted = (np.outer(hashes, self._a) + self._b) % _MERSENNE_PRIME
+        return permuted.min(axis=0)
+
+    def check(self, text: str) -> Optional[str]:
+        """Register a text and return "exact" or "near" if it duplicates an earlier one."""
+        digest = hashlib.sha256(normalize_text(text).encode("utf-8")).hexdigest()
+        if digest in self._exact:
+            return "exact"
+
+        signature = self.signature(text)
+        bands = [
+            (band, signature[band * self.rows : (band + 1) * self.rows].tobytes())
+            for band in range(self.bands)
+        ]
+        candidates = {idx for key in bands for idx in self._buckets.get(key, ())}
+        for idx in candidates:
+            if np.mean(self._signatures[idx] == signature) >= self.threshold:
+                return "near"
+
+        self._exact.add(digest)
+        index = len(self._signatures)
+        self._signatures.append(signature)
+        for key in bands:
+            self._buckets.setdefault(key, []).append(index)
+        return None
+
+
+def chunk_documents(
+    texts: list[str],
+    metadatas: Optional[Sequence[Optional[dict]]] = None,
+    chunk_size: int = 1500,
+    chunk_overlap: int = 200,
+    dedup_threshold: float = 0.9,
+) -> ChunkingResult:
+    """Chunk documents and drop exact and near-duplicate chunks.
+
+    Each chunk keeps its document's metadata plus ``parent_id``,
+    ``chunk_index``, ``chunk_count`` and the markdown ``headings`` path.
+    A ``dedup_threshold`` of 0 disables near-duplicate detection.
+    """
+    chunker = MarkdownChunker(chunk_size, chunk_overlap)
+    dedup = MinHashDeduplicator(threshold=dedup_threshold) if dedup_threshold > 0 else None
+    seen: set[str] = set()
+    result = ChunkingResult(documents=len(texts))
+
+    for i, text in enumerate(texts):
+        if not text.strip():
+            continue
+        base = dict((metadatas[i] if metadatas else None) or {})
+        parent_id = base.get("parent_id") or hashlib.sha256(text.encode("utf-8")).hexdigest()[:16]
+        pieces = chunker.split_text(text)
+
+        for index, (path, chunk_text) in enumerate(pieces):
+            if dedup is not None:
+                duplicate = dedup.check(chunk_text)
+            else:
+                digest = hashlib.sha256(normalize_text(chunk_text).encode("utf-8")).hexdigest()
+                duplicate = "exact" if digest in seen else None
+                seen.add(digest)
+            if duplicate == "exact":
+                result.exact_duplicates += 1
+                continue
+            if duplicate == "near":
+                result.near_duplicates += 1
+                continue
+
+            metadata = {
+                **base,
+                "parent_id": parent_id,
+                "chunk_index": index,
+                "chunk_count": len(pieces),
+            }
+            if path:
+                metadata["headings"] = path
+            result.chunks.append(Chunk(text=chunk_text, metadata=metadata))
+
+    return result
@@ -0,0 +1,203 @@
+"""
+Content-addressed embedding cache with an in-memory LRU and SQLite tiers.
+"""
+
+import hashlib
+import os
+import re
+import sqlite3
+import threading
+import unicodedata
+from array import array
+from collections import OrderedDict
+from typing import Optional
+
+from langchain_core.embeddings import Embeddings
+from loguru import logger
+
+from deep_agent.core.exceptions import BackendError
+
+_WHITESPACE = re.compile(r"\s+")
+
+
+def normalize_text(text: str) -> str:
+    """Normalize text so trivially different copies share a cache key."""
+    return _WHITESPACE.sub(" ", unicodedata.normalize("NFC", text)).strip()
+
+
+class CachedEmbeddings(Embeddings):
+    """Embeddings wrapper that caches vectors by (model, SHA-256 of text)."""
+
+    def __init__(
+        self,
+        embeddings: Embeddings,
+        model_name: str,
+        cache_path: Optional[str] = None,
+        max_memory_entries: int = 10_000,
+    ):
+        self.embeddings = embeddings
+        self.model_name = model_name
+        self.cache_path = cache_path
+        self.max_memory_entries = max_memory_entries
+
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+
+        self._memory: OrderedDict[str, list[float]] = OrderedDict()
+        self._lock = threading.RLock()
+        self._conn: Optional[sqlite3.Connection] = None
+
+        if cache_path:
+            self._open(cache_path)
+
+    def _open(self, cache_path: str) -> None:
+        """Open the on-disk cache tier."""
+        try:
+            os.makedirs(os.path.dirname(cache_path) or ".", exist_ok=True)
+            self._conn = sqlite3.connect(cache_path, check_same_thread=False)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS embeddings ("
+                "key TEXT PRIMARY KEY, model TEXT NOT NULL, vector BLOB NOT NULL)"
+            )
+            self._conn.commit()
+            logger.debug(f"Opened embedding cache: {cache_path}")
+        except sqlite3.Error as e:
+            raise BackendError(f"Failed to open embedding cache {cache_path}: {e}")
+
+    def _key(self, text: str) -> str:
+        digest = hashlib.sha256(normalize_text(text).encode("utf-8")).hexdigest()
+        return f"{self.model_name}:{digest}"
+
+    def _remember(self, key: str, vector: list[float]) -> None:
+        self._memory[key] = vector
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_memory_entries:
+            self._memory.popitem(last=False)
+
+    def _lookup(self, keys: list[str]) -> dict[str, list[float]]:
+        """Look up keys in the memory tier, then the disk tier."""
+        found: dict[str, list[float]] = {}
+        missing = []
+        for key in keys:
+            vector = self._memory.get(key)
+            if vector is not None:
+                self._memory.move_to_end(key)
+                found[key] = vector
+            else:
+                missing.append(key)
+
+        if missing and self._conn is not None:
+            for start in range(0, len(missing), 500):
+                batch = missing[start : start + 500]
+                placeholders = ",".join("?" * len(batch))
+                rows = self._conn.execute(
+                    f"SELECT key, vector FROM embeddings WHERE key IN ({placeholders})", batch
+                ).fetchall()
+                for key, blob in rows:
+                    vector = array("f", blob).tolist()
+                    found[key] = vector
+                    self._remember(key, vector)
+                    self.disk_hits += 1
+        return found
+
+    def _store(self, entries: dict[str, list[float]]) -> None:
+        for key, vector in entries.items():
+            self._remember(key, vector)
+        if self._conn is not None and entries:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO embeddings (key, model, vector) VALUES (?, ?, ?)",
+                [
+                    (key, self.model_name, array("f", vector).tobytes())
+                    for key, vector in entries.items()
+                ],
+            )
+            self._conn.commit()
+
+    def _partition(self, texts: list[str]) -> tuple[list[str], dict, dict[str, str]]:
+        """Split texts into cached vectors and texts that still need embedding."""
+        keys = [self._key(text) for text in texts]
+        pending: dict[str, str] = {}
+        with self._lock:
+            found = self._lookup(list(dict.fromkeys(keys)))
+            for key, text in zip(keys, texts):
+                if key not in found and key not in pending:
+                    pending[key] = text
+            self.hits += sum(1 for key in keys if key in found)
+            self.misses += len(pending)
+        return keys, found, pending
+
+    def _complete(
+        self,
+        keys: list[str],
+        found: dict[str, list[float]],
+        pending: dict[str, str],
+        vectors: list[list[float]],
+    ) -> list[list[float]]:
+        computed = dict(zip(pending.keys(), vectors))
+        if computed:
+            with self._lock:
+                self._store(computed)
+            found.update(computed)
+        return [found[key] for key in keys]
+
+    def embed_documents(self, texts: list[str]) -> list[list[float]]:
+        """Embed documents, calling the wrapped model only for uncached texts."""
+        keys, found, pending = self._partition(texts)
+        vectors = self.embeddings.embed_documents(list(pending.values())) if pending else []
+        return self._complete(keys, found, pending, vectors)
+
+    async def aembed_documents(self, texts: list[str]) -> list[list[float]]:
+        """Async variant of :meth:`embed_documents` using the wrapped model's async client."""
+        keys, found, pending = self._partition(texts)
+        vectors = await self.embeddings.aembed_documents(list(pending.values())) if pending else []
+        return self._complete(keys, found, pending, vectors)
+
+    def _cached_query(self, key: str) -> Optional[list[float]]:
+        with self._lock:
+            found = self._lookup([key])
+            if key in found:
+                self.hits += 1
+                return found[key]
+            self.misses += 1
+            return None
+
+    def embed_query(self, text: str) -> list[float]:
+        """Embed a query, served from the cache when possible."""
+        key = self._key(text)
+        vector = self._cached_query(key)
+        if vector is None:
+            vector = self.embeddings.embed_query(text)
+            with self._lock:
+                self._store({key: vector})
+        return vector
+
+    async def aembed_query(self, text: str) -> list[float]:
+        """Async variant of :meth:`embed_query`."""
+        key = self._key(text)
+        vector = self._cached_query(key)
+        if vector is None:
+            vector = await self.embeddings.aembed_query(text)
+            with self._lock:
+                self._store({key: vector})
+        return vector
+
+    def stats(self) -> dict:
+        """Return cache hit/miss counters."""
+        total = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "disk_hits": self.disk_hits,
+            "misses": self.misses,
+            "memory_entries": len(self._memory),
+            "hit_rate": self.hits / total if total else 0.0,
+        }
+
+    def close(self) -> None:
+        """Close the on-disk cache tier."""
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+            self._memory.clear()
@@ -0,0 +1,252 @@
+"""
+Background queue that chunks, embeds and upserts documents off the agent's critical path.
+"""
+
+import atexit
+import queue
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from typing import Literal, Optional
+
+from loguru import logger
+from pydantic import BaseModel, Field
+
+from deep_agent.config.settings import SearchConfig, Settings
+from deep_agent.core.exceptions import BackendError
+from deep_agent.storage.ingestion import IngestionPipeline
+from deep_agent.storage.pool import VectorStorePool, get_vectorstore_pool
+
+_STOP = object()
+
+
+class IndexJob(BaseModel):
+    """A document waiting for, or done with, background indexing."""
+
+    id: str
+    collection_name: str
+    source_key: Optional[str] = None
+    status: Literal["queued", "running", "done", "failed"] = "queued"
+    submitted_at: float = Field(default_factory=time.time)
+    finished_at: Optional[float] = None
+    chunks_added: int = 0
+    chunks_unchanged: int = 0
+    error: Optional[str] = None
+
+
+class IndexQueue:
+    """Bounded queue of documents indexed by background worker threads.
+
+    ``submit`` returns as soon as a document is queued. When the queue is
+    full it blocks for up to ``put_timeout`` seconds and then raises
+    BackendError, so producers slow down instead of buffering without limit.
+    The last ``history_size`` jobs are kept for :meth:`status`.
+    """
+
+    def __init__(
+        self,
+        pool: Optional[VectorStorePool] = None,
+        max_size: int = 64,
+        workers: int = 1,
+        put_timeout: float = 30.0,
+        history_size: int = 1000,
+    ):
+        self._pool = pool
+        self.max_size = max_size
+        self.workers = max(1, workers)
+        self.put_timeout = put_timeout
+        self.history_size = history_size
+        self.rejected = 0
+
+        self._queue: queue.Queue = queue.Queue(maxsize=max_size)
+        self._jobs: OrderedDict[str, IndexJob] = OrderedDict()
+        self._threads: list[threading.Thread] = []
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_settings(
+        cls, settings: Optional[Settings] = None, pool: Optional[VectorStorePool] = None
+    ) -> "IndexQueue":
+        """Create a queue configured from application settings."""
+        config: SearchConfig = (settings or Settings()).search
+        return cls(
+            pool=pool,
+            max_size=config.index_queue_size,
+            workers=config.index_queue_workers,
+            put_timeout=config.index_queue_timeout,
+        )
+
+    @property
+    def pool(self) -> VectorStorePool:
+        return self._pool or get_vectorstore_pool()
+
+    def _start(self) -> None:
+        with self._lock:
+            if self._threads:
+                return
+            for i in range(self.workers):
+                thread = threading.Thread(target=self._work, name=f"index-queue-{i}", daemon=True)
+                thread.start()
+                self._threads.append(thread)
+
+    def submit(
+        self,
+        text: str,
+        collection_name: str = "default",
+        metadata: Optional[dict] = None,
+        source_key: Optional[str] = None,
+        timeout: Optional[float] = None,
+    ) -> IndexJob:
+        """Queue a document for chunking, embedding and upserting.
+
+        Args:
+            text: Document text
+            collection_name: Collection to index into
+            metadata: Metadata stored with every chunk
+            source_key: Stable source identifier (e.g. URL); a re-submitted
+                source replaces its previous chunks
+            timeout: Seconds to wait for room in a full queue (default ``put_timeout``)
+
+        Returns:
+            The queued job
+
+        Raises:
+            BackendError: If the queue stays full for ``timeout`` seconds
+        """
+        self._start()
+        job = IndexJob(
+            id=uuid.uuid4().hex[:12], collection_name=collection_name, source_key=source_key
+        )
+        # Registered first, so the job can be looked up as soon as a worker takes it.
+        with self._lock:
+            self._jobs[job.id] = job
+            while len(self._jobs) > self.history_size:
+                self._jobs.popitem(last=False)
+        try:
+            self._queue.put(
+                (job, text, metadata),
+                timeout=self.put_timeout if timeout is None else timeout,
+            )
+        except queue.Full:
+            with self._lock:
+                self._jobs.pop(job.id, None)
+                self.rejected += 1
+            raise BackendError(f"Index queue is full ({self.max_size} documents pending)")
+        return job
+
+    def _work(self) -> None:
+        while True:
+            item = self._queue.get()
+            try:
+                if item is _STOP:
+                    return
+                self._index(*item)
+            finally:
+                self._queue.task_done()
+
+    def _index(self, job: IndexJob, text: str, metadata: Optional[dict]) -> None:
+        job.status = "running"
+        try:
+            report = IngestionPipeline(self.pool).run(
+                [text],
+                collection_name=job.collection_name,
+                metadatas=[metadata],
+                source_keys=[job.source_key],
+                chunk=True,
+            )
+            job.chunks_added = report.added
+            job.chunks_unchanged = report.unchanged
+            if report.failed:
+                job.error = report.failed_batches[0].error
+            job.status = "failed" if report.failed else "done"
+        except Exception as e:
+            logger.error(f"Background indexing of job {job.id} failed: {e}")
+            job.error = str(e)
+            job.status = "failed"
+        job.finished_at = time.time()
+        logger.debug(
+            f"Index job {job.id} {job.status}: {job.chunks_added} chunks into "
+            f"'{job.collection_name}'"
+        )
+
+    def get(self, job_id: str) -> Optional[IndexJob]:
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def status(self) -> dict:
+        """Return queue depth and job counts by status."""
+        with self._lock:
+            jobs = list(self._jobs.values())
+        counts = {status: 0 for status in ("queued", "running", "done", "failed")}
+        for job in jobs:
+            counts[job.status] += 1
+        return {
+            "pending": self._queue.qsize(),
+            "max_size": self.max_size,
+            "rejected": self.rejected,
+            **counts,
+            "chunks_added": sum(job.chunks_added for job in jobs),
+        }
+
+    def join(self, timeout: Optional[float] = None) -> bool:
+        """Wait until every queued document is processed; False on timeout."""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._queue.all_tasks_done:
+            while self._queue.unfinished_tasks:
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    return False
+                self._queue.all_tasks_done.wait(remaining)
+        return True
+
+    def close(self, timeout: Optional[float] = 30.0) -> None:
+        """Finish queued documents and stop the workers, waiting up to ``timeout`` seconds.
+
+        If the queue stays full for that long, the workers are left to exit
+        with the process (they are daemon threads) rather than blocking here.
+        """
+        with self._lock:
+            threads, self._threads = self._threads, []
+        deadline = None if timeout is None else time.monotonic() + timeout
+
+        def remaining() -> Optional[float]:
+            return None if deadline is None else max(0.0, deadline - time.monotonic())
+
+        for _ in threads:
+            try:
+                self._queue.put(_STOP, timeout=remaining())
+            except queue.Full:
+                logger.warning(
+                    f"Index queue still full after {timeout}s; "
+                    f"{self._queue.qsize()} queued documents were not indexed"
+                )
+                return
+        for thread in threads:
+            thread.join(remaining())
+
+
+_queue: Optional[IndexQueue] = None
+_queue_lock = threading.Lock()
+
+
+def get_index_queue() -> IndexQueue:
+    """Get the process-wide index queue, creating it on first use."""
+    global _queue
+    with _queue_lock:
+        if _queue is None:
+            _queue = IndexQueue.from_settings()
+        return _queue
+
+
+def close_index_queue() -> None:
+    """Drain and discard the process-wide index queue."""
+    global _queue
+    with _queue_lock:
+        if _queue is not None:
+            _queue.close()
+            _queue = None
+
+
+# Flush queued documents before the interpreter exits.
+atexit.register(close_index_queue)
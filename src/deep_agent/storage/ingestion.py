@@ -0,0 +1,278 @@
+"""
+Batched, concurrent ingestion pipeline for the semantic search index.
+"""
+
+import hashlib
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Callable, Optional, Sequence
+
+from loguru import logger
+from pydantic import BaseModel, Field
+
+from deep_agent.storage.base import VectorCollection
+from deep_agent.storage.chunking import chunk_documents
+from deep_agent.storage.embedding_cache import normalize_text
+from deep_agent.storage.lexical import LexicalIndex
+from deep_agent.storage.pool import VectorStorePool
+
+
+def content_hash(text: str) -> str:
+    """SHA-256 of normalized text, used as document id and change marker."""
+    return hashlib.sha256(normalize_text(text).encode("utf-8")).hexdigest()
+
+
+def _stored_hashes(collection: VectorCollection, ids: list[str]) -> dict[str, str]:
+    """Look up the stored content hashes of existing documents."""
+    stored: dict[str, str] = {}
+    for start in range(0, len(ids), 1000):
+        found = collection.get(ids=ids[start : start + 1000], include=["metadatas"])
+        for doc_id, metadata in zip(found["ids"], found["metadatas"]):
+            if metadata and metadata.get("content_hash"):
+                stored[doc_id] = metadata["content_hash"]
+    return stored
+
+
+class BatchResult(BaseModel):
+    """Outcome of embedding and writing one batch."""
+
+    index: int
+    start: int
+    size: int
+    success: bool = False
+    error: Optional[str] = None
+
+
+class IngestionReport(BaseModel):
+    """Summary of an ingestion run."""
+
+    collection_name: str
+    total: int
+    documents: int = 0
+    duplicates: int = 0
+    unchanged: int = 0
+    removed: int = 0
+    batches: list[BatchResult] = Field(default_factory=list)
+
+    @property
+    def added(self) -> int:
+        return sum(b.size for b in self.batches if b.success)
+
+    @property
+    def failed(self) -> int:
+        return self.total - self.added
+
+    @property
+    def failed_batches(self) -> list[BatchResult]:
+        return [b for b in self.batches if not b.success]
+
+
+class IngestionPipeline:
+    """Embed documents in batches with bounded concurrency and upsert in bulk.
+
+    Each batch is sent to the embeddings client as one request (Ollama's
+    ``/api/embed`` accepts a list of inputs). Embedding runs on a thread pool;
+    Chroma writes happen on the calling thread in ``upsert_chunk_size`` chunks.
+    A failed batch is reported and skipped without discarding the others.
+    """
+
+    def __init__(
+        self,
+        pool: VectorStorePool,
+        batch_size: Optional[int] = None,
+        max_concurrency: Optional[int] = None,
+        upsert_chunk_size: Optional[int] = None,
+        on_batch: Optional[Callable[[BatchResult], None]] = None,
+    ):
+        self.pool = pool
+        self.batch_size = batch_size or pool.config.index_batch_size
+        self.max_concurrency = max_concurrency or pool.config.index_max_concurrency
+        self.upsert_chunk_size = upsert_chunk_size or pool.config.upsert_chunk_size
+        self.on_batch = on_batch
+
+    def run(
+        self,
+        texts: list[str],
+        collection_name: str = "default",
+        metadatas: Optional[Sequence[Optional[dict]]] = None,
+        ids: Optional[Sequence[str]] = None,
+        source_keys: Optional[Sequence[Optional[str]]] = None,
+        chunk: bool = False,
+    ) -> IngestionReport:
+        """Embed and upsert texts into a collection.
+
+        Documents get stable ids: ``<source_key>#<chunk_index>`` when a source
+        key is given, otherwise the SHA-256 of their normalized content. A
+        document whose stored ``content_hash`` matches is skipped, so
+        re-ingesting a corpus only embeds new or modified content.
+
+        With ``chunk=True`` the texts are first split into chunks and exact or
+        near-duplicate chunks are dropped (see ``chunk_documents``). Stored chunks
+        of a keyed source that its new version no longer has, including slots
+        now dropped as duplicates, are deleted once every batch has been
+        written, so a failed run keeps the previous version.
+        """
+        for name, values in (("metadata", metadatas), ("source key", source_keys), ("id", ids)):
+            if values is not None and len(values) != len(texts):
+                raise ValueError(f"Got {len(values)} {name} entries for {len(texts)} texts")
+        if chunk and ids is not None:
+            raise ValueError("Explicit ids cannot be combined with chunking")
+
+        rows: list[dict] = [dict(m or {}) for m in metadatas] if metadatas else [{} for _ in texts]
+        for metadata, key in zip(rows, source_keys or []):
+            if key:
+                metadata["source_key"] = key
+                metadata.setdefault("parent_id", key)
+
+        documents = len(texts)
+        duplicates = 0
+        # Keyed sources being replaced, mapped to the ids of their new chunks.
+        current: dict[str, set[str]] = {}
+        if chunk:
+            current = {m["source_key"]: set() for m in rows if m.get("source_key")}
+            config = self.pool.config
+            chunked = chunk_documents(
+                texts,
+                rows,
+                chunk_size=config.chunk_size,
+                chunk_overlap=config.chunk_overlap,
+                dedup_threshold=config.dedup_threshold,
+            )
+            texts = [c.text for c in chunked.chunks]
+            rows = [c.metadata for c in chunked.chunks]
+            duplicates = chunked.duplicates
+
+        hashes = [content_hash(text) for text in texts]
+        if ids is None:
+            ids = [
+                f"{m['source_key']}#{m.get('chunk_index', 0)}" if m.get("source_key") else h
+                for m, h in zip(rows, hashes)
+            ]
+        for metadata, digest in zip(rows, hashes):
+            metadata["content_hash"] = digest
+        for metadata, doc_id in zip(rows, ids):
+            if metadata.get("source_key") in current:
+                current[metadata["source_key"]].add(doc_id)
+
+        collection = self.pool.get_collection(collection_name)
+        lexical = self.pool.get_lexical_index(collection_name)
+
+        # Keep the first occurrence of each id, then skip documents whose content is unchanged.
+        first = sorted({doc_id: i for i, doc_id in reversed(list(enumerate(ids)))}.values())
+        stored = _stored_hashes(collection, [ids[i] for i in first])
+        selected = [i for i in first if stored.get(ids[i]) != hashes[i]]
+        unchanged = len(first) - len(selected)
+        texts = [texts[i] for i in selected]
+        ids = [ids[i] for i in selected]
+        rows = [rows[i] for i in selected]
+
+        report = IngestionReport(
+            collection_name=collection_name,
+            total=len(texts),
+            documents=documents,
+            duplicates=duplicates,
+            unchanged=unchanged,
+        )
+        if not texts:
+            if current:
+                report.removed = self._remove_stale_chunks(collection, lexical, current)
+            return report
+
+        embeddings = self.pool.embeddings
+        batches = [
+            BatchResult(index=i, start=start, size=len(texts[start : start + self.batch_size]))
+            for i, start in enumerate(range(0, len(texts), self.batch_size))
+        ]
+        report.batches = batches
+
+        pending: list[tuple[BatchResult, list[list[float]]]] = []
+        pending_size = 0
+
+        def flush() -> None:
+            nonlocal pending, pending_size
+            if not pending:
+                return
+            written = [
+                (ids[b.start + j], vector, texts[b.start + j], rows[b.start + j])
+                for b, vectors in pending
+                for j, vector in enumerate(vectors)
+            ]
+            lexical.mark_dirty()
+            try:
+                collection.upsert(
+                    ids=[r[0] for r in written],
+                    embeddings=[r[1] for r in written],
+                    documents=[r[2] for r in written],
+                    metadatas=[r[3] for r in written],
+                )
+                for b, _ in pending:
+                    b.success = True
+            except Exception as e:
+                logger.error(f"Failed to upsert {len(written)} documents: {e}")
+                for b, _ in pending:
+                    b.error = f"upsert failed: {e}"
+            else:
+                try:
+                    lexical.add([r[0] for r in written], [r[2] for r in written])
+                except Exception as e:
+                    logger.warning(f"Failed to update lexical index for '{collection_name}': {e}")
+                # Only after both writes, so a concurrent search can't re-cache a partial view.
+                self.pool.invalidate(collection_name)
+            for b, _ in pending:
+                self._report(b, len(batches))
+            pending, pending_size = [], 0
+
+        def embed(batch: BatchResult) -> list[list[float]]:
+            return embeddings.embed_documents(texts[batch.start : batch.start + batch.size])
+
+        with ThreadPoolExecutor(max_workers=self.max_concurrency) as executor:
+            futures = {executor.submit(embed, b): b for b in batches}
+            for future in as_completed(futures):
+                batch = futures[future]
+                try:
+                    vectors = future.result()
+                except Exception as e:
+                    logger.error(f"Failed to embed batch {batch.index}: {e}")
+                    batch.error = f"embedding failed: {e}"
+                    self._report(batch, len(batches))
+                    continue
+
+                pending.append((batch, vectors))
+                pending_size += batch.size
+                if pending_size >= self.upsert_chunk_size:
+                    flush()
+        flush()
+
+        # Old chunks go only once the new version is fully stored.
+        if current and not report.failed_batches:
+            report.removed = self._remove_stale_chunks(collection, lexical, current)
+
+        logger.info(
+            f"Ingested {report.added}/{report.total} documents into '{collection_name}' "
+            f"({len(report.failed_batches)} failed batches)"
+        )
+        return report
+
+    def _remove_stale_chunks(
+        self,
+        collection: VectorCollection,
+        lexical: LexicalIndex,
+        current: dict[str, set[str]],
+    ) -> int:
+        """Delete stored chunks of keyed sources that are not in their new version."""
+        stale: list[str] = []
+        for key, keep in current.items():
+            found = collection.get(where={"source_key": key}, include=[])
+            stale.extend(doc_id for doc_id in found["ids"] if doc_id not in keep)
+        if stale:
+            lexical.mark_dirty()
+            collection.delete(ids=stale)
+            lexical.delete(stale)
+            self.pool.invalidate(collection.name)
+            logger.info(f"Removed {len(stale)} stale chunks from '{collection.name}'")
+        return len(stale)
+
+    def _report(self, batch: BatchResult, total_batches: int) -> None:
+        status = "ok" if batch.success else batch.error
+        logger.debug(f"Batch {batch.index + 1}/{total_batches} ({batch.size} docs): {status}")
+        if self.on_batch is not None:
+            self.on_batch(batch)
@@ -0,0 +1,187 @@
+"""
+Incremental BM25 inverted index kept next to each Chroma collection.
+"""
+
+import math
+import os
+import re
+import sqlite3
+import threading
+from collections import Counter
+from typing import Callable, Optional
+
+from loguru import logger
+
+from deep_agent.core.exceptions import BackendError
+
+_TOKEN = re.compile(r"[a-z0-9_]+(?:[.\-][a-z0-9_]+)*")
+_PART = re.compile(r"[a-z0-9]+")
+
+
+def tokenize(text: str) -> list[str]:
+    """Tokenize text for lexical matching.
+
+    Compound tokens such as ``v1.4.0`` or ``ERR_CONNECTION_RESET`` are kept
+    whole so exact identifiers match, and their parts are emitted as well.
+    """
+    tokens = []
+    for token in _TOKEN.findall(text.lower()):
+        tokens.append(token)
+        parts = _PART.findall(token)
+        if len(parts) > 1:
+            tokens.extend(parts)
+    return tokens
+
+
+class LexicalIndex:
+    """BM25 index over a collection's documents, stored in SQLite.
+
+    The database is opened lazily on first use, so keeping an index per
+    collection costs nothing until a lexical or hybrid query needs it.
+
+    Writers call :meth:`mark_dirty` when they change the collection; the
+    next query then checks the index against the collection once, under a
+    lock, instead of every query counting both.
+    """
+
+    def __init__(self, path: str, k1: float = 1.5, b: float = 0.75):
+        self.path = path
+        self.k1 = k1
+        self.b = b
+        self._conn: Optional[sqlite3.Connection] = None
+        self._lock = threading.RLock()
+        self._sync_lock = threading.Lock()
+        # Unchecked until the first sync, since the collection may have changed while closed.
+        self._generation = 1
+        self._synced_generation = 0
+
+    @property
+    def conn(self) -> sqlite3.Connection:
+        with self._lock:
+            if self._conn is None:
+                try:
+                    os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+                    conn = sqlite3.connect(self.path, check_same_thread=False)
+                    conn.execute("PRAGMA journal_mode=WAL")
+                    conn.execute(
+                        "CREATE TABLE IF NOT EXISTS docs (id TEXT PRIMARY KEY, length INTEGER)"
+                    )
+                    conn.execute(
+                        "CREATE TABLE IF NOT EXISTS postings ("
+                        "term TEXT, doc_id TEXT, tf INTEGER, PRIMARY KEY (term, doc_id)"
+                        ") WITHOUT ROWID"
+                    )
+                    conn.execute("CREATE INDEX IF NOT EXISTS postings_doc ON postings (doc_id)")
+                    conn.commit()
+                    self._conn = conn
+                    logger.debug(f"Opened lexical index: {self.path}")
+                except sqlite3.Error as e:
+                    raise BackendError(f"Failed to open lexical index {self.path}: {e}")
+            return self._conn
+
+    @property
+    def dirty(self) -> bool:
+        """Whether the collection may have changed since the index was last checked."""
+        with self._lock:
+            return self._generation != self._synced_generation
+
+    def mark_dirty(self) -> None:
+        """Record that the collection changed, so the next sync checks for drift."""
+        with self._lock:
+            self._generation += 1
+
+    def sync(
+        self,
+        expected_count: Callable[[], int],
+        load: Callable[[], tuple[list[str], list[str]]],
+    ) -> bool:
+        """Rebuild from ``load()`` if marked dirty and the counts differ; True if rebuilt.
+
+        Concurrent callers wait for one check instead of each rebuilding.
+        """
+        if not self.dirty:
+            return False
+        with self._sync_lock:
+            with self._lock:
+                generation = self._generation
+                if generation == self._synced_generation:
+                    return False
+            rebuilt = self.count() != expected_count()
+            if rebuilt:
+                self.rebuild(*load())
+            with self._lock:
+                self._synced_generation = max(self._synced_generation, generation)
+            return rebuilt
+
+    def count(self) -> int:
+        """Number of indexed documents."""
+        with self._lock:
+            return self.conn.execute("SELECT COUNT(*) FROM docs").fetchone()[0]
+
+    def add(self, ids: list[str], texts: list[str]) -> None:
+        """Index documents, replacing any existing entries with the same ids."""
+        with self._lock:
+            conn = self.conn
+            self._delete(conn, ids)
+            docs = []
+            postings = []
+            for doc_id, text in zip(ids, texts):
+                terms = Counter(tokenize(text))
+                docs.append((doc_id, sum(terms.values())))
+                postings.extend((term, doc_id, tf) for term, tf in terms.items())
+            conn.executemany("INSERT INTO docs (id, length) VALUES (?, ?)", docs)
+            conn.executemany("INSERT INTO postings (term, doc_id, tf) VALUES (?, ?, ?)", postings)
+            conn.commit()
+
+    def delete(self, ids: list[str]) -> None:
+        """Remove documents from the index."""
+        with self._lock:
+            self._delete(self.conn, ids)
+            self.conn.commit()
+
+    def _delete(self, conn: sqlite3.Connection, ids: list[str]) -> None:
+        conn.executemany("DELETE FROM postings WHERE doc_id = ?", [(i,) for i in ids])
+        conn.executemany("DELETE FROM docs WHERE id = ?", [(i,) for i in ids])
+
+    def search(self, query: str, k: int = 10) -> list[tuple[str, float]]:
+        """Return up to k (document id, BM25 score) pairs, best first."""
+        terms = list(dict.fromkeys(tokenize(query)))
+        if not terms:
+            return []
+
+        with self._lock:
+            conn = self.conn
+            total, avg_length = conn.execute("SELECT COUNT(*), AVG(length) FROM docs").fetchone()
+            if not total:
+                return []
+            placeholders = ",".join("?" * len(terms))
+            rows = conn.execute(
+                "SELECT p.term, p.doc_id, p.tf, d.length FROM postings p "
+                f"JOIN docs d ON d.id = p.doc_id WHERE p.term IN ({placeholders})",
+                terms,
+            ).fetchall()
+
+        doc_freq = Counter(term for term, _, _, _ in rows)
+        scores: dict[str, float] = {}
+        for term, doc_id, tf, length in rows:
+            df = doc_freq[term]
+            idf = math.log(1 + (total - df + 0.5) / (df + 0.5))
+            norm = tf + self.k1 * (1 - self.b + self.b * length / (avg_length or 1))
+            scores[doc_id] = scores.get(doc_id, 0.0) + idf * tf * (self.k1 + 1) / norm
+
+        return sorted(scores.items(), key=lambda item: item[1], reverse=True)[:k]
+
+    def rebuild(self, ids: list[str], texts: list[str]) -> None:
+        """Replace the whole index with the given documents."""
+        with self._lock:
+            conn = self.conn
+            conn.execute("DELETE FROM postings")
+            conn.execute("DELETE FROM docs")
+            conn.commit()
+            self.add(ids, texts)
+
+    def close(self) -> None:
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
@@ -0,0 +1,437 @@
+"""
+In-process exact vector store backed by memory-mapped NumPy arrays.
+
+Each collection keeps its normalized vectors in a ``vectors.npy`` file opened
+with ``mmap`` and its ids, documents and metadata in a SQLite side table.
+Queries are brute-force cosine similarity with ``argpartition`` top-k, so
+recall is exact and opening a collection does not load the vectors into memory.
+"""
+
+import json
+import os
+import re
+import sqlite3
+import threading
+import uuid
+from typing import Any, Literal, Optional
+
+import numpy as np
+from loguru import logger
+
+from deep_agent.core.exceptions import BackendError
+from deep_agent.storage.base import StorageBackend
+
+_VALID_NAME = re.compile(r"^[A-Za-z0-9][A-Za-z0-9._-]{1,62}$")
+_COMPARISONS = {"$eq": "=", "$ne": "!=", "$gt": ">", "$gte": ">=", "$lt": "<", "$lte": "<="}
+_SCAN_BLOCK = 65_536
+_MIN_CAPACITY = 1024
+
+
+def _where_sql(where: dict) -> tuple[str, list]:
+    """Translate a Chroma-style metadata filter into a SQL condition."""
+    clauses: list[str] = []
+    params: list = []
+    for key, value in where.items():
+        if key in ("$and", "$or"):
+            parts = [_where_sql(item) for item in value]
+            joiner = " AND " if key == "$and" else " OR "
+            clauses.append("(" + joiner.join(sql for sql, _ in parts) + ")")
+            params.extend(p for _, part_params in parts for p in part_params)
+            continue
+
+        conditions = value if isinstance(value, dict) else {"$eq": value}
+        for op, operand in conditions.items():
+            field = "json_extract(metadata, ?)"
+            path = '$."' + key.replace('"', '\\"') + '"'
+            if op in _COMPARISONS:
+                clauses.append(f"{field} {_COMPARISONS[op]} ?")
+                params.extend([path, operand])
+            elif op in ("$in", "$nin"):
+                placeholders = ",".join("?" * len(operand))
+                negate = "NOT " if op == "$nin" else ""
+                clauses.append(f"{field} {negate}IN ({placeholders})")
+                params.extend([path, *operand])
+            else:
+                raise BackendError(f"Unsupported metadata filter operator: {op}")
+    return " AND ".join(clauses) or "1", params
+
+
+def _where_document_sql(where_document: dict) -> tuple[str, list]:
+    """Translate a Chroma-style document filter into a SQL condition."""
+    clauses: list[str] = []
+    params: list = []
+    for op, operand in where_document.items():
+        if op in ("$and", "$or"):
+            parts = [_where_document_sql(item) for item in operand]
+            joiner = " AND " if op == "$and" else " OR "
+            clauses.append("(" + joiner.join(sql for sql, _ in parts) + ")")
+            params.extend(p for _, part_params in parts for p in part_params)
+        elif op == "$contains":
+            clauses.append("instr(document, ?) > 0")
+            params.append(operand)
+        elif op == "$not_contains":
+            clauses.append("instr(document, ?) = 0")
+            params.append(operand)
+        else:
+            raise BackendError(f"Unsupported document filter operator: {op}")
+    return " AND ".join(clauses) or "1", params
+
+
+class NumpyCollection:
+    """A collection with the subset of the ``chromadb.Collection`` API used by the search tools.
+
+    Vectors are L2-normalized on write, and query distances are ``1 - cosine``.
+    """
+
+    def __init__(self, name: str, path: str, dtype: Literal["float32", "float16"] = "float32"):
+        self.name = name
+        self.path = path
+        self._vectors_path = os.path.join(path, "vectors.npy")
+        self._lock = threading.RLock()
+
+        os.makedirs(path, exist_ok=True)
+        try:
+            self._conn = sqlite3.connect(
+                os.path.join(path, "metadata.sqlite3"), check_same_thread=False
+            )
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("CREATE TABLE IF NOT EXISTS info (key TEXT PRIMARY KEY, value TEXT)")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS records ("
+                "seq INTEGER PRIMARY KEY AUTOINCREMENT, id TEXT UNIQUE NOT NULL, "
+                "slot INTEGER NOT NULL, document TEXT, metadata TEXT)"
+            )
+            self._conn.execute(
+                "INSERT OR IGNORE INTO info (key, value) VALUES ('id', ?), ('dtype', ?)",
+                (str(uuid.uuid4()), dtype),
+            )
+            self._conn.commit()
+            info = dict(self._conn.execute("SELECT key, value FROM info").fetchall())
+            slots = self._conn.execute("SELECT id, slot FROM records").fetchall()
+        except sqlite3.Error as e:
+            raise BackendError(f"Failed to open vector collection {name}: {e}")
+
+        self.id = info["id"]
+        self.dtype = np.dtype(info["dtype"])
+        self._slots: dict[str, int] = dict(slots)
+        self._vectors: Optional[np.memmap] = None
+        if os.path.exists(self._vectors_path):
+            self._vectors = np.load(self._vectors_path, mmap_mode="r+")
+        capacity = 0 if self._vectors is None else self._vectors.shape[0]
+        self._live = np.zeros(capacity, dtype=bool)
+        if self._slots:
+            self._live[list(self._slots.values())] = True
+        self._free = sorted(set(range(capacity)) - set(self._slots.values()), reverse=True)
+        logger.debug(f"Opened vector collection: {name} ({len(self._slots)} vectors)")
+
+    def count(self) -> int:
+        """Number of stored documents."""
+        with self._lock:
+            return len(self._slots)
+
+    def _allocate(self, count: int, dim: int) -> list[int]:
+        """Reserve free slots, growing the vector file when needed."""
+        if self._vectors is not None and self._vectors.shape[1] != dim:
+            raise BackendError(
+                f"Embedding dimension {dim} does not match collection "
+                f"{self.name} ({self._vectors.shape[1]})"
+            )
+        if len(self._free) < count:
+            capacity = 0 if self._vectors is None else self._vectors.shape[0]
+            needed = capacity + count - len(self._free)
+            new_capacity = max(_MIN_CAPACITY, capacity * 2, needed)
+            self._grow(new_capacity, dim)
+            self._free = sorted(set(self._free) | set(range(capacity, new_capacity)), reverse=True)
+        return [self._free.pop() for _ in range(count)]
+
+    def _grow(self, capacity: int, dim: int) -> None:
+        tmp_path = self._vectors_path + ".tmp"
+        grown = np.lib.format.open_memmap(
+            tmp_path, mode="w+", dtype=self.dtype, shape=(capacity, dim)
+        )
+        if self._vectors is not None:
+            grown[: self._vectors.shape[0]] = self._vectors
+        grown.flush()
+        del grown
+        self._vectors = None
+        os.replace(tmp_path, self._vectors_path)
+        self._vectors = np.load(self._vectors_path, mmap_mode="r+")
+        live = np.zeros(capacity, dtype=bool)
+        live[: len(self._live)] = self._live
+        self._live = live
+
+    def upsert(
+        self,
+        ids: list[str],
+        embeddings: Any,
+        documents: Optional[list[str]] = None,
+        metadatas: Optional[list[Optional[dict]]] = None,
+    ) -> None:
+        """Insert or replace documents and their embeddings."""
+        if not ids:
+            return
+        vectors = np.asarray(embeddings, dtype=np.float32)
+        if vectors.ndim != 2 or len(vectors) != len(ids):
+            raise BackendError("Expected one embedding per id")
+        norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+        vectors = vectors / np.where(norms == 0, 1, norms)
+
+        with self._lock:
+            new_ids = [doc_id for doc_id in dict.fromkeys(ids) if doc_id not in self._slots]
+            allocated = dict(zip(new_ids, self._allocate(len(new_ids), vectors.shape[1])))
+            slots = [self._slots.get(doc_id, allocated.get(doc_id)) for doc_id in ids]
+
+            self._vectors[slots] = vectors.astype(self.dtype)
+            self._vectors.flush()
+            try:
+                self._conn.executemany(
+                    "INSERT INTO records (id, slot, document, metadata) VALUES (?, ?, ?, ?) "
+                    "ON CONFLICT(id) DO UPDATE SET document = excluded.document, "
+                    "metadata = excluded.metadata",
+                    [
+                        (
+                            doc_id,
+                            slot,
+                            documents[i] if documents else None,
+                            json.dumps(metadatas[i]) if metadatas and metadatas[i] else None,
+                        )
+                        for i, (doc_id, slot) in enumerate(zip(ids, slots))
+                    ],
+                )
+                self._conn.commit()
+            except sqlite3.Error as e:
+                self._conn.rollback()
+                self._free.extend(allocated.values())
+                raise BackendError(f"Failed to write to collection {self.name}: {e}")
+
+            self._slots.update(allocated)
+            self._live[slots] = True
+
+    def delete(self, ids: Optional[list[str]] = None, where: Optional[dict] = None) -> None:
+        """Delete documents by id and/or metadata filter."""
+        if ids is None and not where:
+            raise ValueError(
+                "At least one of ids, where, or where_document must be provided in delete."
+            )
+        with self._lock:
+            targets = self.get(ids=ids, where=where, include=[])["ids"]
+            if not targets:
+                return
+            self._conn.executemany("DELETE FROM records WHERE id = ?", [(i,) for i in targets])
+            self._conn.commit()
+            for doc_id in targets:
+                slot = self._slots.pop(doc_id)
+                self._live[slot] = False
+                self._free.append(slot)
+            self._free.sort(reverse=True)
+
+    def _select(
+        self,
+        columns: str,
+        ids: Optional[list[str]] = None,
+        where: Optional[dict] = None,
+        where_document: Optional[dict] = None,
+        limit: Optional[int] = None,
+        offset: Optional[int] = None,
+    ) -> list[tuple]:
+        clauses: list[str] = []
+        params: list = []
+        if ids is not None:
+            clauses.append(f"id IN ({','.join('?' * len(ids))})")
+            params.extend(ids)
+        if where:
+            sql, where_params = _where_sql(where)
+            clauses.append(sql)
+            params.extend(where_params)
+        if where_document:
+            sql, where_params = _where_document_sql(where_document)
+            clauses.append(sql)
+            params.extend(where_params)
+
+        query = f"SELECT {columns} FROM records"
+        if clauses:
+            query += " WHERE " + " AND ".join(clauses)
+        query += " ORDER BY seq"
+        if limit is not None or offset:
+            query += " LIMIT ? OFFSET ?"
+            params.extend([-1 if limit is None else limit, offset or 0])
+        try:
+            return self._conn.execute(query, params).fetchall()
+        except sqlite3.Error as e:
+            raise BackendError(f"Failed to read collection {self.name}: {e}")
+
+    def _rows(self, ids: list[str], include: list[str]) -> dict[str, tuple]:
+        if not ids or not {"documents", "metadatas"}.intersection(include):
+            return {}
+        rows: dict[str, tuple] = {}
+        for start in range(0, len(ids), 900):
+            chunk = ids[start : start + 900]
+            for doc_id, document, metadata in self._select("id, document, metadata", ids=chunk):
+                rows[doc_id] = (document, json.loads(metadata) if metadata else None)
+        return rows
+
+    def get(
+        self,
+        ids: Optional[list[str]] = None,
+        where: Optional[dict] = None,
+        where_document: Optional[dict] = None,
+        limit: Optional[int] = None,
+        offset: Optional[int] = None,
+        include: Optional[list[str]] = None,
+    ) -> dict:
+        """Fetch documents by id and/or filters, in insertion order."""
+        include = ["metadatas", "documents"] if include is None else include
+        with self._lock:
+            if ids is not None and not ids:
+                found: list[str] = []
+            elif ids is not None and len(ids) > 900:
+                found = [
+                    doc_id
+                    for start in range(0, len(ids), 900)
+                    for (doc_id,) in self._select(
+                        "id", ids[start : start + 900], where, where_document
+                    )
+                ][offset or 0 :][:limit]
+            else:
+                found = [
+                    doc_id
+                    for (doc_id,) in self._select("id", ids, where, where_document, limit, offset)
+                ]
+            rows = self._rows(found, include)
+            embeddings = None
+            if "embeddings" in include:
+                embeddings = np.asarray(
+                    self._vectors[[self._slots[i] for i in found]] if found else np.empty((0, 0)),
+                    dtype=np.float32,
+                )
+
+        return {
+            "ids": found,
+            "documents": [rows[i][0] for i in found] if "documents" in include else None,
+            "metadatas": [rows[i][1] for i in found] if "metadatas" in include else None,
+            "embeddings": embeddings,
+        }
+
+    def query(
+        self,
+        query_embeddings: Any,
+        n_results: int = 10,
+        where: Optional[dict] = None,
+        where_document: Optional[dict] = None,
+        include: Optional[list[str]] = None,
+    ) -> dict:
+        """Exact cosine top-k for each query embedding."""
+        include = ["metadatas", "documents", "distances"] if include is None else include
+        queries = np.asarray(query_embeddings, dtype=np.float32)
+        norms = np.linalg.norm(queries, axis=1, keepdims=True)
+        queries = queries / np.where(norms == 0, 1, norms)
+
+        with self._lock:
+            if self._vectors is None or not self._slots:
+                candidates = np.empty(0, dtype=np.int64)
+            elif where or where_document:
+                rows = self._select("slot", where=where, where_document=where_document)
+                candidates = np.fromiter((slot for (slot,) in rows), dtype=np.int64)
+            else:
+                candidates = np.flatnonzero(self._live)
+
+            k = min(n_results, len(candidates))
+            top_slots: list[np.ndarray] = []
+            distances: list[list[float]] = []
+            for query in queries:
+                scores = np.empty(len(candidates), dtype=np.float32)
+                for start in range(0, len(candidates), _SCAN_BLOCK):
+                    block = candidates[start : start + _SCAN_BLOCK]
+                    scores[start : start + len(block)] = self._vectors[block] @ query
+                top = np.argpartition(-scores, k - 1)[:k] if 0 < k < len(scores) else np.arange(k)
+                top = top[np.argsort(-scores[top], kind="stable")]
+                top_slots.append(candidates[top])
+                distances.append((1 - scores[top]).tolist())
+
+            by_slot = {slot: doc_id for doc_id, slot in self._slots.items()}
+            ids = [[by_slot[int(slot)] for slot in slots] for slots in top_slots]
+            rows = self._rows([doc_id for group in ids for doc_id in group], include)
+            embeddings = None
+            if "embeddings" in include:
+                embeddings = [
+                    np.asarray(self._vectors[slots], dtype=np.float32) for slots in top_slots
+                ]
+
+        return {
+            "ids": ids,
+            "distances": distances if "distances" in include else None,
+            "documents": (
+                [[rows[i][0] for i in group] for group in ids] if "documents" in include else None
+            ),
+            "metadatas": (
+                [[rows[i][1] for i in group] for group in ids] if "metadatas" in include else None
+            ),
+            "embeddings": embeddings,
+        }
+
+    def close(self) -> None:
+        with self._lock:
+            self._vectors = None
+            self._conn.close()
+
+
+class NumpyStorage(StorageBackend):
+    """Storage backend keeping each collection in a memory-mapped NumPy file."""
+
+    def __init__(
+        self,
+        persist_directory: str = "./data/chroma",
+        dtype: Literal["float32", "float16"] = "float32",
+    ):
+        self.persist_directory = persist_directory
+        self.dtype = dtype
+        self.root: Optional[str] = None
+        self._collections: dict[str, NumpyCollection] = {}
+        self._lock = threading.Lock()
+
+    def initialize(self) -> None:
+        """Create the collections directory."""
+        try:
+            root = os.path.join(self.persist_directory, "numpy")
+            os.makedirs(root, exist_ok=True)
+            self.root = root
+            logger.info(f"NumPy vector storage initialized: {root}")
+        except OSError as e:
+            raise BackendError(f"Failed to initialize NumPy vector storage: {e}")
+
+    def get_collection(self, name: str) -> NumpyCollection:
+        """Get or create a collection by name."""
+        if self.root is None:
+            raise BackendError("NumPy vector storage not initialized. Call initialize() first.")
+        if not _VALID_NAME.match(name) or ".." in name:
+            raise BackendError(f"Invalid collection name: {name}")
+
+        with self._lock:
+            collection = self._collections.get(name)
+            if collection is None:
+                collection = NumpyCollection(name, os.path.join(self.root, name), self.dtype)
+                self._collections[name] = collection
+            return collection
+
+    def list_collections(self) -> list[NumpyCollection]:
+        """List all collections in the storage directory."""
+        if self.root is None:
+            raise BackendError("NumPy vector storage not initialized. Call initialize() first.")
+        names = sorted(
+            entry.name
+            for entry in os.scandir(self.root)
+            if entry.is_dir() and os.path.exists(os.path.join(entry.path, "metadata.sqlite3"))
+        )
+        return [self.get_collection(name) for name in names]
+
+    def segment_directories(self) -> dict[str, list[str]]:
+        """Map collection ids to their data directories."""
+        return {col.id: [col.path] for col in self.list_collections()}
+
+    def close(self) -> None:
+        """Close all open collections."""
+        with self._lock:
+            for collection in self._collections.values():
+                collection.close()
+            self._collections.clear()
+        self.root = None
@@ -0,0 +1,241 @@
+"""
+Process-wide pool of vector store and embedding clients.
+
+Keeps one embeddings client and one collection handle per
+(persist_directory, collection_name), so tool calls skip client setup.
+"""
+
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Literal, Optional, Union
+
+from langchain_core.embeddings import Embeddings
+from loguru import logger
+
+from deep_agent.config.settings import SearchConfig, Settings
+from deep_agent.storage.base import VectorCollection
+from deep_agent.storage.chroma import ChromaStorage, CollectionStats, disk_usage
+from deep_agent.storage.embedding_cache import CachedEmbeddings
+from deep_agent.storage.lexical import LexicalIndex
+from deep_agent.storage.numpy_store import NumpyStorage
+from deep_agent.storage.result_cache import QueryResultCache
+
+
+class VectorStorePool:
+    """Thread-safe registry of shared vector store and embedding clients.
+
+    ``vector_store`` selects ChromaDB or the in-process NumPy backend.
+    """
+
+    def __init__(
+        self,
+        persist_directory: str = "./data/chroma",
+        embedding_model: str = "nomic-embed-text:latest",
+        base_url: Optional[str] = None,
+        config: Optional[SearchConfig] = None,
+        embeddings: Optional[Embeddings] = None,
+        vector_store: Literal["chroma", "numpy"] = "chroma",
+        vector_dtype: Literal["float32", "float16"] = "float32",
+    ):
+        self.persist_directory = persist_directory
+        self.vector_store = vector_store
+        self.vector_dtype = vector_dtype
+        self.embedding_model = embedding_model
+        self.base_url = base_url
+        self.config = config or SearchConfig()
+
+        self._base_embeddings = embeddings
+        self._embeddings: Optional[Embeddings] = None
+        self._storages: dict[str, Union[ChromaStorage, NumpyStorage]] = {}
+        self._collections: OrderedDict[tuple[str, str], VectorCollection] = OrderedDict()
+        self._lexical: dict[tuple[str, str], LexicalIndex] = {}
+        self._stats: dict[tuple[str, str], tuple[float, CollectionStats]] = {}
+        self.result_cache = QueryResultCache(
+            max_entries=self.config.result_cache_size,
+            ttl_seconds=self.config.result_cache_ttl,
+        )
+        self._lock = threading.RLock()
+
+    @classmethod
+    def from_settings(cls, settings: Optional[Settings] = None) -> "VectorStorePool":
+        """Create a pool configured from application settings."""
+        settings = settings or Settings()
+        return cls(
+            persist_directory=settings.backend.persist_directory,
+            embedding_model=settings.ollama.embedding_model_name,
+            base_url=settings.ollama.base_url,
+            config=settings.search,
+            vector_store=settings.backend.vector_store,
+            vector_dtype=settings.backend.vector_dtype,
+        )
+
+    @property
+    def embeddings(self) -> Embeddings:
+        """Shared (cached) embeddings client, created on first use."""
+        with self._lock:
+            if self._embeddings is None:
+                embeddings = self._base_embeddings
+                if embeddings is None:
+                    from langchain_ollama import OllamaEmbeddings
+
+                    kwargs: dict[str, Any] = {"model": self.embedding_model}
+                    if self.base_url:
+                        kwargs["base_url"] = self.base_url
+                    embeddings = OllamaEmbeddings(**kwargs)
+                    logger.info(f"Created shared embeddings client: {self.embedding_model}")
+
+                if self.config.embedding_cache_size > 0:
+                    embeddings = CachedEmbeddings(
+                        embeddings,
+                        model_name=self.embedding_model,
+                        cache_path=os.path.join(self.persist_directory, "embedding_cache.sqlite3"),
+                        max_memory_entries=self.config.embedding_cache_size,
+                    )
+                self._embeddings = embeddings
+            return self._embeddings
+
+    def get_storage(
+        self, persist_directory: Optional[str] = None
+    ) -> Union[ChromaStorage, NumpyStorage]:
+        """Get the initialized storage for a persist directory."""
+        persist_directory = persist_directory or self.persist_directory
+        with self._lock:
+            storage = self._storages.get(persist_directory)
+            if storage is None:
+                if self.vector_store == "numpy":
+                    storage = NumpyStorage(persist_directory, dtype=self.vector_dtype)
+                else:
+                    storage = ChromaStorage(persist_directory)
+                storage.initialize()
+                self._storages[persist_directory] = storage
+            return storage
+
+    def get_collection(
+        self,
+        collection_name: str,
+        persist_directory: Optional[str] = None,
+    ) -> VectorCollection:
+        """Get a cached collection handle, opening it on first use."""
+        persist_directory = persist_directory or self.persist_directory
+        key = (persist_directory, collection_name)
+        with self._lock:
+            collection = self._collections.get(key)
+            if collection is not None:
+                self._collections.move_to_end(key)
+                return collection
+
+            collection = self.get_storage(persist_directory).get_collection(collection_name)
+            self._collections[key] = collection
+            while len(self._collections) > self.config.max_open_collections:
+                evicted, _ = self._collections.popitem(last=False)
+                logger.debug(f"Evicted collection handle: {evicted[1]} ({evicted[0]})")
+            return collection
+
+    def get_lexical_index(
+        self,
+        collection_name: str,
+        persist_directory: Optional[str] = None,
+    ) -> LexicalIndex:
+        """Get the lexical index kept next to a collection (opened lazily)."""
+        persist_directory = persist_directory or self.persist_directory
+        key = (persist_directory, collection_name)
+        with self._lock:
+            index = self._lexical.get(key)
+            if index is None:
+                path = os.path.join(persist_directory, "lexical", f"{collection_name}.sqlite3")
+                index = LexicalIndex(path)
+                self._lexical[key] = index
+            return index
+
+    def invalidate(self, collection_name: str, persist_directory: Optional[str] = None) -> None:
+        """Invalidate cached search results and statistics after a write to a collection."""
+        key = (persist_directory or self.persist_directory, collection_name)
+        self.result_cache.invalidate(key)
+        with self._lock:
+            self._stats.pop(key, None)
+
+    def collection_stats(self, persist_directory: Optional[str] = None) -> list[CollectionStats]:
+        """Count and on-disk size of every collection, without touching embeddings.
+
+        Statistics are cached per collection until it is written through the
+        pool or ``stats_cache_ttl`` expires.
+        """
+        persist_directory = persist_directory or self.persist_directory
+        storage = self.get_storage(persist_directory)
+        collections = storage.list_collections()
+        now = time.monotonic()
+
+        results: dict[str, CollectionStats] = {}
+        stale = []
+        with self._lock:
+            for col in collections:
+                cached = self._stats.get((persist_directory, col.name))
+                if cached is None or now - cached[0] > self.config.stats_cache_ttl:
+                    stale.append(col)
+                else:
+                    results[col.name] = cached[1]
+        segments = storage.segment_directories() if stale else {}
+
+        for col in stale:
+            lexical = os.path.join(persist_directory, "lexical", f"{col.name}.sqlite3")
+            size, last_modified = disk_usage(segments.get(str(col.id), []) + [lexical])
+            stats = CollectionStats(
+                name=col.name,
+                count=col.count(),
+                size_bytes=size,
+                last_modified=last_modified,
+            )
+            with self._lock:
+                self._stats[(persist_directory, col.name)] = (now, stats)
+            results[col.name] = stats
+
+        # Return what was computed here; a concurrent invalidate() may have dropped the cache.
+        return [results[col.name] for col in collections]
+
+    def list_collections(
+        self,
+        persist_directory: Optional[str] = None,
+    ) -> list[VectorCollection]:
+        """List all collections in a persist directory."""
+        return list(self.get_storage(persist_directory).list_collections())
+
+    def close(self) -> None:
+        """Drop all cached handles and close the underlying clients."""
+        with self._lock:
+            self._collections.clear()
+            self.result_cache.clear()
+            self._stats.clear()
+            for index in self._lexical.values():
+                index.close()
+            self._lexical.clear()
+            for storage in self._storages.values():
+                storage.close()
+            self._storages.clear()
+            if isinstance(self._embeddings, CachedEmbeddings):
+                self._embeddings.close()
+            self._embeddings = None
+            logger.debug("Closed vector store pool")
+
+
+_pool: Optional[VectorStorePool] = None
+_pool_lock = threading.Lock()
+
+
+def get_vectorstore_pool() -> VectorStorePool:
+    """Get the process-wide vector store pool, creating it on first use."""
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = VectorStorePool.from_settings()
+        return _pool
+
+
+def close_vectorstore_pool() -> None:
+    """Close and discard the process-wide vector store pool."""
+    global _pool
+    with _pool_lock:
+        if _pool is not None:
+            _pool.close()
+            _pool = None
@@ -0,0 +1,74 @@
+"""
+Rank fusion and re-ranking helpers for search results.
+"""
+
+from typing import Any, Optional, Sequence
+
+import numpy as np
+
+
+def reciprocal_rank_fusion(
+    rankings: list[list[str]],
+    weights: Optional[list[float]] = None,
+    k: int = 60,
+) -> list[tuple[str, float]]:
+    """Merge ranked id lists with weighted reciprocal rank fusion.
+
+    Each id scores ``sum(weight / (k + rank))`` over the rankings it appears in.
+
+    Returns:
+        (id, fused score) pairs, best first
+    """
+    weights = weights or [1.0] * len(rankings)
+    if len(weights) != len(rankings):
+        raise ValueError("Expected one weight per ranking")
+
+    scores: dict[str, float] = {}
+    for ranking, weight in zip(rankings, weights):
+        for rank, item in enumerate(ranking, start=1):
+            scores[item] = scores.get(item, 0.0) + weight / (k + rank)
+    return sorted(scores.items(), key=lambda pair: pair[1], reverse=True)
+
+
+def maximal_marginal_relevance(
+    relevance: Sequence[float],
+    embeddings: Any,
+    k: int,
+    lambda_mult: float = 0.5,
+) -> list[int]:
+    """Select k diverse candidates with maximal marginal relevance.
+
+    Candidate similarities are computed once as a single matrix product; each
+    selection step then updates every candidate's maximum similarity to the
+    chosen set with one vectorized ``np.maximum``.
+
+    Args:
+        relevance: First-stage relevance of each candidate, higher is better
+        embeddings: Candidate embeddings, one row per candidate
+        k: Number of candidates to select
+        lambda_mult: 1 ranks by relevance only, 0 by diversity only
+
+    Returns:
+        Indices of the selected candidates, in selection order
+    """
+    vectors = np.asarray(embeddings, dtype=np.float32)
+    count = min(k, len(vectors))
+    if count <= 0:
+        return []
+
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    vectors = vectors / np.where(norms == 0, 1, norms)
+    similarity = vectors @ vectors.T
+    relevance = np.asarray(relevance, dtype=np.float32)
+
+    selected = [int(np.argmax(relevance))]
+    max_similarity = similarity[selected[0]].copy()
+    penalty = np.zeros(len(vectors), dtype=np.float32)
+    penalty[selected[0]] = np.inf
+    while len(selected) < count:
+        scores = lambda_mult * relevance - (1 - lambda_mult) * max_similarity - penalty
+        best = int(np.argmax(scores))
+        selected.append(best)
+        penalty[best] = np.inf
+        np.maximum(max_similarity, similarity[best], out=max_similarity)
+    return selected
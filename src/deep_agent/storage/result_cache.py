@@ -0,0 +1,90 @@
+"""
+Query result cache invalidated by per-collection generation counters.
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Hashable, Optional
+
+
+class QueryResultCache:
+    """Bounded TTL cache of search results.
+
+    Entries are stored with the generation of their collection at the time of
+    the query. Writing to a collection bumps its generation, which makes all
+    of its cached entries stale without scanning the cache.
+    """
+
+    def __init__(self, max_entries: int = 1024, ttl_seconds: float = 300.0):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.hits = 0
+        self.misses = 0
+
+        self._entries: OrderedDict[tuple, tuple[int, float, Any]] = OrderedDict()
+        self._generations: dict[Hashable, int] = {}
+        self._lock = threading.Lock()
+
+    def generation(self, collection: Hashable) -> int:
+        """Current generation of a collection."""
+        with self._lock:
+            return self._generations.get(collection, 0)
+
+    def invalidate(self, collection: Hashable) -> None:
+        """Invalidate all cached results for a collection."""
+        with self._lock:
+            self._generations[collection] = self._generations.get(collection, 0) + 1
+
+    def get(self, collection: Hashable, key: Hashable) -> Optional[Any]:
+        """Return a cached value, or None if missing, stale or expired."""
+        with self._lock:
+            entry = self._entries.get((collection, key))
+            if entry is not None:
+                generation, stored_at, value = entry
+                fresh = time.monotonic() - stored_at <= self.ttl_seconds
+                if fresh and generation == self._generations.get(collection, 0):
+                    self._entries.move_to_end((collection, key))
+                    self.hits += 1
+                    return value
+                del self._entries[(collection, key)]
+            self.misses += 1
+            return None
+
+    def put(
+        self,
+        collection: Hashable,
+        key: Hashable,
+        value: Any,
+        generation: Optional[int] = None,
+    ) -> None:
+        """Cache a value for a collection.
+
+        Pass the generation read before running the query, so a write that
+        lands while the query runs is not masked by the cached result.
+        """
+        if self.max_entries <= 0:
+            return
+        with self._lock:
+            current = self._generations.get(collection, 0)
+            if generation is not None and generation != current:
+                return
+            self._entries[(collection, key)] = (current, time.monotonic(), value)
+            self._entries.move_to_end((collection, key))
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> dict:
+        """Return hit/miss counters."""
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "entries": len(self._entries),
+                "hit_rate": self.hits / total if total else 0.0,
+            }
@@ -0,0 +1,288 @@
+"""
+Disk-backed cache of scraped pages with TTLs and conditional revalidation.
+"""
+
+import os
+import sqlite3
+import threading
+import time
+from typing import Optional
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+from loguru import logger
+from pydantic import BaseModel
+
+from deep_agent.config.settings import Settings
+from deep_agent.core.exceptions import BackendError
+
+_DEFAULT_PORTS = {"http": 80, "https": 443}
+_TRACKING_PREFIXES = ("utm_",)
+_TRACKING_PARAMS = {"fbclid", "gclid", "mc_cid", "mc_eid", "ref_src"}
+
+
+def canonicalize_url(url: str) -> str:
+    """Normalize a URL so trivially different spellings share a cache entry.
+
+    Lowercases the scheme and host, drops default ports, fragments and
+    tracking parameters, and sorts the query string.
+    """
+    parts = urlsplit(url.strip())
+    scheme = parts.scheme.lower()
+    host = (parts.hostname or "").lower()
+    if parts.port and parts.port != _DEFAULT_PORTS.get(scheme):
+        host = f"{host}:{parts.port}"
+    query = sorted(
+        (key, value)
+        for key, value in parse_qsl(parts.query, keep_blank_values=True)
+        if not key.lower().startswith(_TRACKING_PREFIXES) and key.lower() not in _TRACKING_PARAMS
+    )
+    return urlunsplit((scheme, host, parts.path or "/", urlencode(query), ""))
+
+
+class CachedPage(BaseModel):
+    """A cached scrape result and its HTTP validators."""
+
+    url: str
+    format: str
+    content: str
+    etag: Optional[str] = None
+    last_modified: Optional[str] = None
+    fetched_at: float
+    expires_at: float
+
+    @property
+    def fresh(self) -> bool:
+        return time.time() < self.expires_at
+
+    @property
+    def revalidatable(self) -> bool:
+        return bool(self.etag or self.last_modified)
+
+
+class ScrapeCache:
+    """SQLite cache of scraped content keyed by canonical URL and output format.
+
+    Entries expire after a per-domain TTL; expired entries with an ETag or
+    Last-Modified validator can be refreshed with :meth:`refresh` after a 304
+    instead of being rendered again. The total content size is bounded, and
+    the least recently read entries are evicted first.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        default_ttl: float = 86_400.0,
+        domain_ttls: Optional[dict[str, float]] = None,
+        max_bytes: int = 256 * 1024 * 1024,
+    ):
+        self.path = path
+        self.default_ttl = default_ttl
+        self.domain_ttls = domain_ttls or {}
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.stale = 0
+        self.revalidated = 0
+        self.evictions = 0
+
+        self._conn: Optional[sqlite3.Connection] = None
+        self._lock = threading.RLock()
+
+    @property
+    def conn(self) -> sqlite3.Connection:
+        with self._lock:
+            if self._conn is None:
+                try:
+                    os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+                    conn = sqlite3.connect(self.path, check_same_thread=False)
+                    conn.execute("PRAGMA journal_mode=WAL")
+                    conn.execute(
+                        "CREATE TABLE IF NOT EXISTS pages ("
+                        "url TEXT, format TEXT, content TEXT, etag TEXT, last_modified TEXT, "
+                        "fetched_at REAL, expires_at REAL, accessed_at REAL, size INTEGER, "
+                        "PRIMARY KEY (url, format))"
+                    )
+                    conn.execute("CREATE INDEX IF NOT EXISTS pages_accessed ON pages (accessed_at)")
+                    conn.commit()
+                    self._conn = conn
+                    logger.debug(f"Opened scrape cache: {self.path}")
+                except sqlite3.Error as e:
+                    raise BackendError(f"Failed to open scrape cache {self.path}: {e}")
+            return self._conn
+
+    def ttl_for(self, url: str) -> float:
+        """TTL for a URL: the most specific matching domain TTL, else the default."""
+        host = (urlsplit(url).hostname or "").lower()
+        matches = [
+            domain
+            for domain in self.domain_ttls
+            if host == domain.lower() or host.endswith("." + domain.lower())
+        ]
+        if not matches:
+            return self.default_ttl
+        return self.domain_ttls[max(matches, key=len)]
+
+    def get(self, url: str, format: str) -> Optional[CachedPage]:
+        """Return the cached page, fresh or stale, or None if not cached."""
+        key = canonicalize_url(url)
+        with self._lock:
+            row = self.conn.execute(
+                "SELECT content, etag, last_modified, fetched_at, expires_at FROM pages "
+                "WHERE url = ? AND format = ?",
+                (key, format),
+            ).fetchone()
+            if row is None:
+                self.misses += 1
+                return None
+            self.conn.execute(
+                "UPDATE pages SET accessed_at = ? WHERE url = ? AND format = ?",
+                (time.time(), key, format),
+            )
+            self.conn.commit()
+
+        page = CachedPage(
+            url=key,
+            format=format,
+            content=row[0],
+            etag=row[1],
+            last_modified=row[2],
+            fetched_at=row[3],
+            expires_at=row[4],
+        )
+        with self._lock:
+            if page.fresh:
+                self.hits += 1
+            else:
+                self.stale += 1
+        return page
+
+    def put(
+        self,
+        url: str,
+        format: str,
+        content: str,
+        etag: Optional[str] = None,
+        last_modified: Optional[str] = None,
+    ) -> None:
+        """Store a scraped page, then evict old entries beyond ``max_bytes``."""
+        key = canonicalize_url(url)
+        now = time.time()
+        size = len(content.encode("utf-8"))
+        if size > self.max_bytes:
+            return
+        with self._lock:
+            self.conn.execute(
+                "INSERT OR REPLACE INTO pages (url, format, content, etag, last_modified, "
+                "fetched_at, expires_at, accessed_at, size) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (
+                    key,
+                    format,
+                    content,
+                    etag,
+                    last_modified,
+                    now,
+                    now + self.ttl_for(key),
+                    now,
+                    size,
+                ),
+            )
+            self.conn.commit()
+            self._evict()
+
+    def refresh(self, page: CachedPage) -> CachedPage:
+        """Extend a stale entry's lifetime after the origin confirmed it unchanged."""
+        now = time.time()
+        expires_at = now + self.ttl_for(page.url)
+        with self._lock:
+            self.conn.execute(
+                "UPDATE pages SET fetched_at = ?, expires_at = ? WHERE url = ? AND format = ?",
+                (now, expires_at, page.url, page.format),
+            )
+            self.conn.commit()
+            self.revalidated += 1
+        return page.model_copy(update={"fetched_at": now, "expires_at": expires_at})
+
+    def _evict(self) -> None:
+        total = self.conn.execute("SELECT COALESCE(SUM(size), 0) FROM pages").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        evicted = []
+        for url, format, size in self.conn.execute(
+            "SELECT url, format, size FROM pages ORDER BY accessed_at"
+        ).fetchall():
+            if total <= self.max_bytes:
+                break
+            evicted.append((url, format))
+            total -= size
+        self.conn.executemany("DELETE FROM pages WHERE url = ? AND format = ?", evicted)
+        self.conn.commit()
+        self.evictions += len(evicted)
+        logger.debug(f"Evicted {len(evicted)} pages from scrape cache")
+
+    def clear(self) -> None:
+        with self._lock:
+            self.conn.execute("DELETE FROM pages")
+            self.conn.commit()
+
+    def stats(self) -> dict:
+        """Return counters and the current footprint.
+
+        ``hit_rate`` counts fresh hits and stale entries revalidated with a 304.
+        """
+        with self._lock:
+            entries, size = self.conn.execute(
+                "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM pages"
+            ).fetchone()
+            lookups = self.hits + self.misses + self.stale
+            served = self.hits + self.revalidated
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "stale": self.stale,
+                "revalidated": self.revalidated,
+                "evictions": self.evictions,
+                "entries": entries,
+                "size_bytes": size,
+                "hit_rate": served / lookups if lookups else 0.0,
+            }
+
+    def close(self) -> None:
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+
+_cache: Optional[ScrapeCache] = None
+_cache_configured = False
+_cache_lock = threading.Lock()
+
+
+def get_scrape_cache() -> Optional[ScrapeCache]:
+    """Get the process-wide scrape cache, or None when caching is disabled.
+
+    Settings are read on the first call only.
+    """
+    global _cache, _cache_configured
+    with _cache_lock:
+        if not _cache_configured:
+            config = Settings().scraper
+            if config.cache_enabled:
+                _cache = ScrapeCache(
+                    path=config.cache_path,
+                    default_ttl=config.cache_ttl,
+                    domain_ttls=config.cache_domain_ttls,
+                    max_bytes=config.cache_max_bytes,
+                )
+            _cache_configured = True
+        return _cache
+
+
+def close_scrape_cache() -> None:
+    """Close and discard the process-wide scrape cache."""
+    global _cache, _cache_configured
+    with _cache_lock:
+        if _cache is not None:
+            _cache.close()
+            _cache = None
+        _cache_configured = False
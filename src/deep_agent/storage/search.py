@@ -0,0 +1,357 @@
+"""
+Retrieval over pooled collections: vector, lexical and hybrid search.
+"""
+
+import fnmatch
+import json
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Literal, Optional, Union
+
+import numpy as np
+from loguru import logger
+from pydantic import BaseModel, ConfigDict, Field, ValidationError
+
+from deep_agent.core.exceptions import ToolError
+from deep_agent.storage.base import VectorCollection
+from deep_agent.storage.embedding_cache import normalize_text
+from deep_agent.storage.lexical import LexicalIndex
+from deep_agent.storage.pool import VectorStorePool
+from deep_agent.storage.ranking import maximal_marginal_relevance, reciprocal_rank_fusion
+
+_GLOB_CHARS = set("*?[")
+
+
+class SearchHit(BaseModel):
+    """A single search result."""
+
+    id: str
+    document: str
+    metadata: dict = Field(default_factory=dict)
+    score: float
+    collection: str
+
+
+def _include(params: "SearchParams", *fields: str) -> list[str]:
+    include = ["metadatas", *fields]
+    if params.include_documents:
+        include.append("documents")
+    return include
+
+
+def _vector_search(
+    collection: VectorCollection,
+    query_embedding: list[float],
+    k: int,
+    params: "SearchParams",
+) -> list[SearchHit]:
+    results = collection.query(
+        query_embeddings=[query_embedding],
+        n_results=k,
+        where=params.where,
+        where_document=params.where_document,
+        include=_include(params, "distances"),
+    )
+    documents = results["documents"][0] if params.include_documents else None
+    return [
+        SearchHit(
+            id=doc_id,
+            document=(documents[i] if documents else None) or "",
+            metadata=metadata or {},
+            score=1 - distance,
+            collection=collection.name,
+        )
+        for i, (doc_id, metadata, distance) in enumerate(
+            zip(results["ids"][0], results["metadatas"][0], results["distances"][0])
+        )
+    ]
+
+
+def _sync_lexical_index(collection: VectorCollection, index: LexicalIndex) -> None:
+    """Rebuild a lexical index that has drifted from its collection since the last write."""
+
+    def load() -> tuple[list[str], list[str]]:
+        logger.info(f"Rebuilding lexical index for '{collection.name}'")
+        ids: list[str] = []
+        texts: list[str] = []
+        while True:
+            page = collection.get(include=["documents"], limit=5000, offset=len(ids))
+            if not page["ids"]:
+                break
+            ids.extend(page["ids"])
+            texts.extend(d or "" for d in page["documents"])
+        return ids, texts
+
+    index.sync(collection.count, load)
+
+
+def _lexical_search(
+    collection: VectorCollection,
+    index: LexicalIndex,
+    query: str,
+    k: int,
+    params: "SearchParams",
+) -> list[SearchHit]:
+    _sync_lexical_index(collection, index)
+    filtered = params.where is not None or params.where_document is not None
+    ranked = index.search(query, k * 5 if filtered else k)
+    if not ranked:
+        return []
+
+    # The BM25 index holds no metadata, so filters are applied by Chroma on the candidates.
+    stored = collection.get(
+        ids=[doc_id for doc_id, _ in ranked],
+        where=params.where,
+        where_document=params.where_document,
+        include=_include(params),
+    )
+    documents = stored["documents"] if params.include_documents else None
+    by_id = {
+        doc_id: ((documents[i] if documents else None), metadata)
+        for i, (doc_id, metadata) in enumerate(zip(stored["ids"], stored["metadatas"]))
+    }
+    return [
+        SearchHit(
+            id=doc_id,
+            document=by_id[doc_id][0] or "",
+            metadata=by_id[doc_id][1] or {},
+            score=score,
+            collection=collection.name,
+        )
+        for doc_id, score in ranked
+        if doc_id in by_id
+    ][:k]
+
+
+class SearchParams(BaseModel):
+    """Options for a search, also used as part of the result cache key."""
+
+    model_config = ConfigDict(frozen=True, extra="forbid")
+
+    n_results: int = 5
+    mode: Literal["vector", "lexical", "hybrid"] = "vector"
+    vector_weight: float = 1.0
+    lexical_weight: float = 1.0
+    rrf_k: int = 60
+    where: Optional[dict] = None
+    where_document: Optional[dict] = None
+    include_documents: bool = True
+    diversity: float = Field(default=0.0, ge=0.0, le=1.0)
+
+    @property
+    def candidate_count(self) -> int:
+        """Candidates to fetch before diversity re-ranking."""
+        return max(self.n_results * 4, 20) if self.diversity else self.n_results
+
+    @classmethod
+    def from_options(cls, options: dict) -> "SearchParams":
+        """Validate search options, raising ToolError for unknown or invalid ones."""
+        try:
+            return cls(**options)
+        except ValidationError as e:
+            problems = "; ".join(
+                f"{'.'.join(map(str, error['loc']))}: {error['msg']}" for error in e.errors()
+            )
+            raise ToolError(f"Invalid search options: {problems}", details={"options": options})
+
+
+def _diversify(
+    pool: VectorStorePool, hits: list[SearchHit], params: SearchParams
+) -> list[SearchHit]:
+    """Re-rank hits with maximal marginal relevance over their stored embeddings."""
+    if len(hits) <= 1:
+        return hits[: params.n_results]
+
+    by_collection: dict[str, list[str]] = {}
+    for hit in hits:
+        by_collection.setdefault(hit.collection, []).append(hit.id)
+    stored: dict[tuple[str, str], np.ndarray] = {}
+    for name, ids in by_collection.items():
+        found = pool.get_collection(name).get(ids=ids, include=["embeddings"])
+        stored.update(
+            {(name, doc_id): vec for doc_id, vec in zip(found["ids"], found["embeddings"])}
+        )
+
+    hits = [hit for hit in hits if (hit.collection, hit.id) in stored]
+    scores = np.array([hit.score for hit in hits], dtype=np.float32)
+    spread = scores.max() - scores.min()
+    relevance = (scores - scores.min()) / spread if spread else np.ones_like(scores)
+    selected = maximal_marginal_relevance(
+        relevance,
+        np.stack([stored[(hit.collection, hit.id)] for hit in hits]),
+        k=params.n_results,
+        lambda_mult=1 - params.diversity,
+    )
+    return [hits[i] for i in selected]
+
+
+def search_collection(
+    pool: VectorStorePool,
+    query: str,
+    collection_name: str = "default",
+    query_embedding: Optional[list[float]] = None,
+    **options: Any,
+) -> list[SearchHit]:
+    """Search a collection.
+
+    Args:
+        pool: Pool providing collection handles and embeddings
+        query: Search query text
+        collection_name: Collection to search in
+        query_embedding: Precomputed query embedding, to embed once across collections
+        **options: Fields of SearchParams (n_results, mode, vector_weight,
+            lexical_weight, rrf_k, where, where_document, include_documents,
+            diversity)
+
+    Returns:
+        Hits, best first. Scores are similarities for "vector", BM25 scores
+        for "lexical" and fused scores for "hybrid". With ``diversity`` the
+        candidates are re-ordered by maximal marginal relevance. Repeated
+        queries are served from the pool's result cache until the collection
+        is written.
+
+    Raises:
+        ToolError: If an option is unknown or has an invalid value
+    """
+    params = SearchParams.from_options(options)
+
+    cache_scope = (pool.persist_directory, collection_name)
+    cache_key = (normalize_text(query), json.dumps(params.model_dump(), sort_keys=True))
+    cached = pool.result_cache.get(cache_scope, cache_key)
+    if cached is not None:
+        return list(cached)
+
+    generation = pool.result_cache.generation(cache_scope)
+    hits = _search(pool, query, collection_name, params, query_embedding)
+    if params.diversity:
+        hits = _diversify(pool, hits, params)
+    pool.result_cache.put(cache_scope, cache_key, tuple(hits), generation=generation)
+    return hits
+
+
+def _search(
+    pool: VectorStorePool,
+    query: str,
+    collection_name: str,
+    params: SearchParams,
+    query_embedding: Optional[list[float]],
+) -> list[SearchHit]:
+    collection = pool.get_collection(collection_name)
+
+    def embed() -> list[float]:
+        return query_embedding or pool.embeddings.embed_query(query)
+
+    n_results = params.candidate_count
+    if params.mode == "vector":
+        return _vector_search(collection, embed(), n_results, params)
+
+    index = pool.get_lexical_index(collection_name)
+    if params.mode == "lexical":
+        return _lexical_search(collection, index, query, n_results, params)
+
+    candidates = max(n_results * 3, 10)
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        vector_future = executor.submit(
+            lambda: _vector_search(collection, embed(), candidates, params)
+        )
+        lexical_future = executor.submit(
+            _lexical_search, collection, index, query, candidates, params
+        )
+        vector_hits = vector_future.result()
+        lexical_hits = lexical_future.result()
+
+    hits = {hit.id: hit for hit in lexical_hits + vector_hits}
+    fused = reciprocal_rank_fusion(
+        [[h.id for h in vector_hits], [h.id for h in lexical_hits]],
+        weights=[params.vector_weight, params.lexical_weight],
+        k=params.rrf_k,
+    )
+    return [hits[doc_id].model_copy(update={"score": score}) for doc_id, score in fused][:n_results]
+
+
+def resolve_collections(pool: VectorStorePool, collections: Union[str, list[str]]) -> list[str]:
+    """Resolve a collection name, list of names or glob pattern to collection names."""
+    names = [collections] if isinstance(collections, str) else list(collections)
+    if not any(_GLOB_CHARS.intersection(name) for name in names):
+        return list(dict.fromkeys(names))
+
+    existing = [col.name for col in pool.list_collections()]
+    resolved = []
+    for name in names:
+        if _GLOB_CHARS.intersection(name):
+            resolved.extend(fnmatch.filter(existing, name))
+        else:
+            resolved.append(name)
+    return list(dict.fromkeys(resolved))
+
+
+def _merge(per_collection: list[list[SearchHit]], params: SearchParams) -> list[SearchHit]:
+    """Merge per-collection result lists into one ranking, best first."""
+    if params.mode == "vector":
+        hits = [hit for collection_hits in per_collection for hit in collection_hits]
+        return sorted(hits, key=lambda hit: hit.score, reverse=True)
+
+    # BM25 IDF is computed per collection, so only ranks are comparable across collections.
+    # Ids can repeat across collections; collection names never contain "/".
+    by_key = {f"{hit.collection}/{hit.id}": hit for hits in per_collection for hit in hits}
+    fused = reciprocal_rank_fusion(
+        [[f"{hit.collection}/{hit.id}" for hit in hits] for hits in per_collection],
+        k=params.rrf_k,
+    )
+    return [by_key[key].model_copy(update={"score": score}) for key, score in fused]
+
+
+def search_collections(
+    pool: VectorStorePool,
+    query: str,
+    collections: Union[str, list[str]] = "default",
+    query_embedding: Optional[list[float]] = None,
+    **options: Any,
+) -> list[SearchHit]:
+    """Search several collections concurrently and merge into one global top-k.
+
+    Args:
+        pool: Pool providing collection handles and embeddings
+        query: Search query text
+        collections: Collection name, list of names, or glob pattern such as "project-*"
+        query_embedding: Precomputed query embedding (e.g. from ``aembed_query``)
+        **options: Fields of SearchParams
+
+    Returns:
+        Hits from all collections, best first, each noting its source collection.
+        Vector similarities are comparable across collections and keep their
+        order; BM25 and hybrid scores are not, so those result lists are fused
+        by rank and the hits carry fused scores.
+    """
+    params = SearchParams.from_options(options)
+    names = resolve_collections(pool, collections)
+    if len(names) == 1:
+        return search_collection(
+            pool, query, names[0], query_embedding=query_embedding, **params.model_dump()
+        )
+    if not names:
+        return []
+
+    if query_embedding is None and params.mode != "lexical":
+        query_embedding = pool.embeddings.embed_query(query)
+
+    # Diversity is applied once over the merged candidates, not per collection.
+    per_collection_params = params.model_copy(
+        update={"n_results": params.candidate_count, "diversity": 0.0}
+    )
+    workers = min(len(names), pool.config.max_fanout_concurrency)
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        per_collection = executor.map(
+            lambda name: search_collection(
+                pool,
+                query,
+                name,
+                query_embedding=query_embedding,
+                **per_collection_params.model_dump(),
+            ),
+            names,
+        )
+        hits = _merge(list(per_collection), params)
+
+    if params.diversity:
+        return _diversify(pool, hits[: params.candidate_count], params)
+    return hits[: params.n_results]
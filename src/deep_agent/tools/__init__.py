@@ -1,11 +1,64 @@
 """Tools layer."""
 
-from deep_agent.tools.scraper import web_scraper_tool
-from deep_agent.tools.browser import get_browser_tools
-from deep_agent.tools.registry import get_available_tools
+import importlib
+from typing import TYPE_CHECKING, Any
+
+# Tool modules import crawl4ai and Chroma; each one loads on first attribute access.
+# get_available_tools() returns proxies that defer these imports until a tool runs.
+_LAZY_EXPORTS = {
+    "web_scraper_tool": "deep_agent.tools.scraper",
+    "web_scraper_batch_tool": "deep_agent.tools.scraper",
+    "scrape_to_index": "deep_agent.tools.scraper",
+    "ascrape_to_index": "deep_agent.tools.scraper",
+    "get_browser_tools": "deep_agent.tools.browser",
+    "get_available_tools": "deep_agent.tools.registry",
+    "get_tools": "deep_agent.tools.registry",
+    "TOOL_GROUPS": "deep_agent.tools.registry",
+    "semantic_search_tool": "deep_agent.tools.semantic_search",
+    "add_to_search_index_tool": "deep_agent.tools.semantic_search",
+    "list_search_collections_tool": "deep_agent.tools.semantic_search",
+    "index_status_tool": "deep_agent.tools.semantic_search",
+}
+
+if TYPE_CHECKING:
+    from deep_agent.tools.scraper import (
+        web_scraper_tool,
+        web_scraper_batch_tool,
+        scrape_to_index,
+        ascrape_to_index,
+    )
+    from deep_agent.tools.browser import get_browser_tools
+    from deep_agent.tools.registry import TOOL_GROUPS, get_available_tools, get_tools
+    from deep_agent.tools.semantic_search import (
+        semantic_search_tool,
+        add_to_search_index_tool,
+        list_search_collections_tool,
+        index_status_tool,
+    )
 
 __all__ = [
     "web_scraper_tool",
+    "web_scraper_batch_tool",
+    "scrape_to_index",
+    "ascrape_to_index",
     "get_browser_tools",
     "get_available_tools",
+    "get_tools",
+    "TOOL_GROUPS",
+    "semantic_search_tool",
+    "add_to_search_index_tool",
+    "list_search_collections_tool",
+    "index_status_tool",
 ]
+
+
+def __getattr__(name: str) -> Any:
+    if name in _LAZY_EXPORTS:
+        value = getattr(importlib.import_module(_LAZY_EXPORTS[name]), name)
+        globals()[name] = value
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def __dir__() -> list[str]:
+    return sorted(set(globals()) | set(__all__))
@@ -1,41 +1,174 @@
 """
 Browser tools using Playwright for web automation.
+
+The tools mirror the LangChain Playwright toolkit but run on the shared
+:class:`~deep_agent.tools.browser_manager.BrowserManager`, so each agent
+thread browses in its own context of one long-lived browser.
 """
 
-from langchain_community.agent_toolkits.playwright import PlayWrightBrowserToolkit
-from langchain_community.tools.playwright.utils import create_async_playwright_browser
+import json
+from typing import Any, Awaitable, Callable, Optional, TypeVar
+from urllib.parse import urlparse
+
+from langchain_core.runnables import RunnableConfig
+from langchain_core.tools import BaseTool, StructuredTool
 from loguru import logger
-import asyncio
-import nest_asyncio
+from pydantic import BaseModel
+
+from deep_agent.tools.browser_manager import get_browser_manager, thread_id_from_config
+from deep_agent.tools.schemas import (
+    DESCRIPTIONS,
+    ClickInput,
+    ExtractHyperlinksInput,
+    GetElementsInput,
+    NavigateInput,
+    NoInput,
+)
+from deep_agent.utils.async_utils import run_sync
+
+T = TypeVar("T")
+
+
+async def _on_page(config: Optional[RunnableConfig], fn: Callable[[Any], Awaitable[T]]) -> T:
+    return await get_browser_manager().run(thread_id_from_config(config), fn)
+
+
+async def _navigate(url: str, config: RunnableConfig) -> str:
+    """Open an http(s) URL in the thread's page and report the response status."""
+    if urlparse(url).scheme not in ("http", "https"):
+        return "URL scheme must be 'http' or 'https'"
+
+    wait_until = get_browser_manager().config.wait_until
+
+    async def go(page) -> str:
+        response = await page.goto(url, wait_until=wait_until)
+        status = response.status if response else "unknown"
+        return f"Navigating to {url} returned status code {status}"
+
+    return await _on_page(config, go)
 
 
-def get_browser_tools():
-    """Get browser tools (cached, with shared browser context)."""
-    global _browser_instance
-    global _browser_tools_list
-    
-    # Return cached tools if already initialized
-    if _browser_tools_list is not None:
+async def _navigate_back(config: RunnableConfig) -> str:
+    """Go back one entry in the page history."""
+
+    async def back(page) -> str:
+        response = await page.go_back()
+        if not response:
+            return "Unable to navigate back; no previous page in the history"
+        return (
+            f"Navigated back to the previous page with URL '{response.url}'. "
+            f"Status code {response.status}"
+        )
+
+    return await _on_page(config, back)
+
+
+async def _click(selector: str, config: RunnableConfig) -> str:
+    """Click the first visible element matching ``selector``."""
+
+    async def click(page) -> str:
         try:
-            logger.info("Initializing Playwright browser (async)...")
-            
-            # Create async browser following documentation pattern
-            async def _create_browser_context():
-                async with create_async_playwright_browser(headless=True) as async_browser:
-                    toolkit = PlayWrightBrowserToolkit.from_browser(async_browser=async_browser)
-                    return toolkit.get_tools()
-            
-            # Use nest_asyncio to allow nested event loops
-            nest_asyncio.apply()
-            tools = asyncio.run(_create_browser_context())
-            
-            # Store browser instance for tools
-            _browser_instance = tools[0]._browser if tools else None
-            _browser_tools_list = tools
-            
-            logger.info(f"Initialized {len(tools)} browser tools (async)")
-            return _browser_tools_list
-            
+            await page.click(f"{selector} >> visible=1", strict=False)
         except Exception as e:
-            logger.error(f"Failed to initialize browser tools: {e}")
-            return []
+            logger.debug(f"Click on '{selector}' failed: {e}")
+            return f"Unable to click on element '{selector}'"
+        return f"Clicked element '{selector}'"
+
+    return await _on_page(config, click)
+
+
+async def _extract_text(config: RunnableConfig) -> str:
+    """Return the body text of the page with whitespace collapsed."""
+
+    async def text(page) -> str:
+        body = await page.inner_text("body") if page.url != "about:blank" else ""
+        return " ".join(body.split())
+
+    return await _on_page(config, text)
+
+
+async def _extract_hyperlinks(absolute_urls: bool = False, *, config: RunnableConfig) -> str:
+    """Return the unique link targets of the page as a JSON list."""
+    attribute = "href" if absolute_urls else "getAttribute('href')"
+
+    async def links(page) -> str:
+        found = await page.eval_on_selector_all("a[href]", f"els => els.map(e => e.{attribute})")
+        return json.dumps(list(dict.fromkeys(link for link in found if link)))
+
+    return await _on_page(config, links)
+
+
+async def _get_elements(
+    selector: str, attributes: Optional[list[str]] = None, *, config: RunnableConfig
+) -> str:
+    """Return the non-empty ``attributes`` of elements matching ``selector`` as JSON."""
+    attributes = attributes or ["innerText"]
+
+    async def elements(page) -> str:
+        results = []
+        for element in await page.query_selector_all(selector):
+            values = {}
+            for attribute in attributes:
+                if attribute == "innerText":
+                    value = await element.inner_text()
+                else:
+                    value = await element.get_attribute(attribute)
+                if value is not None and value.strip():
+                    values[attribute] = value.strip()
+            if values:
+                results.append(values)
+        return json.dumps(results, ensure_ascii=False)
+
+    return await _on_page(config, elements)
+
+
+async def _current_webpage(config: RunnableConfig) -> str:
+    """Return the URL of the thread's page."""
+
+    async def url(page) -> str:
+        return str(page.url)
+
+    return await _on_page(config, url)
+
+
+def _browser_tool(
+    name: str, coroutine: Callable[..., Awaitable[str]], args_schema: type[BaseModel]
+) -> BaseTool:
+    def func(config: RunnableConfig, **kwargs: Any) -> str:
+        return run_sync(coroutine(config=config, **kwargs))
+
+    return StructuredTool.from_function(
+        func=func,
+        coroutine=coroutine,
+        name=name,
+        description=DESCRIPTIONS[name],
+        args_schema=args_schema,
+    )
+
+
+click_element_tool = _browser_tool("click_element", _click, ClickInput)
+navigate_browser_tool = _browser_tool("navigate_browser", _navigate, NavigateInput)
+previous_webpage_tool = _browser_tool("previous_webpage", _navigate_back, NoInput)
+extract_text_tool = _browser_tool("extract_text", _extract_text, NoInput)
+extract_hyperlinks_tool = _browser_tool(
+    "extract_hyperlinks", _extract_hyperlinks, ExtractHyperlinksInput
+)
+get_elements_tool = _browser_tool("get_elements", _get_elements, GetElementsInput)
+current_webpage_tool = _browser_tool("current_webpage", _current_webpage, NoInput)
+
+
+def get_browser_tools() -> list[BaseTool]:
+    """Get browser tools bound to the shared browser manager.
+
+    The browser itself starts on the first tool call, so building the tool
+    list is cheap.
+    """
+    return [
+        click_element_tool,
+        navigate_browser_tool,
+        previous_webpage_tool,
+        extract_text_tool,
+        extract_hyperlinks_tool,
+        get_elements_tool,
+        current_webpage_tool,
+    ]
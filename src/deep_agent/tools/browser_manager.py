@@ -0,0 +1,276 @@
+"""
+Long-lived Playwright browser shared by all conversations.
+
+One Chromium process runs on a background event loop. Each agent thread
+gets its own ``BrowserContext`` (cookies, storage, history) with a small
+pool of pages; idle contexts are closed by TTL and least-recent use.
+"""
+
+import asyncio
+import atexit
+import threading
+import time
+from collections import OrderedDict
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Awaitable, Callable, Optional, TypeVar
+
+from loguru import logger
+
+from deep_agent.config.settings import BrowserToolsConfig, Settings
+from deep_agent.tools.resource_policy import ResourcePolicy
+from deep_agent.utils.async_utils import BackgroundLoop
+
+T = TypeVar("T")
+
+
+async def _launch_chromium(headless: bool) -> tuple[Any, Any]:
+    from playwright.async_api import async_playwright
+
+    playwright = await async_playwright().start()
+    try:
+        browser = await playwright.chromium.launch(headless=headless)
+    except Exception:
+        await playwright.stop()
+        raise
+    return playwright, browser
+
+
+class _ThreadContext:
+    """A browser context and its pages, owned by one agent thread."""
+
+    def __init__(self, thread_id: str, context: Any, max_pages: int):
+        self.thread_id = thread_id
+        self.context = context
+        self.max_pages = max(1, max_pages)
+        self.pages: list[Any] = []
+        self.idle: list[Any] = []
+        self.active: Optional[Any] = None
+        self.last_used = time.monotonic()
+        self.available = asyncio.Condition()
+
+    @property
+    def busy(self) -> bool:
+        return len(self.idle) < len(self.pages)
+
+    async def acquire(self) -> Any:
+        """Lease the active page, else an idle one, else a new one up to ``max_pages``."""
+        async with self.available:
+            while True:
+                self.idle = [page for page in self.idle if not page.is_closed()]
+                self.pages = [page for page in self.pages if not page.is_closed()]
+                if self.active in self.idle:
+                    page = self.active
+                elif self.idle:
+                    page = self.idle[-1]
+                elif len(self.pages) < self.max_pages:
+                    page = await self.context.new_page()
+                    self.pages.append(page)
+                    self.idle.append(page)
+                else:
+                    await self.available.wait()
+                    continue
+                self.idle.remove(page)
+                return page
+
+    async def release(self, page: Any) -> None:
+        async with self.available:
+            if not page.is_closed():
+                self.idle.append(page)
+                self.active = page
+            self.last_used = time.monotonic()
+            self.available.notify()
+
+
+class BrowserManager:
+    """Run browser work for agent threads against one persistent Chromium.
+
+    Calls for the same ``thread_id`` share a context, so navigation state
+    carries over between tool calls; sequential calls reuse the page used
+    last, while concurrent calls get other pages from the context's pool.
+    Every context routes its requests through the configured
+    :class:`ResourcePolicy`.
+    """
+
+    def __init__(
+        self,
+        config: Optional[BrowserToolsConfig] = None,
+        launcher: Optional[Callable[[bool], Awaitable[tuple[Any, Any]]]] = None,
+    ):
+        self.config = config or BrowserToolsConfig()
+        self.launcher = launcher or _launch_chromium
+        self.policy = ResourcePolicy.from_config(self.config)
+        self.launches = 0
+        self.evictions = 0
+
+        self._background = BackgroundLoop("browser-manager")
+        self._playwright: Optional[Any] = None
+        self._browser: Optional[Any] = None
+        self._contexts: OrderedDict[str, _ThreadContext] = OrderedDict()
+        self._creating: dict[str, asyncio.Lock] = {}
+        self._lock = threading.Lock()
+        self._launch_lock: Optional[asyncio.Lock] = None
+
+    @classmethod
+    def from_settings(cls, settings: Optional[Settings] = None) -> "BrowserManager":
+        """Create a manager configured from application settings."""
+        settings = settings or Settings()
+        return cls(config=settings.browser)
+
+    async def _get_browser(self) -> Any:
+        if self._launch_lock is None:
+            self._launch_lock = asyncio.Lock()
+        async with self._launch_lock:
+            if self._browser is None or not self._browser.is_connected():
+                logger.info("Launching Playwright browser")
+                self._playwright, self._browser = await self.launcher(self.config.headless)
+                self.launches += 1
+            return self._browser
+
+    async def _close_context(self, entry: _ThreadContext, reason: str) -> None:
+        self._contexts.pop(entry.thread_id, None)
+        self._creating.pop(entry.thread_id, None)
+        logger.debug(f"Closing browser context for thread {entry.thread_id} ({reason})")
+        try:
+            await entry.context.close()
+        except Exception as e:
+            logger.warning(f"Failed to close browser context {entry.thread_id}: {e}")
+
+    async def _evict(self, keep: str) -> None:
+        """Close idle contexts past their TTL, then the least recently used beyond the cap."""
+        now = time.monotonic()
+        candidates = [entry for entry in self._contexts.values() if entry.thread_id != keep]
+        for entry in candidates:
+            if not entry.busy and now - entry.last_used > self.config.context_ttl:
+                await self._close_context(entry, "idle")
+                self.evictions += 1
+        for entry in candidates:
+            if len(self._contexts) <= self.config.max_contexts:
+                break
+            if entry.thread_id in self._contexts and not entry.busy:
+                await self._close_context(entry, "capacity")
+                self.evictions += 1
+
+    async def _new_context(self, thread_id: str) -> _ThreadContext:
+        browser = await self._get_browser()
+        context = await browser.new_context()
+        context.set_default_timeout(self.config.navigation_timeout * 1000)
+        if self.policy is not None:
+            await self.policy.install(context)
+        return _ThreadContext(thread_id, context, self.config.max_pages_per_context)
+
+    async def _get_context(self, thread_id: str) -> _ThreadContext:
+        entry = self._contexts.get(thread_id)
+        browser = self._browser
+        if entry is not None and (browser is None or not browser.is_connected()):
+            # The browser crashed; its contexts went with it.
+            self._contexts.clear()
+            entry = None
+        if entry is None:
+            # Concurrent first calls for a thread must share one context
+            async with self._creating.setdefault(thread_id, asyncio.Lock()):
+                entry = self._contexts.get(thread_id)
+                if entry is None:
+                    entry = await self._new_context(thread_id)
+                    self._contexts[thread_id] = entry
+        self._contexts.move_to_end(thread_id)
+        entry.last_used = time.monotonic()
+        await self._evict(keep=thread_id)
+        return entry
+
+    @asynccontextmanager
+    async def page(self, thread_id: str) -> AsyncIterator[Any]:
+        """Lease a page in the thread's context; must run on the manager's loop."""
+        entry = await self._get_context(thread_id)
+        page = await entry.acquire()
+        try:
+            yield page
+        finally:
+            await entry.release(page)
+
+    async def _run(self, thread_id: str, fn: Callable[[Any], Awaitable[T]]) -> T:
+        async with self.page(thread_id) as page:
+            return await fn(page)
+
+    async def run(self, thread_id: str, fn: Callable[[Any], Awaitable[T]]) -> T:
+        """Await ``fn(page)`` with a page of the thread's context, from any event loop."""
+        return await self._background.arun(self._run(thread_id, fn))
+
+    def run_sync(self, thread_id: str, fn: Callable[[Any], Awaitable[T]]) -> T:
+        """Blocking variant of :meth:`run` for synchronous callers."""
+        return self._background.run(self._run(thread_id, fn))
+
+    def close_thread(self, thread_id: str) -> None:
+        """Close a thread's context, e.g. when its conversation ends."""
+
+        async def close() -> None:
+            entry = self._contexts.get(thread_id)
+            if entry is not None:
+                await self._close_context(entry, "closed")
+
+        if self._background.running:
+            self._background.run(close(), timeout=30)
+
+    def stats(self) -> dict:
+        """Return manager counters."""
+        return {
+            "connected": self._browser is not None,
+            "contexts": len(self._contexts),
+            "pages": sum(len(entry.pages) for entry in self._contexts.values()),
+            "launches": self.launches,
+            "evictions": self.evictions,
+            "requests": self.policy.stats() if self.policy else None,
+        }
+
+    async def _shutdown(self) -> None:
+        for entry in list(self._contexts.values()):
+            await self._close_context(entry, "shutdown")
+        browser, self._browser = self._browser, None
+        playwright, self._playwright = self._playwright, None
+        if browser is not None:
+            await browser.close()
+        if playwright is not None:
+            await playwright.stop()
+
+    def close(self) -> None:
+        """Close the browser and stop the background loop."""
+        with self._lock:
+            if not self._background.running:
+                return
+            try:
+                self._background.run(self._shutdown(), timeout=30)
+            except Exception as e:
+                logger.warning(f"Failed to close browser cleanly: {e}")
+            self._background.stop()
+            self._launch_lock = None
+            self._creating.clear()
+
+
+def thread_id_from_config(config: Optional[dict]) -> str:
+    """The LangGraph thread id of a tool call, or "default" outside an agent run."""
+    return str(((config or {}).get("configurable") or {}).get("thread_id") or "default")
+
+
+_manager: Optional[BrowserManager] = None
+_manager_lock = threading.Lock()
+
+
+def get_browser_manager() -> BrowserManager:
+    """Get the process-wide browser manager, creating it on first use."""
+    global _manager
+    with _manager_lock:
+        if _manager is None:
+            _manager = BrowserManager.from_settings()
+        return _manager
+
+
+def close_browser_manager() -> None:
+    """Close and discard the process-wide browser manager."""
+    global _manager
+    with _manager_lock:
+        if _manager is not None:
+            _manager.close()
+            _manager = None
+
+
+# The browser is a child process; close it before the interpreter exits.
+atexit.register(close_browser_manager)
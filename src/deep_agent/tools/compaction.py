@@ -0,0 +1,155 @@
+"""
+Token-budgeted compaction of scraped pages before they enter the agent context.
+"""
+
+import math
+import re
+from collections import Counter
+from typing import Optional
+
+from pydantic import BaseModel
+
+from deep_agent.storage.chunking import split_sections
+from deep_agent.storage.lexical import tokenize
+
+_CHARS_PER_TOKEN = 4
+_BOILERPLATE = re.compile(
+    r"^\s*(skip to (main )?content|toggle (navigation|menu)|main menu|menu|search|"
+    r"sign in|sign up|log in|subscribe|share|back to top|accept( all)? cookies?.*|"
+    r"(this site|we) uses? cookies.*|all rights reserved.*|(©|copyright).*)\s*$",
+    re.IGNORECASE,
+)
+_IMAGE_LINE = re.compile(r"^\s*(\[?!\[[^\]]*\]\([^)]*\)\]?(\([^)]*\))?\s*)+$")
+_LINK_LINE = re.compile(r"^\s*(?:[-*+]|\d+\.)?\s*\[([^\]]*)\]\([^)]*\)\s*$")
+_INLINE_LINK = re.compile(r"(?<!!)\[([^\]]+)\]\((?:[^()\s]|\([^)]*\))+(?:\s+\"[^\"]*\")?\)")
+_HEADING = re.compile(r"^#{1,6}\s")
+_BLANK_RUN = re.compile(r"\n{3,}")
+_LINK_LIST_MIN = 3
+_LINK_LIST_SHOWN = 5
+
+
+class CompactionResult(BaseModel):
+    """A page reduced to a token budget."""
+
+    text: str
+    original_tokens: int
+    tokens: int
+    omitted_sections: int = 0
+
+    @property
+    def compacted(self) -> bool:
+        return self.tokens < self.original_tokens
+
+
+def estimate_tokens(text: str) -> int:
+    """Rough token count (about four characters per token)."""
+    return math.ceil(len(text) / _CHARS_PER_TOKEN)
+
+
+def _collapse_links(run: list[str]) -> list[str]:
+    if len(run) < _LINK_LIST_MIN:
+        return run
+    labels = [m.group(1).strip() for line in run if (m := _LINK_LINE.match(line))]
+    labels = [label for label in labels if label]
+    shown = " · ".join(labels[:_LINK_LIST_SHOWN])
+    more = f" (+{len(labels) - _LINK_LIST_SHOWN} more)" if len(labels) > _LINK_LIST_SHOWN else ""
+    return [f"[{len(run)} links: {shown}{more}]"]
+
+
+def strip_boilerplate(text: str) -> str:
+    """Drop navigation and boilerplate lines, collapse link lists and inline link URLs."""
+    lines: list[str] = []
+    run: list[str] = []
+    for line in text.splitlines():
+        if _LINK_LINE.match(line):
+            run.append(line)
+            continue
+        if run and not line.strip():
+            continue
+        lines.extend(_collapse_links(run))
+        run = []
+        if _IMAGE_LINE.match(line) or (len(line) < 80 and _BOILERPLATE.match(line)):
+            continue
+        lines.append(line)
+    lines.extend(_collapse_links(run))
+
+    cleaned = _INLINE_LINK.sub(r"\1", "\n".join(lines))
+    return _BLANK_RUN.sub("\n\n", cleaned).strip()
+
+
+def _rank(sections: list[tuple[str, str]], focus: str) -> list[int]:
+    """Order section indices by BM25-style relevance to the focus query."""
+    terms = set(tokenize(focus))
+    counts = [Counter(tokenize(text)) for _, text in sections]
+    heading_terms = [set(tokenize(path)) for path, _ in sections]
+    df = Counter(term for count in counts for term in terms if count[term])
+
+    def score(i: int) -> float:
+        total = 0.0
+        for term in terms:
+            if not counts[i][term]:
+                continue
+            idf = math.log(1 + len(sections) / df[term])
+            total += (1 + math.log(counts[i][term])) * idf
+            if term in heading_terms[i]:
+                total += idf
+        return total
+
+    return sorted(range(len(sections)), key=lambda i: (-score(i), i))
+
+
+def compact(text: str, max_tokens: int, focus: Optional[str] = None) -> CompactionResult:
+    """Reduce a page to roughly ``max_tokens``.
+
+    Boilerplate is stripped first. If the page is still over budget, whole
+    markdown sections are kept in document order (or by relevance to
+    ``focus``) until the budget is spent; omitted sections keep their heading
+    so the outline stays visible.
+    """
+    original_tokens = estimate_tokens(text)
+    cleaned = strip_boilerplate(text)
+    if estimate_tokens(cleaned) <= max_tokens:
+        return CompactionResult(
+            text=cleaned, original_tokens=original_tokens, tokens=estimate_tokens(cleaned)
+        )
+
+    sections = split_sections(cleaned)
+    headings = [body.splitlines()[0] if _HEADING.match(body) else None for _, body in sections]
+    heading_cost = [estimate_tokens(h) if h else 0 for h in headings]
+    # The outline of omitted sections is kept unless it alone would crowd out content.
+    keep_outline = sum(heading_cost) <= max_tokens // 4
+    budget = max_tokens - (sum(heading_cost) if keep_outline else 0)
+
+    order = _rank(sections, focus) if focus else list(range(len(sections)))
+    selected: dict[int, str] = {}
+    used = 0
+    for i in order:
+        section = sections[i][1]
+        cost = estimate_tokens(section) - (heading_cost[i] if keep_outline else 0)
+        if used + cost <= budget:
+            selected[i] = section
+            used += cost
+        elif not selected:
+            # Nothing fits yet: keep the start of the best section.
+            remaining = max(budget - used, 0) * _CHARS_PER_TOKEN
+            selected[i] = section[:remaining].rsplit(" ", 1)[0] + " …"
+            used = budget
+        if used >= budget:
+            break
+
+    parts = []
+    omitted = 0
+    for i, (_, section) in enumerate(sections):
+        if i in selected:
+            parts.append(selected[i])
+        else:
+            omitted += 1
+            if keep_outline and headings[i]:
+                parts.append(f"{headings[i]}\n*(section omitted)*")
+    result = "\n\n".join(parts)
+    return CompactionResult(
+        text=result,
+        original_tokens=original_tokens,
+        tokens=estimate_tokens(result),
+        omitted_sections=omitted,
+    )
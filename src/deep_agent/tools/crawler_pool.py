@@ -0,0 +1,286 @@
+"""
+Pool of warm AsyncWebCrawler instances on a dedicated background event loop.
+
+Launching a headless browser dominates the cost of a single scrape, so the
+scraper tools lease already-started crawlers from this pool instead of
+opening a fresh ``AsyncWebCrawler`` per call.
+"""
+
+import asyncio
+import atexit
+import threading
+import time
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Awaitable, Callable, Optional, TypeVar, Union
+from urllib.parse import urlsplit
+
+from crawl4ai import AsyncWebCrawler, BrowserConfig, CrawlerRunConfig
+from crawl4ai.async_dispatcher import RateLimiter, SemaphoreDispatcher
+from crawl4ai.models import CrawlerTaskResult, CrawlResult
+from loguru import logger
+
+from deep_agent.config.settings import ScraperConfig, Settings
+from deep_agent.tools.resource_policy import ResourcePolicy
+from deep_agent.utils.async_utils import BackgroundLoop
+
+try:
+    import psutil
+except ImportError:  # pragma: no cover - psutil ships with crawl4ai
+    psutil = None
+
+T = TypeVar("T")
+
+
+class _Slot:
+    """A pool position holding at most one started crawler."""
+
+    def __init__(self, index: int):
+        self.index = index
+        self.crawler: Optional[Any] = None
+        self.pages = 0
+
+
+class CrawlerPool:
+    """Lease warm crawlers to scrape requests and recycle them when worn out.
+
+    Crawlers start lazily, one per slot, and are recycled after
+    ``max_pages_per_crawler`` pages, after a crawler error, or when system
+    memory use is above ``max_memory_percent``. With a ``policy``, every
+    page the crawlers open routes its requests through it.
+    """
+
+    def __init__(
+        self,
+        config: Optional[ScraperConfig] = None,
+        browser_config: Optional[BrowserConfig] = None,
+        crawler_factory: Optional[Callable[[], Any]] = None,
+        policy: Optional[ResourcePolicy] = None,
+    ):
+        self.config = config or ScraperConfig()
+        self.browser_config = browser_config
+        self.crawler_factory = crawler_factory or self._default_factory
+        self.policy = policy
+        self.started = 0
+        self.recycled = 0
+
+        self._background = BackgroundLoop("crawler-pool")
+        self._idle: Optional[asyncio.LifoQueue] = None
+        self._slots: list[_Slot] = []
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_settings(cls, settings: Optional[Settings] = None) -> "CrawlerPool":
+        """Create a pool configured from application settings."""
+        settings = settings or Settings()
+        return cls(config=settings.scraper, policy=ResourcePolicy.from_config(settings.browser))
+
+    def _default_factory(self) -> AsyncWebCrawler:
+        config = self.browser_config or BrowserConfig(headless=self.config.headless, verbose=False)
+        return AsyncWebCrawler(config=config)
+
+    def _memory_high(self) -> bool:
+        if psutil is None or self.config.max_memory_percent <= 0:
+            return False
+        return psutil.virtual_memory().percent >= self.config.max_memory_percent
+
+    async def _start_crawler(self, slot: _Slot) -> None:
+        crawler = self.crawler_factory()
+        strategy = getattr(crawler, "crawler_strategy", None)
+        if self.policy is not None and strategy is not None:
+            strategy.set_hook("on_page_context_created", self._install_policy)
+        await crawler.start()
+        slot.crawler, slot.pages = crawler, 0
+        self.started += 1
+        logger.debug(f"Started crawler {slot.index}")
+
+    async def _install_policy(self, page: Any, **kwargs: Any) -> Any:
+        if self.policy is not None:
+            await self.policy.install(page)
+        return page
+
+    async def _recycle(self, slot: _Slot, reason: str) -> None:
+        crawler, slot.crawler = slot.crawler, None
+        if crawler is None:
+            return
+        self.recycled += 1
+        logger.debug(f"Recycling crawler {slot.index} after {slot.pages} pages ({reason})")
+        try:
+            await crawler.close()
+        except Exception as e:
+            logger.warning(f"Failed to close crawler {slot.index}: {e}")
+
+    @asynccontextmanager
+    async def _lease(self) -> AsyncIterator[Any]:
+        """Lease a started crawler; must run on the pool's loop."""
+        if self._idle is None:
+            # LIFO so warm crawlers are reused before cold slots are started.
+            self._idle = asyncio.LifoQueue()
+            self._slots = [_Slot(i) for i in range(max(1, self.config.crawler_pool_size))]
+            for slot in self._slots:
+                self._idle.put_nowait(slot)
+
+        slot = await self._idle.get()
+        try:
+            if slot.crawler is None:
+                await self._start_crawler(slot)
+            try:
+                yield slot.crawler
+            except Exception:
+                await self._recycle(slot, "error")
+                raise
+            slot.pages += 1
+            if slot.pages >= self.config.max_pages_per_crawler:
+                await self._recycle(slot, "page limit")
+            elif self._memory_high():
+                await self._recycle(slot, "memory")
+        finally:
+            self._idle.put_nowait(slot)
+
+    async def _run(self, fn: Callable[[Any], Awaitable[T]]) -> T:
+        async with self._lease() as crawler:
+            return await fn(crawler)
+
+    async def run(self, fn: Callable[[Any], Awaitable[T]]) -> T:
+        """Await ``fn(crawler)`` with a leased crawler, from any event loop."""
+        return await self._background.arun(self._run(fn))
+
+    def run_sync(self, fn: Callable[[Any], Awaitable[T]]) -> T:
+        """Blocking variant of :meth:`run` for synchronous callers."""
+        return self._background.run(self._run(fn))
+
+    def stats(self) -> dict:
+        """Return pool counters."""
+        return {
+            "size": self.config.crawler_pool_size,
+            "warm": sum(1 for slot in self._slots if slot.crawler is not None),
+            "started": self.started,
+            "recycled": self.recycled,
+            "requests": self.policy.stats() if self.policy else None,
+        }
+
+    async def _close_all(self) -> None:
+        for slot in self._slots:
+            await self._recycle(slot, "shutdown")
+        self._idle = None
+        self._slots = []
+
+    def close(self) -> None:
+        """Close all crawlers and stop the background loop."""
+        with self._lock:
+            if not self._background.running:
+                return
+            try:
+                self._background.run(self._close_all(), timeout=30)
+            except Exception as e:
+                logger.warning(f"Failed to close crawler pool cleanly: {e}")
+            self._background.stop()
+
+
+class DomainLimitedDispatcher(SemaphoreDispatcher):
+    """``arun_many`` dispatcher with a global cap, per-domain limits and per-URL timeouts.
+
+    A URL first waits for a slot for its domain, then for a global slot, so a
+    burst of links to one site cannot starve the others. Requests to the same
+    domain are also spaced by the crawl4ai rate limiter when ``domain_delay``
+    is set. A URL whose crawl exceeds ``url_timeout`` fails on its own
+    without aborting the batch; time spent waiting for a slot is not counted.
+    """
+
+    def __init__(
+        self,
+        max_concurrency: int = 5,
+        per_domain_limit: int = 2,
+        url_timeout: float = 60.0,
+        domain_delay: float = 0.0,
+    ):
+        rate_limiter = (
+            RateLimiter(base_delay=(domain_delay, domain_delay * 2)) if domain_delay > 0 else None
+        )
+        super().__init__(semaphore_count=max_concurrency, rate_limiter=rate_limiter)
+        self.per_domain_limit = per_domain_limit
+        self.url_timeout = url_timeout
+        self._domains: dict[str, asyncio.Semaphore] = {}
+
+    def _failed(self, url: str, task_id: str, start: float, message: str) -> CrawlerTaskResult:
+        return CrawlerTaskResult(
+            task_id=task_id,
+            url=url,
+            result=CrawlResult(url=url, html="", success=False, error_message=message),
+            memory_usage=0,
+            peak_memory=0,
+            start_time=start,
+            end_time=time.time(),
+            error_message=message,
+        )
+
+    async def crawl_url(
+        self,
+        url: str,
+        config: Union[CrawlerRunConfig, list[CrawlerRunConfig]],
+        task_id: str,
+        semaphore: Optional[asyncio.Semaphore] = None,
+    ) -> CrawlerTaskResult:
+        start = time.time()
+        selected = self.select_config(url, config)
+        if selected is None:
+            return self._failed(url, task_id, start, f"No matching configuration for {url}")
+
+        domain = (urlsplit(url).hostname or "").lower()
+        limit = self._domains.setdefault(domain, asyncio.Semaphore(self.per_domain_limit))
+        async with limit:
+            if self.rate_limiter:
+                await self.rate_limiter.wait_if_needed(url)
+            async with semaphore or asyncio.Semaphore(self.semaphore_count):
+                # Only the crawl itself counts against the timeout, not time queued for a slot
+                try:
+                    result = await asyncio.wait_for(
+                        self.crawler.arun(url, config=selected, session_id=task_id),
+                        self.url_timeout,
+                    )
+                except asyncio.TimeoutError:
+                    return self._failed(
+                        url, task_id, start, f"Timed out after {self.url_timeout:g}s"
+                    )
+                except Exception as e:
+                    return self._failed(url, task_id, start, str(e))
+
+        error_message = "" if result.success else result.error_message
+        if self.rate_limiter and result.status_code:
+            if not self.rate_limiter.update_delay(url, result.status_code):
+                error_message = f"Rate limit retry count exceeded for domain {domain}"
+        return CrawlerTaskResult(
+            task_id=task_id,
+            url=url,
+            result=result,
+            memory_usage=0,
+            peak_memory=0,
+            start_time=start,
+            end_time=time.time(),
+            error_message=error_message,
+        )
+
+
+_pool: Optional[CrawlerPool] = None
+_pool_lock = threading.Lock()
+
+
+def get_crawler_pool() -> CrawlerPool:
+    """Get the process-wide crawler pool, creating it on first use."""
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = CrawlerPool.from_settings()
+        return _pool
+
+
+def close_crawler_pool() -> None:
+    """Close and discard the process-wide crawler pool."""
+    global _pool
+    with _pool_lock:
+        if _pool is not None:
+            _pool.close()
+            _pool = None
+
+
+# Browsers are child processes; close them before the interpreter exits.
+atexit.register(close_crawler_pool)
@@ -0,0 +1,70 @@
+"""
+Tool proxies that import their implementation on first use.
+"""
+
+import asyncio
+import importlib
+import threading
+from typing import Any, Optional
+
+from langchain_core.callbacks import AsyncCallbackManagerForToolRun, CallbackManagerForToolRun
+from langchain_core.runnables import RunnableConfig
+from langchain_core.runnables.config import patch_config
+from langchain_core.tools import BaseTool
+from loguru import logger
+from pydantic import PrivateAttr
+
+_import_lock = threading.Lock()
+
+
+class LazyTool(BaseTool):
+    """Stand-in for a tool whose module is imported on its first call.
+
+    Name, description and argument schema are given up front, so an agent
+    can be built and its prompt rendered without importing the tool's
+    backend. ``target`` is ``"module:attribute"`` of the real tool; calls are
+    forwarded to it as child runs with the same config.
+    """
+
+    target: str
+    _tool: Optional[BaseTool] = PrivateAttr(default=None)
+
+    @property
+    def loaded(self) -> bool:
+        return self._tool is not None
+
+    def load(self) -> BaseTool:
+        """Import and return the real tool."""
+        if self._tool is None:
+            with _import_lock:
+                if self._tool is None:
+                    module_name, _, attribute = self.target.partition(":")
+                    self._tool = getattr(importlib.import_module(module_name), attribute)
+                    logger.debug(f"Loaded tool '{self.name}' from {self.target}")
+        return self._tool
+
+    def _run(
+        self,
+        config: RunnableConfig,
+        run_manager: Optional[CallbackManagerForToolRun] = None,
+        **kwargs: Any,
+    ) -> Any:
+        callbacks = run_manager.get_child() if run_manager else None
+        return self.load().invoke(kwargs, config=patch_config(config, callbacks=callbacks))
+
+    async def _arun(
+        self,
+        config: RunnableConfig,
+        run_manager: Optional[AsyncCallbackManagerForToolRun] = None,
+        **kwargs: Any,
+    ) -> Any:
+        callbacks = run_manager.get_child() if run_manager else None
+        tool = await _aload(self)
+        return await tool.ainvoke(kwargs, config=patch_config(config, callbacks=callbacks))
+
+
+async def _aload(tool: LazyTool) -> BaseTool:
+    if tool.loaded:
+        return tool.load()
+    # Imports of heavy backends can take seconds; keep them off the event loop.
+    return await asyncio.to_thread(tool.load)
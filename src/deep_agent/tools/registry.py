@@ -2,17 +2,148 @@
 Helper to register tools with DeepAgents agent.
 """
 
-from deep_agent.tools.scraper import web_scraper_tool
-from deep_agent.tools.browser import get_browser_tools
-from deep_agent.tools.semantic_search import (
-    semantic_search,
-    add_to_search_index,
-    list_search_collections,
+import json
+import math
+from typing import Optional, Sequence
+
+from langchain_core.tools import BaseTool
+from langchain_core.utils.function_calling import convert_to_openai_tool
+from loguru import logger
+from pydantic import BaseModel
+
+from deep_agent.core.exceptions import ConfigurationError
+from deep_agent.tools.lazy import LazyTool
+from deep_agent.tools.schemas import (
+    DESCRIPTIONS,
+    AddToSearchIndexInput,
+    BatchScraperInput,
+    ClickInput,
+    ExtractHyperlinksInput,
+    GetElementsInput,
+    IndexStatusInput,
+    NavigateInput,
+    NoInput,
+    ScraperInput,
+    SemanticSearchInput,
 )
 
+# (tool name, group, "module:attribute" of the implementation, input schema)
+_TOOLS: list[tuple[str, str, str, type[BaseModel]]] = [
+    ("web_scraper", "scrape", "deep_agent.tools.scraper:web_scraper_tool", ScraperInput),
+    (
+        "web_scraper_batch",
+        "scrape",
+        "deep_agent.tools.scraper:web_scraper_batch_tool",
+        BatchScraperInput,
+    ),
+    ("click_element", "browser", "deep_agent.tools.browser:click_element_tool", ClickInput),
+    (
+        "navigate_browser",
+        "browser",
+        "deep_agent.tools.browser:navigate_browser_tool",
+        NavigateInput,
+    ),
+    ("previous_webpage", "browser", "deep_agent.tools.browser:previous_webpage_tool", NoInput),
+    ("extract_text", "browser", "deep_agent.tools.browser:extract_text_tool", NoInput),
+    (
+        "extract_hyperlinks",
+        "browser",
+        "deep_agent.tools.browser:extract_hyperlinks_tool",
+        ExtractHyperlinksInput,
+    ),
+    ("get_elements", "browser", "deep_agent.tools.browser:get_elements_tool", GetElementsInput),
+    ("current_webpage", "browser", "deep_agent.tools.browser:current_webpage_tool", NoInput),
+    (
+        "semantic_search",
+        "search",
+        "deep_agent.tools.semantic_search:semantic_search_tool",
+        SemanticSearchInput,
+    ),
+    (
+        "add_to_search_index",
+        "search",
+        "deep_agent.tools.semantic_search:add_to_search_index_tool",
+        AddToSearchIndexInput,
+    ),
+    (
+        "list_search_collections",
+        "search",
+        "deep_agent.tools.semantic_search:list_search_collections_tool",
+        NoInput,
+    ),
+    (
+        "index_status",
+        "search",
+        "deep_agent.tools.semantic_search:index_status_tool",
+        IndexStatusInput,
+    ),
+]
+
+TOOL_GROUPS: dict[str, list[str]] = {}
+for _name, _group, *_ in _TOOLS:
+    TOOL_GROUPS.setdefault(_group, []).append(_name)
+
+_CHARS_PER_TOKEN = 4
+
+_available_tools: Optional[list[LazyTool]] = None
+
+
+def get_available_tools() -> list[LazyTool]:
+    """Get list of available tools.
+
+    The tools are lazy proxies: their backends (crawl4ai, Chroma, Playwright)
+    are imported and started on first call, not when the agent is built.
+    """
+    global _available_tools
+    if _available_tools is None:
+        _available_tools = [
+            LazyTool(name=name, description=DESCRIPTIONS[name], args_schema=schema, target=target)
+            for name, _, target, schema in _TOOLS
+        ]
+    return _available_tools
+
+
+def resolve_tool_names(selection: Optional[list[str]] = None) -> list[str]:
+    """Expand tool and group names into tool names, in registry order.
+
+    An empty selection means every tool. Raises ConfigurationError for names
+    that are neither a tool nor a group.
+    """
+    if not selection:
+        return [name for name, _, _, _ in _TOOLS]
+
+    known = {name for name, _, _, _ in _TOOLS}
+    unknown = [item for item in selection if item not in known and item not in TOOL_GROUPS]
+    if unknown:
+        raise ConfigurationError(
+            f"Unknown tools or tool groups: {unknown}",
+            details={"tools": sorted(known), "groups": sorted(TOOL_GROUPS)},
+        )
+
+    selected = set()
+    for item in selection:
+        selected.update(TOOL_GROUPS.get(item, [item]))
+    return [name for name, _, _, _ in _TOOLS if name in selected]
+
+
+def get_tools(selection: Optional[list[str]] = None) -> list[LazyTool]:
+    """Get the tools named by ``selection`` (tool or group names; empty for all)."""
+    names = set(resolve_tool_names(selection))
+    return [tool for tool in get_available_tools() if tool.name in names]
+
+
+def tool_schema_tokens(tool: BaseTool) -> int:
+    """Estimate the prompt tokens a tool's definition adds to every model call."""
+    schema = json.dumps(convert_to_openai_tool(tool), separators=(",", ":"))
+    return math.ceil(len(schema) / _CHARS_PER_TOKEN)
+
 
-def get_available_tools():
-    """Get list of available tools."""
-    all_tools = [web_scraper_tool] + get_browser_tools()
-    all_tools += [semantic_search, add_to_search_index, list_search_collections]
-    return all_tools
+def log_tool_costs(tools: Sequence[BaseTool]) -> dict[str, int]:
+    """Log and return the estimated schema token cost of each tool."""
+    costs = {tool.name: tool_schema_tokens(tool) for tool in tools}
+    breakdown = ", ".join(f"{name}={tokens}" for name, tokens in costs.items())
+    logger.info(
+        f"Bound {len(costs)} tools, ~{sum(costs.values())} schema tokens per model call "
+        f"({breakdown})"
+    )
+    return costs
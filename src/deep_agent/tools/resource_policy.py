@@ -0,0 +1,102 @@
+"""
+Request interception for text-only browsing.
+
+Pages fetched for their text do not need images, fonts, media or trackers.
+A :class:`ResourcePolicy` is installed as a Playwright route handler on the
+browser tools' contexts and on crawl4ai's pages, and aborts those requests.
+"""
+
+import threading
+from typing import Any, Optional
+from urllib.parse import urlsplit
+
+from deep_agent.config.settings import BrowserToolsConfig
+
+# Rough transfer sizes used to estimate the bandwidth saved by aborted
+# requests, whose real size is never known.
+_TYPICAL_BYTES = {
+    "image": 40_000,
+    "media": 500_000,
+    "font": 30_000,
+    "stylesheet": 20_000,
+    "script": 30_000,
+}
+_DEFAULT_TYPICAL_BYTES = 10_000
+
+
+class ResourcePolicy:
+    """Abort requests by resource type or domain, with counters.
+
+    Requests for the page document itself are never blocked. Allowed
+    requests are passed on untouched, so they keep streaming and the
+    browser cache.
+    """
+
+    def __init__(
+        self,
+        blocked_resource_types: Optional[list[str]] = None,
+        blocked_domains: Optional[list[str]] = None,
+    ):
+        self.blocked_resource_types = set(blocked_resource_types or [])
+        self.blocked_domains = {domain.lower().lstrip(".") for domain in blocked_domains or []}
+        self.allowed = 0
+        self.blocked = {"resource_type": 0, "domain": 0}
+        self.estimated_bytes_saved = 0
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_config(cls, config: BrowserToolsConfig) -> Optional["ResourcePolicy"]:
+        """Build the policy from browser settings, or None when blocking is off."""
+        if not config.block_resources:
+            return None
+        return cls(
+            blocked_resource_types=config.blocked_resource_types,
+            blocked_domains=config.blocked_domains,
+        )
+
+    def _blocked_domain(self, url: str) -> bool:
+        host = (urlsplit(url).hostname or "").lower()
+        return any(host == domain or host.endswith("." + domain) for domain in self.blocked_domains)
+
+    def block_reason(self, url: str, resource_type: str) -> Optional[str]:
+        """Why a request should be aborted before it is sent, or None to allow it."""
+        if resource_type == "document":
+            return None
+        if resource_type in self.blocked_resource_types:
+            return "resource_type"
+        if self._blocked_domain(url):
+            return "domain"
+        return None
+
+    async def handle(self, route: Any) -> None:
+        """Playwright route handler."""
+        request = route.request
+        reason = self.block_reason(request.url, request.resource_type)
+        with self._lock:
+            if reason:
+                self.blocked[reason] += 1
+                self.estimated_bytes_saved += _TYPICAL_BYTES.get(
+                    request.resource_type, _DEFAULT_TYPICAL_BYTES
+                )
+            else:
+                self.allowed += 1
+        if reason:
+            await route.abort()
+        else:
+            await route.continue_()
+
+    async def install(self, target: Any) -> None:
+        """Route all requests of a Playwright context or page through this policy."""
+        if getattr(target, "_resource_policy", None) is self:
+            return
+        await target.route("**/*", self.handle)
+        target._resource_policy = self
+
+    def stats(self) -> dict:
+        """Return request counters and the estimated transfer saved by aborted requests."""
+        with self._lock:
+            return {
+                "allowed": self.allowed,
+                "blocked": dict(self.blocked),
+                "estimated_bytes_saved": self.estimated_bytes_saved,
+            }
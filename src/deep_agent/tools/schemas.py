@@ -0,0 +1,183 @@
+"""
+Names, descriptions and input schemas of the custom tools.
+
+This module only depends on pydantic, so the tool registry can describe
+every tool to the model without importing crawl4ai, Chroma or Playwright.
+``DESCRIPTIONS`` is the only copy of the text the model reads; the
+docstrings of the tool implementations describe the code instead.
+"""
+
+from typing import Optional, Union
+
+from pydantic import BaseModel, Field
+
+
+class ScraperInput(BaseModel):
+    """Input schema for web scraper tool."""
+
+    url: str = Field(description="URL to scrape")
+    format: str = Field(default="markdown", description="Output format ('markdown' or 'text')")
+    max_tokens: Optional[int] = Field(
+        default=None, description="Token budget for the returned content (0 for the full page)"
+    )
+    focus: Optional[str] = Field(
+        default=None, description="What you are looking for; the most relevant sections are kept"
+    )
+    index_collection: Optional[str] = Field(
+        default=None,
+        description="Also index the full text into this search collection in the background",
+    )
+
+
+class BatchScraperInput(BaseModel):
+    """Input schema for batch web scraper tool."""
+
+    urls: list[str] = Field(description="URLs to scrape")
+    format: str = Field(default="markdown", description="Output format ('markdown' or 'text')")
+    max_tokens: Optional[int] = Field(
+        default=None, description="Token budget shared by all pages (0 for full pages)"
+    )
+    focus: Optional[str] = Field(
+        default=None, description="What you are looking for; the most relevant sections are kept"
+    )
+    index_collection: Optional[str] = Field(
+        default=None,
+        description="Also index the full text into this search collection in the background",
+    )
+
+
+class NavigateInput(BaseModel):
+    """Input schema for navigate_browser."""
+
+    url: str = Field(description="url to navigate to")
+
+
+class ClickInput(BaseModel):
+    """Input schema for click_element."""
+
+    selector: str = Field(description="CSS selector for the element to click")
+
+
+class ExtractHyperlinksInput(BaseModel):
+    """Input schema for extract_hyperlinks."""
+
+    absolute_urls: bool = Field(
+        default=False, description="Return absolute URLs instead of relative URLs"
+    )
+
+
+class GetElementsInput(BaseModel):
+    """Input schema for get_elements."""
+
+    selector: str = Field(description="CSS selector, such as '*', 'div', 'p', 'a', #id, .classname")
+    attributes: list[str] = Field(
+        default_factory=lambda: ["innerText"],
+        description="Set of attributes to retrieve for each element",
+    )
+
+
+class NoInput(BaseModel):
+    """Input schema for tools without arguments."""
+
+
+class SemanticSearchInput(BaseModel):
+    """Input schema for semantic_search."""
+
+    query: str = Field(description="Search query text")
+    collection_name: Union[str, list[str]] = Field(
+        default="default",
+        description="Collection name, list of names, or glob pattern to search in",
+    )
+    n_results: int = Field(default=5, description="Number of results to return")
+    mode: str = Field(default="vector", description='"vector" (default), "lexical" or "hybrid"')
+    vector_weight: float = Field(
+        default=1.0, description="Weight of semantic similarity in hybrid mode"
+    )
+    lexical_weight: float = Field(
+        default=1.0, description="Weight of keyword (BM25) matching in hybrid mode"
+    )
+    where: Optional[dict] = Field(default=None, description="Metadata filter in Chroma syntax")
+    where_document: Optional[dict] = Field(
+        default=None, description="Document content filter in Chroma syntax"
+    )
+    projection: str = Field(
+        default="full",
+        description='"full" (default), "snippet" for a short excerpt around the match, '
+        'or "metadata" for metadata only',
+    )
+    metadata_fields: Optional[list[str]] = Field(
+        default=None, description="Metadata fields to show with each result"
+    )
+    diversity: float = Field(
+        default=0.0,
+        description="0 (default) for pure relevance order, up to 1 to favour results that "
+        "differ from those already returned",
+    )
+
+
+class AddToSearchIndexInput(BaseModel):
+    """Input schema for add_to_search_index."""
+
+    texts: list[str] = Field(description="List of text documents to add")
+    collection_name: str = Field(default="default", description="Name of the collection to add to")
+    metadata: Optional[list[dict]] = Field(
+        default=None, description="Optional list of metadata dicts for each text"
+    )
+    source_keys: Optional[list[str]] = Field(
+        default=None, description="Optional list of stable source identifiers for each text"
+    )
+
+
+class IndexStatusInput(BaseModel):
+    """Input schema for index_status."""
+
+    job_id: Optional[str] = Field(
+        default=None,
+        description="Job to look up (from a web_scraper indexing note); omit for a queue summary",
+    )
+
+
+DESCRIPTIONS = {
+    "web_scraper": (
+        "Scrape web pages and extract content as markdown or text. Use this for reading "
+        "articles, documentation, and blog posts. Long pages are compacted to a token budget; "
+        "pass focus to keep the sections you need."
+    ),
+    "web_scraper_batch": (
+        "Scrape several web pages concurrently in one call. Use this instead of repeated "
+        "web_scraper calls when you have a list of links; each URL's content or error is "
+        "returned in order."
+    ),
+    "click_element": "Click on an element with the given CSS selector",
+    "navigate_browser": "Navigate a browser to the specified URL",
+    "previous_webpage": "Navigate back to the previous page in the browser history",
+    "extract_text": "Extract all the text on the current webpage",
+    "extract_hyperlinks": "Extract all hyperlinks on the current webpage",
+    "get_elements": "Retrieve elements in the current web page matching the given CSS selector",
+    "current_webpage": "Returns the URL of the current page",
+    "semantic_search": (
+        "Search for documents by semantic similarity.\n\n"
+        'Use mode="hybrid" to also match exact identifiers, error strings and version numbers '
+        "with BM25; the two rankings are merged with reciprocal rank fusion using the given "
+        "weights.\n\n"
+        "To search several collections at once, pass a list of names or a glob pattern such "
+        'as "project-*"; results are merged into one ranking.\n\n'
+        'Filter on metadata with `where` (e.g. {"source": "docs"} or {"year": {"$gte": 2024}}) '
+        'and on content with `where_document` (e.g. {"$contains": "timeout"}) instead of '
+        "fetching more results.\n\n"
+        "Set `diversity` (e.g. 0.3) when results tend to repeat each other; extra candidates "
+        "are fetched and re-ranked to favour distinct information."
+    ),
+    "add_to_search_index": (
+        "Add documents to semantic search index.\n\n"
+        "Long documents are split into chunks at markdown headings, and exact or near-duplicate "
+        "chunks are skipped. Documents already indexed with the same content are not embedded "
+        "again. Pass a stable source key per text (such as its URL) so a re-added source "
+        "replaces its previous version."
+    ),
+    "list_search_collections": (
+        "List all collections in the search index with document counts, on-disk size and "
+        "last-modified time."
+    ),
+    "index_status": "Report on background indexing of scraped pages.",
+}
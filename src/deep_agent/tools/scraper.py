@@ -3,54 +3,199 @@ Web scraper tool using Crawl4AI.
 """
 
 import asyncio
+import re
+import urllib.error
+import urllib.request
+from functools import lru_cache
+from typing import Optional
+from urllib.parse import urlsplit
 from langchain_core.tools import StructuredTool
-from crawl4ai import AsyncWebCrawler, CrawlerRunConfig, CacheMode
-from deep_agent.core.exceptions import ToolError
+from crawl4ai import CrawlerRunConfig, CacheMode, CrawlResult
+from deepagents.backends import StateBackend
+from deep_agent.config.settings import Settings
+from deep_agent.core.exceptions import BackendError, ToolError
+from deep_agent.storage.index_queue import IndexJob, get_index_queue
+from deep_agent.storage.scrape_cache import (
+    CachedPage,
+    ScrapeCache,
+    canonicalize_url,
+    get_scrape_cache,
+)
+from deep_agent.tools.compaction import compact, estimate_tokens
+from deep_agent.tools.schemas import DESCRIPTIONS, BatchScraperInput, ScraperInput
+from deep_agent.tools.crawler_pool import DomainLimitedDispatcher, get_crawler_pool
+from deep_agent.utils.async_utils import run_sync
 from loguru import logger
-from pydantic import BaseModel, Field
 
 
-class ScraperInput(BaseModel):
-    """Input schema for web scraper tool."""
+@lru_cache(maxsize=1)
+def _settings() -> Settings:
+    """Application settings, read once rather than on every page."""
+    return Settings()
 
-    url: str = Field(description="URL to scrape")
-    format: str = Field(default="markdown", description="Output format ('markdown' or 'text')")
 
+def _header(headers: Optional[dict], name: str) -> Optional[str]:
+    for key, value in (headers or {}).items():
+        if key.lower() == name:
+            return value
+    return None
 
-def _scrape_webpage(url: str, format: str = "markdown") -> str:
-    """
-    Scrape a web page and extract content.
 
-    Args:
-        url: URL to scrape
-        format: Output format ('markdown' or 'text')
+def _not_modified(page: CachedPage, timeout: float) -> bool:
+    """Send a conditional GET for a stale page; True if the origin answers 304."""
+    headers = {}
+    if page.etag:
+        headers["If-None-Match"] = page.etag
+    if page.last_modified:
+        headers["If-Modified-Since"] = page.last_modified
+    request = urllib.request.Request(page.url, headers=headers)
+    try:
+        with urllib.request.urlopen(request, timeout=timeout):
+            return False
+    except urllib.error.HTTPError as e:
+        return e.code == 304
+    except Exception as e:
+        logger.debug(f"Revalidation of {page.url} failed: {e}")
+        return False
 
-    Returns:
-        Extracted content as string
-    """
+
+def _run_config(timeout: Optional[float] = None) -> CrawlerRunConfig:
+    config = CrawlerRunConfig(
+        cache_mode=CacheMode.BYPASS,
+        word_count_threshold=10,
+        wait_until=_settings().browser.wait_until,
+    )
+    if timeout:
+        config.page_timeout = int(timeout * 1000)
+    return config
+
+
+async def _from_cache(cache: Optional[ScrapeCache], url: str, format: str) -> Optional[str]:
+    """Return cached content if fresh, or stale but confirmed unchanged by the origin."""
+    if cache is None:
+        return None
+    cached = await asyncio.to_thread(cache.get, url, format)
+    if cached and cached.fresh:
+        logger.info(f"Scrape cache hit: {url}")
+        return cached.content
+    if cached and cached.revalidatable:
+        timeout = _settings().scraper.revalidate_timeout
+        if await asyncio.to_thread(_not_modified, cached, timeout):
+            logger.info(f"Scrape cache revalidated: {url}")
+            refreshed = await asyncio.to_thread(cache.refresh, cached)
+            return refreshed.content
+    return None
+
+
+async def _page_content(
+    cache: Optional[ScrapeCache], url: str, format: str, result: CrawlResult
+) -> str:
+    """Extract the requested format from a successful crawl and cache it."""
+    if format == "markdown":
+        content = str(result.markdown)
+    else:
+        content = result.cleaned_html
+    if cache and content:
+        await asyncio.to_thread(
+            cache.put,
+            url,
+            format,
+            content,
+            etag=_header(result.response_headers, "etag"),
+            last_modified=_header(result.response_headers, "last-modified"),
+        )
+    return content
+
+
+def _full_text_path(url: str) -> str:
+    parts = urlsplit(url)
+    slug = re.sub(r"[^A-Za-z0-9._-]+", "-", parts.path.strip("/") + "-" + parts.query)
+    directory = _settings().scraper.full_text_dir.rstrip("/")
+    return f"{directory}/{parts.hostname or 'page'}/{slug.strip('-') or 'index'}.md"
+
+
+def _save_full_text(path: str, content: str) -> bool:
+    """Write the full page to the agent filesystem; False outside an agent run."""
     try:
-        logger.info(f"Scraping URL: {url}")
+        result = StateBackend().write(path, content)
+    except Exception as e:
+        logger.debug(f"Could not save full text to {path}: {e}")
+        return False
+    return not getattr(result, "error", None)
 
-        async def crawl():
-            config = CrawlerRunConfig(
-                cache_mode=CacheMode.BYPASS,
-                word_count_threshold=10,
-            )
 
-            async with AsyncWebCrawler() as crawler:
-                result = await crawler.arun(url=url, config=config)
+def _compact_output(url: str, content: str, max_tokens: int, focus: Optional[str]) -> str:
+    """Fit a page into ``max_tokens``, leaving a pointer to the saved full text."""
+    if not max_tokens or estimate_tokens(content) <= max_tokens:
+        return content
 
-                if result.success:
-                    if format == "markdown":
-                        return result.markdown
-                    else:
-                        return result.cleaned_html
-                else:
-                    error_msg = f"Scraping failed: {result.error_message}"
-                    logger.error(error_msg)
-                    raise ToolError(error_msg)
+    result = compact(content, max_tokens, focus)
+    path = _full_text_path(url)
+    note = f"[Compacted from ~{result.original_tokens} to ~{result.tokens} tokens"
+    if result.omitted_sections:
+        note += f", {result.omitted_sections} sections omitted"
+    if _save_full_text(path, content):
+        note += f". Full text saved to {path}; use read_file to see the rest.]"
+    else:
+        note += ". Scrape again with max_tokens=0 for the full page.]"
+    logger.info(f"Compacted {url} from ~{result.original_tokens} to ~{result.tokens} tokens")
+    return f"{result.text}\n\n{note}"
 
-        return asyncio.run(crawl())
+
+def _queue_for_index(
+    url: str, content: str, collection_name: str
+) -> tuple[Optional[IndexJob], str]:
+    """Hand a page to the background index queue; returns the job and a note for the output."""
+    try:
+        job = get_index_queue().submit(
+            content,
+            collection_name,
+            metadata={"url": url, "source": "web_scraper"},
+            source_key=canonicalize_url(url),
+        )
+    except BackendError as e:
+        logger.warning(f"Not indexing {url}: {e}")
+        return None, f"[Not indexed: {e}]"
+    return job, f"[Indexing into '{collection_name}' in the background (job {job.id})]"
+
+
+def _index_pages(contents: dict[str, str], collection_name: Optional[str]) -> dict[str, str]:
+    """Queue pages for indexing when requested; returns an output note per URL."""
+    if not collection_name:
+        return {}
+    return {
+        url: _queue_for_index(url, content, collection_name)[1] for url, content in contents.items()
+    }
+
+
+def _with_note(text: str, note: Optional[str]) -> str:
+    return f"{text}\n\n{note}" if note else text
+
+
+def _budget(max_tokens: Optional[int], default: int) -> int:
+    return default if max_tokens is None else max_tokens
+
+
+async def _afetch_page(url: str, format: str) -> str:
+    """Return a page's full content from the cache or a crawl."""
+    try:
+        cache = get_scrape_cache()
+        content = await _from_cache(cache, url, format)
+        if content is not None:
+            return content
+
+        logger.info(f"Scraping URL: {url}")
+
+        config = _run_config()
+
+        result = await get_crawler_pool().run(lambda crawler: crawler.arun(url=url, config=config))
+
+        if result.success:
+            return await _page_content(cache, url, format, result)
+        else:
+            error_msg = f"Scraping failed: {result.error_message}"
+            logger.error(error_msg)
+            raise ToolError(error_msg)
 
     except ToolError:
         raise
@@ -60,9 +205,217 @@ def _scrape_webpage(url: str, format: str = "markdown") -> str:
         raise ToolError(error_msg)
 
 
+async def _ascrape_webpage(
+    url: str,
+    format: str = "markdown",
+    max_tokens: Optional[int] = None,
+    focus: Optional[str] = None,
+    index_collection: Optional[str] = None,
+) -> str:
+    """
+    Scrape a web page and extract content.
+
+    Pages are served from the scrape cache while fresh; stale pages with an
+    ETag or Last-Modified header are revalidated before being rendered again.
+    Pages over the token budget are compacted and the full text is saved to
+    the agent filesystem. With ``index_collection`` the full text is also
+    queued for background indexing, so it never passes through the model.
+
+    Args:
+        url: URL to scrape
+        format: Output format ('markdown' or 'text')
+        max_tokens: Token budget (default from settings, 0 disables compaction)
+        focus: Query used to pick the most relevant sections when compacting
+        index_collection: Search collection to index the full page into
+
+    Returns:
+        Extracted content as string
+    """
+    content = await _afetch_page(url, format)
+    # Submitting may block while the index queue is full.
+    notes = await asyncio.to_thread(_index_pages, {url: content}, index_collection)
+    max_tokens = _budget(max_tokens, _settings().scraper.max_tokens)
+    return _with_note(_compact_output(url, content, max_tokens, focus), notes.get(url))
+
+
+def _scrape_webpage(
+    url: str,
+    format: str = "markdown",
+    max_tokens: Optional[int] = None,
+    focus: Optional[str] = None,
+    index_collection: Optional[str] = None,
+) -> str:
+    """Synchronous wrapper around :func:`_ascrape_webpage` for the REPL and sync agents."""
+    # Compaction runs on the calling thread, where the agent's filesystem state is reachable.
+    content = run_sync(_afetch_page(url, format))
+    notes = _index_pages({url: content}, index_collection)
+    max_tokens = _budget(max_tokens, _settings().scraper.max_tokens)
+    return _with_note(_compact_output(url, content, max_tokens, focus), notes.get(url))
+
+
 web_scraper_tool = StructuredTool.from_function(
     func=_scrape_webpage,
+    coroutine=_ascrape_webpage,
     name="web_scraper",
-    description="Scrape web pages and extract content as markdown or text. Use this for reading articles, documentation, and blog posts.",
+    description=DESCRIPTIONS["web_scraper"],
     args_schema=ScraperInput,
 )
+
+
+async def _afetch_batch(
+    urls: list[str], format: str
+) -> tuple[list[str], dict[str, str], dict[str, str]]:
+    """Fetch unique URLs concurrently; returns (unique urls, contents, errors)."""
+    config = _settings().scraper
+    unique = list(dict.fromkeys(urls))
+    if len(unique) > config.batch_max_urls:
+        raise ToolError(f"Too many URLs: {len(unique)} (limit {config.batch_max_urls})")
+
+    cache = get_scrape_cache()
+    contents: dict[str, str] = {}
+    errors: dict[str, str] = {}
+
+    cached = await asyncio.gather(*(_from_cache(cache, url, format) for url in unique))
+    contents.update({url: content for url, content in zip(unique, cached) if content is not None})
+    pending = [url for url in unique if url not in contents]
+
+    if pending:
+        logger.info(f"Scraping {len(pending)} URLs ({len(contents)} served from cache)")
+        dispatcher = DomainLimitedDispatcher(
+            max_concurrency=config.batch_max_concurrency,
+            per_domain_limit=config.batch_per_domain_limit,
+            url_timeout=config.url_timeout,
+            domain_delay=config.batch_domain_delay,
+        )
+        run_config = _run_config(timeout=config.url_timeout)
+        try:
+            results = await get_crawler_pool().run(
+                lambda crawler: crawler.arun_many(pending, config=run_config, dispatcher=dispatcher)
+            )
+        except Exception as e:
+            raise ToolError(f"Error scraping batch: {e}")
+
+        for url, result in zip(pending, results):
+            if result.success:
+                contents[url] = await _page_content(cache, url, format, result)
+            else:
+                errors[url] = result.error_message or "unknown error"
+                logger.warning(f"Scraping failed for {url}: {errors[url]}")
+    return unique, contents, errors
+
+
+def _format_batch(
+    urls: list[str],
+    unique: list[str],
+    contents: dict[str, str],
+    errors: dict[str, str],
+    max_tokens: Optional[int],
+    focus: Optional[str],
+    notes: dict[str, str],
+) -> str:
+    # The budget is shared evenly by the pages that were scraped.
+    max_tokens = _budget(max_tokens, _settings().scraper.batch_max_tokens)
+    per_page = max_tokens // len(contents) if max_tokens and contents else 0
+    pages = {
+        url: _with_note(_compact_output(url, content, per_page, focus), notes.get(url))
+        for url, content in contents.items()
+    }
+
+    sections = []
+    for i, url in enumerate(urls, start=1):
+        if url in pages:
+            sections.append(f"## [{i}] {url}\n\n{pages[url]}")
+        else:
+            sections.append(f"## [{i}] {url}\n\nError: {errors.get(url, 'not scraped')}")
+    failed = len([url for url in unique if url in errors])
+    header = f"Scraped {len(unique) - failed} of {len(unique)} URLs"
+    if failed:
+        header += f" ({failed} failed)"
+    return header + "\n\n" + "\n\n".join(sections)
+
+
+async def _ascrape_batch(
+    urls: list[str],
+    format: str = "markdown",
+    max_tokens: Optional[int] = None,
+    focus: Optional[str] = None,
+    index_collection: Optional[str] = None,
+) -> str:
+    """
+    Scrape several web pages concurrently.
+
+    Args:
+        urls: URLs to scrape
+        format: Output format ('markdown' or 'text')
+        max_tokens: Token budget shared by all pages (default from settings, 0 disables)
+        focus: Query used to pick the most relevant sections when compacting
+        index_collection: Search collection to index the full pages into
+
+    Returns:
+        One section per URL in input order, with content or the URL's error
+    """
+    if not urls:
+        return "No URLs to scrape (empty list provided)"
+    unique, contents, errors = await _afetch_batch(urls, format)
+    notes = await asyncio.to_thread(_index_pages, contents, index_collection)
+    return _format_batch(urls, unique, contents, errors, max_tokens, focus, notes)
+
+
+def _scrape_batch(
+    urls: list[str],
+    format: str = "markdown",
+    max_tokens: Optional[int] = None,
+    focus: Optional[str] = None,
+    index_collection: Optional[str] = None,
+) -> str:
+    """Synchronous wrapper around :func:`_ascrape_batch`."""
+    if not urls:
+        return "No URLs to scrape (empty list provided)"
+    unique, contents, errors = run_sync(_afetch_batch(urls, format))
+    notes = _index_pages(contents, index_collection)
+    return _format_batch(urls, unique, contents, errors, max_tokens, focus, notes)
+
+
+web_scraper_batch_tool = StructuredTool.from_function(
+    func=_scrape_batch,
+    coroutine=_ascrape_batch,
+    name="web_scraper_batch",
+    description=DESCRIPTIONS["web_scraper_batch"],
+    args_schema=BatchScraperInput,
+)
+
+
+async def ascrape_to_index(
+    urls: list[str], collection_name: str = "default", format: str = "markdown"
+) -> list[IndexJob]:
+    """
+    Scrape pages and queue them for background indexing without returning their text.
+
+    Args:
+        urls: URLs to scrape
+        collection_name: Search collection to index into
+        format: Output format ('markdown' or 'text')
+
+    Returns:
+        One index job per scraped page; pages that failed to scrape or could
+        not be queued are logged and skipped
+    """
+    if not urls:
+        return []
+    _, contents, _ = await _afetch_batch(urls, format)
+    return await asyncio.to_thread(_queue_pages, contents, collection_name)
+
+
+def scrape_to_index(
+    urls: list[str], collection_name: str = "default", format: str = "markdown"
+) -> list[IndexJob]:
+    """Synchronous wrapper around :func:`ascrape_to_index`."""
+    if not urls:
+        return []
+    _, contents, _ = run_sync(_afetch_batch(urls, format))
+    return _queue_pages(contents, collection_name)
+
+
+def _queue_pages(contents: dict[str, str], collection_name: str) -> list[IndexJob]:
+    jobs = [_queue_for_index(url, content, collection_name)[0] for url, content in contents.items()]
+    return [job for job in jobs if job is not None]
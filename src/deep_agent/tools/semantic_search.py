@@ -2,63 +2,204 @@
 Semantic search tool using ChromaDB and Ollama embeddings.
 """
 
-from typing import Optional
-from langchain_ollama import OllamaEmbeddings
-from langchain_chroma import Chroma
+import asyncio
+from datetime import datetime
+from typing import Any, Optional, Union
+from langchain_core.tools import StructuredTool
 from loguru import logger
+from deep_agent.storage.index_queue import get_index_queue
+from deep_agent.storage.ingestion import IngestionPipeline
+from deep_agent.storage.pool import get_vectorstore_pool
+from deep_agent.storage.lexical import tokenize
+from deep_agent.storage.search import SearchHit, search_collections
+from deep_agent.tools.schemas import (
+    DESCRIPTIONS,
+    AddToSearchIndexInput,
+    IndexStatusInput,
+    NoInput,
+    SemanticSearchInput,
+)
+
+PROJECTIONS = ("full", "snippet", "metadata")
+
+
+def _snippet(text: str, query: str, max_chars: int) -> str:
+    """Cut a window of text around the first query term it contains."""
+    if len(text) <= max_chars:
+        return text
+    lowered = text.lower()
+    positions = [lowered.find(term) for term in tokenize(query)]
+    first = min((p for p in positions if p >= 0), default=0)
+    start = max(0, min(first - max_chars // 4, len(text) - max_chars))
+    snippet = text[start : start + max_chars].strip()
+    return ("..." if start > 0 else "") + snippet + ("..." if start + max_chars < len(text) else "")
+
+
+def _format_hit(
+    hit: SearchHit,
+    query: str,
+    projection: str,
+    metadata_fields: Optional[list[str]],
+    snippet_chars: int,
+) -> str:
+    lines = []
+    if metadata_fields or projection == "metadata":
+        fields = metadata_fields or sorted(hit.metadata)
+        pairs = [f"{field}: {hit.metadata[field]}" for field in fields if field in hit.metadata]
+        if pairs:
+            lines.append(" | ".join(pairs))
+    if projection == "snippet":
+        lines.append(_snippet(hit.document, query, snippet_chars))
+    elif projection != "metadata":
+        lines.append(hit.document)
+    return "\n".join(lines)
+
+
+def _search(
+    query: str,
+    collection_name: Union[str, list[str]],
+    projection: str,
+    metadata_fields: Optional[list[str]],
+    query_embedding: Optional[list[float]] = None,
+    **options: Any,
+) -> str:
+    """Run a search and format the hits for the agent."""
+    if projection not in PROJECTIONS:
+        return f"Error searching: unknown projection '{projection}', expected one of {PROJECTIONS}"
+
+    try:
+        pool = get_vectorstore_pool()
+        hits = search_collections(
+            pool,
+            query,
+            collections=collection_name,
+            query_embedding=query_embedding,
+            include_documents=projection != "metadata",
+            **options,
+        )
+
+        if not hits:
+            return f"No results found in collection '{collection_name}' for query: '{query}'"
+
+        fan_out = len({hit.collection for hit in hits}) > 1 or collection_name != hits[0].collection
+        formatted = []
+        for i, hit in enumerate(hits):
+            source = f", Collection: {hit.collection}" if fan_out else ""
+            body = _format_hit(hit, query, projection, metadata_fields, pool.config.snippet_chars)
+            formatted.append(f"[Result {i + 1}] (Score: {hit.score:.4f}{source})\n{body}\n")
+
+        mode = options.get("mode", "vector")
+        logger.info(f"Found {len(hits)} results for query in '{collection_name}' ({mode})")
+        return f"Found {len(hits)} results:\n\n" + "\n".join(formatted)
+    except Exception as e:
+        logger.error(f"Failed to search semantic index: {e}")
+        return f"Error searching: {str(e)}"
 
 
 def semantic_search(
     query: str,
-    collection_name: str = "default",
+    collection_name: Union[str, list[str]] = "default",
     n_results: int = 5,
+    mode: str = "vector",
+    vector_weight: float = 1.0,
+    lexical_weight: float = 1.0,
+    where: Optional[dict] = None,
+    where_document: Optional[dict] = None,
+    projection: str = "full",
+    metadata_fields: Optional[list[str]] = None,
+    diversity: float = 0.0,
 ) -> str:
-    """Search for documents by semantic similarity.
+    """Search one or more collections and format the hits for the agent.
 
     Args:
         query: Search query text
-        collection_name: Collection to search in
+        collection_name: Collection name, list of names, or glob pattern to search in
         n_results: Number of results to return
+        mode: "vector" (default), "lexical" or "hybrid"
+        vector_weight: Weight of semantic similarity in hybrid mode
+        lexical_weight: Weight of keyword (BM25) matching in hybrid mode
+        where: Metadata filter in Chroma syntax
+        where_document: Document content filter in Chroma syntax
+        projection: "full" (default), "snippet" for a short excerpt around the
+            match, or "metadata" for metadata only
+        metadata_fields: Metadata fields to show with each result
+        diversity: 0 (default) for pure relevance order, up to 1 to favour
+            results that differ from those already returned
 
     Returns:
         Formatted search results
     """
-    try:
-        embeddings = OllamaEmbeddings(model="nomic-embed-text:latest")
-        vectorstore = Chroma(
-            persist_directory="./data/chroma",
-            collection_name=collection_name,
-            embedding_function=embeddings,
-        )
+    return _search(
+        query,
+        collection_name,
+        projection,
+        metadata_fields,
+        n_results=n_results,
+        mode=mode,
+        vector_weight=vector_weight,
+        lexical_weight=lexical_weight,
+        where=where,
+        where_document=where_document,
+        diversity=diversity,
+    )
 
-        results = vectorstore.similarity_search_with_score(query, k=n_results)
 
-        if not results:
-            return f"No results found in collection '{collection_name}' for query: '{query}'"
+async def asemantic_search(
+    query: str,
+    collection_name: Union[str, list[str]] = "default",
+    n_results: int = 5,
+    mode: str = "vector",
+    vector_weight: float = 1.0,
+    lexical_weight: float = 1.0,
+    where: Optional[dict] = None,
+    where_document: Optional[dict] = None,
+    projection: str = "full",
+    metadata_fields: Optional[list[str]] = None,
+    diversity: float = 0.0,
+) -> str:
+    """Async variant of :func:`semantic_search`.
 
-        formatted = [
-            f"[Result {i + 1}] (Score: {1 - score:.4f})\n{doc.page_content}\n"
-            for i, (doc, score) in enumerate(results)
-        ]
+    The query is embedded with the async embeddings client; the Chroma and
+    SQLite reads, which have no async API, run in a worker thread.
+    """
+    query_embedding = None
+    if mode != "lexical" and projection in PROJECTIONS:
+        try:
+            query_embedding = await get_vectorstore_pool().embeddings.aembed_query(query)
+        except Exception as e:
+            logger.error(f"Failed to search semantic index: {e}")
+            return f"Error searching: {str(e)}"
 
-        logger.info(f"Found {len(results)} results for query in '{collection_name}'")
-        return f"Found {len(results)} results:\n\n" + "\n".join(formatted)
-    except Exception as e:
-        logger.error(f"Failed to search semantic index: {e}")
-        return f"Error searching: {str(e)}"
+    return await asyncio.to_thread(
+        _search,
+        query,
+        collection_name,
+        projection,
+        metadata_fields,
+        query_embedding,
+        n_results=n_results,
+        mode=mode,
+        vector_weight=vector_weight,
+        lexical_weight=lexical_weight,
+        where=where,
+        where_document=where_document,
+        diversity=diversity,
+    )
 
 
 def add_to_search_index(
     texts: list[str],
     collection_name: str = "default",
     metadata: Optional[list[dict]] = None,
+    source_keys: Optional[list[str]] = None,
 ) -> str:
-    """Add documents to semantic search index.
+    """Chunk texts and ingest them into a collection, reporting what changed.
 
     Args:
         texts: List of text documents to add
         collection_name: Name of the collection to add to
         metadata: Optional list of metadata dicts for each text
+        source_keys: Optional list of stable source identifiers for each text
 
     Returns:
         Success message with count
@@ -67,49 +208,161 @@ def add_to_search_index(
         return "No documents to add (empty list provided)"
 
     try:
-        embeddings = OllamaEmbeddings(model="nomic-embed-text:latest")
-        vectorstore = Chroma(
-            persist_directory="./data/chroma",
+        pipeline = IngestionPipeline(get_vectorstore_pool())
+        report = pipeline.run(
+            texts,
             collection_name=collection_name,
-            embedding_function=embeddings,
+            metadatas=metadata,
+            source_keys=source_keys,
+            chunk=True,
         )
 
-        vectorstore.add_texts(texts=texts, metadatas=metadata)
+        if report.total and not report.added:
+            return f"Error adding documents: {report.failed_batches[0].error}"
+        if report.failed:
+            errors = "; ".join(f"batch {b.index + 1}: {b.error}" for b in report.failed_batches)
+            return (
+                f"Partially added {report.added} of {report.total} chunks to search index "
+                f"(collection: {collection_name}). Failed {errors}"
+            )
 
-        logger.info(f"Added {len(texts)} documents to collection '{collection_name}'")
-        return f"Successfully added {len(texts)} documents to search index (collection: {collection_name})"
+        logger.info(
+            f"Added {len(texts)} documents as {report.added} new chunks "
+            f"to collection '{collection_name}' ({report.unchanged} unchanged)"
+        )
+        details = [f"{report.added} new or updated chunks"]
+        if report.unchanged:
+            details.append(f"{report.unchanged} unchanged skipped")
+        if report.duplicates:
+            details.append(f"{report.duplicates} duplicates skipped")
+        if report.removed:
+            details.append(f"{report.removed} stale chunks removed")
+        return (
+            f"Successfully added {len(texts)} documents ({', '.join(details)}) "
+            f"to search index (collection: {collection_name})"
+        )
     except Exception as e:
         logger.error(f"Failed to add documents to search index: {e}")
         return f"Error adding documents: {str(e)}"
 
 
+async def aadd_to_search_index(
+    texts: list[str],
+    collection_name: str = "default",
+    metadata: Optional[list[dict]] = None,
+    source_keys: Optional[list[str]] = None,
+) -> str:
+    """Async variant of :func:`add_to_search_index`.
+
+    Ingestion embeds batches on its own thread pool and writes through
+    synchronous storage clients, so it runs in a worker thread.
+    """
+    return await asyncio.to_thread(
+        add_to_search_index, texts, collection_name, metadata, source_keys
+    )
+
+
+def _format_size(size_bytes: int) -> str:
+    size = float(size_bytes)
+    for unit in ("B", "KB", "MB"):
+        if size < 1024:
+            return f"{size:.0f} {unit}" if unit == "B" else f"{size:.1f} {unit}"
+        size /= 1024
+    return f"{size:.1f} GB"
+
+
 def list_search_collections() -> str:
     """List all collections in the search index.
 
     Returns:
-        Formatted list of collections
+        Formatted list of collections with document counts, on-disk size and
+        last-modified time
     """
     try:
-        embeddings = OllamaEmbeddings(model="nomic-embed-text:latest")
-        vectorstore = Chroma(
-            persist_directory="./data/chroma",
-            collection_name="default",
-            embedding_function=embeddings,
-        )
-
-        client = vectorstore._client
-        collections = client.list_collections()
+        collections = get_vectorstore_pool().collection_stats()
 
         if not collections:
             return "No collections found in search index"
 
         collection_info = []
-        for col in collections:
-            count = col.count()
-            collection_info.append(f"- {col.name}: {count} documents")
+        for stats in collections:
+            updated = (
+                datetime.fromtimestamp(stats.last_modified).strftime("%Y-%m-%d %H:%M")
+                if stats.last_modified
+                else "unknown"
+            )
+            collection_info.append(
+                f"- {stats.name}: {stats.count} documents, "
+                f"{_format_size(stats.size_bytes)}, updated {updated}"
+            )
 
         logger.info(f"Listed {len(collections)} collections")
         return "Collections in search index:\n" + "\n".join(collection_info)
     except Exception as e:
         logger.error(f"Failed to list collections: {e}")
         return f"Error listing collections: {str(e)}"
+
+
+async def alist_search_collections() -> str:
+    """Async variant of :func:`list_search_collections`."""
+    return await asyncio.to_thread(list_search_collections)
+
+
+def index_status(job_id: Optional[str] = None) -> str:
+    """Describe one index job, or summarise the index queue.
+
+    Args:
+        job_id: Job to look up (from a web_scraper indexing note); omit for a queue summary
+
+    Returns:
+        The job's status, or queue depth and job counts
+    """
+    index_queue = get_index_queue()
+    if job_id:
+        job = index_queue.get(job_id)
+        if job is None:
+            return f"Unknown index job: {job_id}"
+        line = f"Job {job.id} ({job.source_key or 'text'} -> {job.collection_name}): {job.status}"
+        if job.status == "done":
+            line += f", {job.chunks_added} chunks added, {job.chunks_unchanged} unchanged"
+        if job.error:
+            line += f", error: {job.error}"
+        return line
+
+    stats = index_queue.status()
+    return (
+        f"Index queue: {stats['pending']}/{stats['max_size']} pending, "
+        f"{stats['running']} running, {stats['done']} done, {stats['failed']} failed, "
+        f"{stats['rejected']} rejected when full ({stats['chunks_added']} chunks added)"
+    )
+
+
+async def aindex_status(job_id: Optional[str] = None) -> str:
+    """Async variant of :func:`index_status`."""
+    return index_status(job_id)
+
+
+semantic_search_tool = StructuredTool.from_function(
+    func=semantic_search,
+    coroutine=asemantic_search,
+    description=DESCRIPTIONS["semantic_search"],
+    args_schema=SemanticSearchInput,
+)
+add_to_search_index_tool = StructuredTool.from_function(
+    func=add_to_search_index,
+    coroutine=aadd_to_search_index,
+    description=DESCRIPTIONS["add_to_search_index"],
+    args_schema=AddToSearchIndexInput,
+)
+list_search_collections_tool = StructuredTool.from_function(
+    func=list_search_collections,
+    coroutine=alist_search_collections,
+    description=DESCRIPTIONS["list_search_collections"],
+    args_schema=NoInput,
+)
+index_status_tool = StructuredTool.from_function(
+    func=index_status,
+    coroutine=aindex_status,
+    description=DESCRIPTIONS["index_status"],
+    args_schema=IndexStatusInput,
+)
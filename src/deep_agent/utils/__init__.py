@@ -1,5 +1,6 @@
 """Utilities layer."""
 
+from deep_agent.utils.async_utils import BackgroundLoop, run_sync
 from deep_agent.utils.logging import setup_logging
 
-__all__ = ["setup_logging"]
+__all__ = ["BackgroundLoop", "run_sync", "setup_logging"]
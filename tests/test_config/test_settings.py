@@ -22,3 +22,15 @@ def test_valid_log_levels():
     """Test that default log level is set correctly."""
     settings = Settings()
     assert settings.logging_config.level == "INFO"
+
+
+def test_nested_env_variables(monkeypatch):
+    """Test that SECTION_FIELD environment variables reach nested settings."""
+    monkeypatch.setenv("BACKEND_VECTOR_STORE", "numpy")
+    monkeypatch.setenv("OLLAMA_BASE_URL", "http://ollama:11434")
+
+    settings = Settings()
+
+    assert settings.backend.vector_store == "numpy"
+    assert settings.ollama.base_url == "http://ollama:11434"
+    print("✓ Nested environment variables test passed")
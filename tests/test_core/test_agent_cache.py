@@ -0,0 +1,123 @@
+"""
+Tests for the compiled agent cache.
+"""
+
+import pytest
+from langchain_core.runnables import RunnableLambda
+from deep_agent.config.models import AgentConfig, ModelConfig
+from deep_agent.config.settings import Settings
+from deep_agent.core import agent as agent_module
+from deep_agent.core.agent import AgentCache, AgentFactory, get_agent_cache, memory_namespace
+
+
+@pytest.fixture
+def builds(monkeypatch):
+    built = []
+
+    def fake_create_deep_agent(**kwargs):
+        built.append(kwargs)
+        return object()
+
+    monkeypatch.setattr(agent_module, "create_deep_agent", fake_create_deep_agent)
+    return built
+
+
+def agent_config(**overrides):
+    return AgentConfig(
+        model=ModelConfig(model_name="test-model"), system_prompt="Test", **overrides
+    )
+
+
+def test_identical_config_reuses_agent(builds):
+    """Test that the same config and settings return one compiled agent."""
+    cache = AgentCache()
+    first = AgentFactory(cache=cache).create_agent(agent_config())
+    second = AgentFactory(cache=cache).create_agent(agent_config())
+
+    assert second is first
+    assert len(builds) == 1
+    assert cache.stats()["hits"] == 1
+    print("✓ Agent reuse test passed")
+
+
+def test_key_covers_config_and_settings(builds):
+    """Test that agent config and graph settings change the key, other settings don't."""
+    cache = AgentCache()
+    factory = AgentFactory(cache=cache)
+    key = factory.cache_key(agent_config())
+
+    assert factory.cache_key(agent_config(tools=["search"])) != key
+    assert (
+        AgentFactory(Settings(ollama={"base_url": "http://other:11434"}), cache).cache_key(
+            agent_config()
+        )
+        != key
+    )
+    assert AgentFactory(Settings(scraper={"max_tokens": 1}), cache).cache_key(agent_config()) == key
+    assert factory.create_agent(agent_config()) is not factory.create_agent(
+        agent_config(tools=["search"])
+    )
+    print("✓ Agent cache key test passed")
+
+
+def test_invalidate_and_bound(builds):
+    """Test explicit invalidation and LRU eviction beyond max_size."""
+    factory = AgentFactory(cache=AgentCache(max_size=2))
+    first = factory.create_agent(agent_config())
+
+    assert factory.invalidate(agent_config())
+    assert factory.create_agent(agent_config()) is not first
+
+    factory.create_agent(agent_config(tools=["search"]))
+    factory.create_agent(agent_config(tools=["scrape"]))
+    assert factory.cache.stats()["size"] == 2
+    assert factory.cache.evictions == 1
+    assert not factory.invalidate(agent_config())
+    print("✓ Agent cache invalidation test passed")
+
+
+def test_compiled_agent_cached():
+    """Test that a real compiled agent is reused across factories."""
+    cache = AgentCache()
+    agent = AgentFactory(cache=cache).create_agent()
+
+    assert AgentFactory(cache=cache).create_agent() is agent
+    assert AgentFactory(cache=cache).create_agent(use_cache=False) is not agent
+    print("✓ Compiled agent cache test passed")
+
+
+def test_cache_sized_once(monkeypatch):
+    """Test that later settings keep the shared cache size and resize() changes it."""
+    monkeypatch.setattr(agent_module, "_agent_cache", None)
+    cache = get_agent_cache(Settings(agent_cache_size=3))
+    for key in "abc":
+        cache.put(key, object())
+
+    assert get_agent_cache(Settings(agent_cache_size=1)) is cache
+    assert cache.max_size == 3
+    assert cache.stats()["size"] == 3
+
+    cache.resize(1)
+    assert cache.stats()["size"] == 1
+    assert cache.evictions == 2
+    print("✓ Agent cache sizing test passed")
+
+
+def test_memory_namespace_scoped_per_thread_or_user():
+    """Test that /memories/ is shared within a user and kept apart across threads."""
+    factory = AgentFactory(cache=AgentCache())
+    namespace = RunnableLambda(memory_namespace).invoke
+
+    first = namespace(None, config=factory.create_config_for_thread("t1"))
+    second = namespace(None, config=factory.create_config_for_thread("t2"))
+    user_first = namespace(None, config=factory.create_config_for_thread("t1", user_id="u1"))
+    user_second = namespace(None, config=factory.create_config_for_thread("t2", user_id="u1"))
+
+    assert first != second
+    assert user_first == user_second == ("filesystem", "user:u1")
+    assert memory_namespace() == ("filesystem", "thread:default")
+    assert namespace(None, config={"configurable": {"thread_id": "a/b c"}}) == (
+        "filesystem",
+        "thread:a_b_c",
+    )
+    print("✓ Memory namespace test passed")
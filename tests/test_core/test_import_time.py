@@ -0,0 +1,55 @@
+"""
+Import-time benchmark: importing the package and listing tools must stay fast.
+"""
+
+import json
+import os
+import subprocess
+import sys
+
+HEAVY_MODULES = (
+    "chromadb",
+    "crawl4ai",
+    "playwright",
+    "langchain_community",
+    "langchain_chroma",
+    "deepagents",
+    "langchain_ollama",
+)
+# Seconds for `import deep_agent` plus get_available_tools(), interpreter startup excluded.
+IMPORT_BUDGET = float(os.environ.get("DEEP_AGENT_IMPORT_BUDGET", "1.5"))
+
+SCRIPT = f"""
+import json, sys, time
+start = time.perf_counter()
+import deep_agent
+from deep_agent.tools import get_available_tools
+tools = get_available_tools()
+elapsed = time.perf_counter() - start
+heavy = [m for m in {HEAVY_MODULES!r} if m in sys.modules]
+print(json.dumps({{"elapsed": elapsed, "heavy": heavy, "tools": len(tools)}}))
+"""
+
+
+def measure() -> dict:
+    output = subprocess.run(
+        [sys.executable, "-c", SCRIPT], capture_output=True, text=True, check=True
+    ).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def test_import_does_not_load_heavy_backends():
+    """Test that no heavy backend is imported before a tool runs."""
+    result = measure()
+
+    assert result["heavy"] == []
+    assert result["tools"] > 0
+    print("✓ Lazy import test passed")
+
+
+def test_import_time_within_budget():
+    """Test that importing the package and building the tool list is fast."""
+    elapsed = min(measure()["elapsed"] for _ in range(3))
+
+    assert elapsed < IMPORT_BUDGET, f"import took {elapsed:.2f}s (budget {IMPORT_BUDGET}s)"
+    print(f"✓ Import time test passed ({elapsed:.2f}s)")
@@ -0,0 +1,108 @@
+"""
+Tests for per-turn tool retrieval middleware.
+"""
+
+import asyncio
+
+from langchain.agents.middleware import ModelRequest
+from langchain_core.embeddings import Embeddings
+from langchain_core.messages import AIMessage, HumanMessage, ToolMessage
+from langchain_core.tools import tool
+from deep_agent.core.tool_retrieval import ToolRetrievalMiddleware
+from deep_agent.tools.registry import get_available_tools
+
+VOCABULARY = ["scrape", "page", "browser", "click", "search", "index", "collection"]
+
+
+class KeywordEmbeddings(Embeddings):
+    """Embeds text as keyword counts, so similarity is predictable."""
+
+    def __init__(self):
+        self.document_calls = 0
+
+    def embed_documents(self, texts):
+        self.document_calls += 1
+        return [self.embed_query(text) for text in texts]
+
+    def embed_query(self, text):
+        words = text.lower().replace("_", " ")
+        return [float(words.count(word)) for word in VOCABULARY]
+
+
+@tool
+def write_todos(todos: list[str]) -> str:
+    """Built-in planning tool."""
+    return "ok"
+
+
+def make_request(*messages):
+    return ModelRequest(
+        model=None, messages=list(messages), tools=[*get_available_tools(), write_todos]
+    )
+
+
+def bound(middleware, request):
+    captured = {}
+
+    def handler(request):
+        captured["tools"] = [tool.name for tool in request.tools]
+        return "response"
+
+    assert middleware.wrap_model_call(request, handler) == "response"
+    return captured["tools"]
+
+
+def test_binds_relevant_and_pinned_tools():
+    """Test that only the closest tools, pinned tools and built-ins are bound."""
+    embeddings = KeywordEmbeddings()
+    middleware = ToolRetrievalMiddleware(
+        get_available_tools(), embeddings=embeddings, top_k=2, pinned=["web_scraper"]
+    )
+
+    names = bound(middleware, make_request(HumanMessage("Click the button in the browser")))
+
+    assert "click_element" in names and "web_scraper" in names and "write_todos" in names
+    assert "semantic_search" not in names
+    assert len(names) <= 4
+    bound(middleware, make_request(HumanMessage("Search the index collection")))
+    assert embeddings.document_calls == 1
+    assert middleware.stats()["schema_tokens_saved"] > 0
+    print("✓ Tool retrieval test passed")
+
+
+def test_falls_back_to_all_tools():
+    """Test that an unrelated query or an embedding failure binds every tool."""
+    middleware = ToolRetrievalMiddleware(get_available_tools(), embeddings=KeywordEmbeddings())
+    request = make_request(HumanMessage("Hello there"))
+
+    assert len(bound(middleware, request)) == len(request.tools)
+
+    class BrokenEmbeddings(KeywordEmbeddings):
+        def embed_query(self, text):
+            raise ConnectionError("ollama down")
+
+    broken = ToolRetrievalMiddleware(get_available_tools(), embeddings=BrokenEmbeddings())
+    assert len(bound(broken, make_request(HumanMessage("search")))) == len(request.tools)
+    assert middleware.stats()["fallbacks"] == 1
+    print("✓ Tool retrieval fallback test passed")
+
+
+def test_keeps_tools_from_previous_step():
+    """Test that tools called in the last step stay bound for follow-up calls."""
+    middleware = ToolRetrievalMiddleware(
+        get_available_tools(), embeddings=KeywordEmbeddings(), top_k=1
+    )
+    call = {"name": "navigate_browser", "args": {"url": "https://a.test"}, "id": "1"}
+    request = make_request(
+        HumanMessage("Search the index"),
+        AIMessage("", tool_calls=[call]),
+        ToolMessage("ok", tool_call_id="1"),
+    )
+
+    async def handler(request):
+        return [tool.name for tool in request.tools]
+
+    names = asyncio.run(middleware.awrap_model_call(request, handler))
+
+    assert "navigate_browser" in names and "semantic_search" not in names
+    print("✓ Previous step tools test passed")
@@ -0,0 +1,37 @@
+"""
+Shared fixtures for the storage tests.
+"""
+
+import pytest
+from langchain_core.embeddings import DeterministicFakeEmbedding
+from deep_agent.config.settings import SearchConfig
+from deep_agent.storage.pool import VectorStorePool
+
+
+@pytest.fixture
+def make_pool(tmp_path):
+    """Return a factory for pools in a temporary directory, closed after the test.
+
+    Pools use fake embeddings and no embedding cache unless told otherwise;
+    keyword arguments other than ``embeddings`` are SearchConfig fields.
+    """
+    pools = []
+
+    def factory(embeddings=None, **config):
+        pool = VectorStorePool(
+            persist_directory=str(tmp_path / "chroma"),
+            config=SearchConfig(**{"embedding_cache_size": 0, **config}),
+            embeddings=embeddings or DeterministicFakeEmbedding(size=8),
+        )
+        pools.append(pool)
+        return pool
+
+    yield factory
+    for pool in pools:
+        pool.close()
+
+
+@pytest.fixture
+def pool(make_pool):
+    """Create a pool backed by a temporary directory and fake embeddings."""
+    return make_pool()
@@ -0,0 +1,179 @@
+"""
+Tests for the SQLite checkpointer.
+"""
+
+import asyncio
+import operator
+import os
+import sqlite3
+import tempfile
+from typing import Annotated, TypedDict
+
+import pytest
+from langgraph.graph import END, START, StateGraph
+from loguru import logger
+from deep_agent.config.settings import Settings
+from deep_agent.core.exceptions import BackendError
+from deep_agent.storage.checkpointer import (
+    SqliteCheckpointer,
+    close_checkpointers,
+    get_checkpointer,
+)
+
+
+class State(TypedDict):
+    messages: Annotated[list[str], operator.add]
+
+
+def build_graph(checkpointer):
+    builder = StateGraph(State)
+    builder.add_node("echo", lambda state: {"messages": [f"echo {state['messages'][-1]}"]})
+    builder.add_edge(START, "echo")
+    builder.add_edge("echo", END)
+    return builder.compile(checkpointer=checkpointer)
+
+
+@pytest.fixture
+def db_path():
+    with tempfile.TemporaryDirectory() as directory:
+        yield os.path.join(directory, "checkpoints.sqlite3")
+
+
+def thread(thread_id):
+    return {"configurable": {"thread_id": thread_id}}
+
+
+def test_threads_survive_restart(db_path):
+    """Test that conversation state is read back by a new checkpointer instance."""
+    checkpointer = SqliteCheckpointer(db_path, flush_interval=60)
+    graph = build_graph(checkpointer)
+    graph.invoke({"messages": ["hi"]}, thread("t1"))
+    graph.invoke({"messages": ["again"]}, thread("t1"))
+    graph.invoke({"messages": ["other"]}, thread("t2"))
+    checkpointer.close()
+
+    reopened = SqliteCheckpointer(db_path)
+    state = build_graph(reopened).get_state(thread("t1"))
+
+    assert state.values["messages"] == ["hi", "echo hi", "again", "echo again"]
+    assert len(list(reopened.list(thread("t1"), limit=2))) == 2
+    inputs = list(reopened.list(thread("t1"), filter={"source": "input"}, limit=2))
+    assert len(inputs) == 2
+    assert all(item.metadata["source"] == "input" for item in inputs)
+    assert reopened.stats()["threads"] == 2
+    reopened.close()
+    print("✓ Checkpoint restart test passed")
+
+
+def test_writes_are_batched(db_path):
+    """Test that writes are buffered until a read, a full batch or a flush."""
+    checkpointer = SqliteCheckpointer(db_path, flush_interval=60, batch_size=10_000)
+    graph = build_graph(checkpointer)
+
+    graph.invoke({"messages": ["hi"]}, thread("t1"))
+    assert checkpointer.stats()["pending"] > 0
+
+    assert checkpointer.get_tuple(thread("t1")) is not None
+    assert checkpointer.stats()["pending"] == 0
+    assert checkpointer.flushes <= 2
+    checkpointer.close()
+    print("✓ Batched write test passed")
+
+
+class FailingConnection:
+    """Connection stand-in whose statements fail like a locked or full disk."""
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        return False
+
+    def execute(self, *args):
+        raise sqlite3.OperationalError("disk I/O error")
+
+
+def test_failed_flush_keeps_writes(db_path):
+    """Test that writes stay pending after a failed flush and are written by the next."""
+    checkpointer = SqliteCheckpointer(db_path, flush_interval=60, batch_size=10_000)
+    build_graph(checkpointer).invoke({"messages": ["hi"]}, thread("t1"))
+    pending = checkpointer.stats()["pending"]
+    assert pending > 0
+
+    conn, checkpointer._conn = checkpointer._conn, FailingConnection()
+    with pytest.raises(BackendError):
+        checkpointer.flush()
+    checkpointer._conn = conn
+
+    assert checkpointer.stats()["pending"] == pending
+    assert checkpointer.flush() == pending
+    assert checkpointer.get_tuple(thread("t1")) is not None
+    checkpointer.close()
+    print("✓ Failed flush retry test passed")
+
+
+def test_retention_and_ttl(db_path):
+    """Test that compaction keeps the newest checkpoints and drops idle threads."""
+    checkpointer = SqliteCheckpointer(db_path, keep_last=2)
+    graph = build_graph(checkpointer)
+    for i in range(4):
+        graph.invoke({"messages": [f"m{i}"]}, thread("t1"))
+    graph.invoke({"messages": ["old"]}, thread("idle"))
+    before = len(list(checkpointer.list(thread("t1"))))
+
+    result = checkpointer.compact()
+
+    assert result["pruned"] > 0
+    assert len(list(checkpointer.list(thread("t1")))) == 2 < before
+    assert graph.get_state(thread("t1")).values["messages"][-1] == "echo m3"
+
+    checkpointer.thread_ttl = 60
+    checkpointer.conn.execute("UPDATE threads SET updated_at = 0 WHERE thread_id = 'idle'")
+    assert checkpointer.compact()["expired_threads"] == 1
+    assert checkpointer.get_tuple(thread("idle")) is None
+    assert checkpointer.get_tuple(thread("t1")) is not None
+    checkpointer.close()
+    print("✓ Retention test passed")
+
+
+def test_async_graph(db_path):
+    """Test that the async checkpointer API works with an async graph run."""
+    checkpointer = SqliteCheckpointer(db_path)
+    graph = build_graph(checkpointer)
+
+    async def run():
+        await graph.ainvoke({"messages": ["hi"]}, thread("t1"))
+        return await graph.aget_state(thread("t1"))
+
+    assert asyncio.run(run()).values["messages"] == ["hi", "echo hi"]
+    checkpointer.close()
+    print("✓ Async checkpointer test passed")
+
+
+def test_get_checkpointer_from_settings(db_path):
+    """Test that settings select the SQLite checkpointer and share one per path."""
+    settings = Settings(checkpointer={"type": "sqlite", "path": db_path})
+
+    assert get_checkpointer(Settings()) is None
+    assert get_checkpointer(settings) is get_checkpointer(settings)
+    close_checkpointers()
+    print("✓ Checkpointer settings test passed")
+
+
+def test_conflicting_checkpointer_config_warns(db_path):
+    """Test that a second config for an open database path is reported, not applied."""
+    warnings: list[str] = []
+    sink = logger.add(warnings.append, level="WARNING")
+    try:
+        first = get_checkpointer(Settings(checkpointer={"type": "sqlite", "path": db_path}))
+        second = get_checkpointer(
+            Settings(checkpointer={"type": "sqlite", "path": db_path, "keep_last": 3})
+        )
+    finally:
+        logger.remove(sink)
+
+    assert second is first
+    assert first.keep_last != 3
+    assert any("already open" in message for message in warnings)
+    close_checkpointers()
+    print("✓ Conflicting checkpointer config test passed")
@@ -7,18 +7,18 @@ from deep_agent.storage.chroma import ChromaStorage, initialize_chroma
 from deep_agent.core.exceptions import BackendError
 
 
-def test_chroma_initialization():
+def test_chroma_initialization(tmp_path):
     """Test ChromaDB initialization."""
-    storage = ChromaStorage(persist_directory="./test_data/chroma")
+    storage = ChromaStorage(persist_directory=str(tmp_path / "chroma"))
     storage.initialize()
     assert storage.client is not None
     storage.close()
     print("✓ ChromaDB initialized successfully")
 
 
-def test_get_collection():
+def test_get_collection(tmp_path):
     """Test getting a collection."""
-    storage = initialize_chroma("./test_data/chroma")
+    storage = initialize_chroma(str(tmp_path / "chroma"))
     collection = storage.get_collection("test_collection")
     assert collection.name == "test_collection"
     storage.close()
@@ -0,0 +1,70 @@
+"""
+Tests for chunking and duplicate removal.
+"""
+
+from deep_agent.storage.chunking import MarkdownChunker, MinHashDeduplicator, chunk_documents
+
+PAGE = (
+    """# Guide
+
+Intro paragraph about the library.
+
+## Install
+
+Run pip install example. """
+    + " ".join(f"Installation step {i} is described." for i in range(40))
+    + """
+
+## Usage
+
+```python
+# not a heading
+example.run()
+```
+"""
+)
+
+
+def test_chunks_respect_size_and_headings():
+    """Test that chunks stay within the size limit and record their heading path."""
+    chunker = MarkdownChunker(chunk_size=300, chunk_overlap=50)
+    chunks = chunker.split_text(PAGE)
+
+    assert all(len(text) <= 300 for _, text in chunks)
+    assert any(path == "Guide > Install" for path, _ in chunks)
+    assert any("# not a heading" in text for _, text in chunks)
+    assert not any(path.endswith("not a heading") for path, _ in chunks)
+    print("✓ Chunk size and headings test passed")
+
+
+def test_chunk_metadata_links_parent():
+    """Test that chunks carry parent-document metadata."""
+    result = chunk_documents([PAGE], [{"source": "guide"}], chunk_size=300, chunk_overlap=50)
+    metadata = [c.metadata for c in result.chunks]
+
+    assert len({m["parent_id"] for m in metadata}) == 1
+    assert all(m["source"] == "guide" for m in metadata)
+    assert [m["chunk_index"] for m in metadata] == list(range(len(metadata)))
+    print("✓ Parent metadata test passed")
+
+
+def test_exact_and_near_duplicates_dropped():
+    """Test that mirrored and lightly edited pages are skipped."""
+    original = " ".join(f"word{i}" for i in range(200))
+    near = original.replace("word150", "changed150")
+
+    result = chunk_documents([original, "  " + original, near], chunk_size=5000, chunk_overlap=0)
+
+    assert len(result.chunks) == 1
+    assert result.exact_duplicates == 1
+    assert result.near_duplicates == 1
+    print("✓ Duplicate removal test passed")
+
+
+def test_distinct_texts_kept():
+    """Test that unrelated texts are not flagged as duplicates."""
+    dedup = MinHashDeduplicator(threshold=0.8)
+
+    assert dedup.check("Python is a high-level programming language") is None
+    assert dedup.check("JavaScript is used for web development") is None
+    print("✓ Distinct texts test passed")
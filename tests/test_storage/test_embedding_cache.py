@@ -0,0 +1,81 @@
+"""
+Tests for the content-addressed embedding cache.
+"""
+
+import pytest
+from langchain_core.embeddings import DeterministicFakeEmbedding
+from deep_agent.storage.embedding_cache import CachedEmbeddings
+
+
+class CountingEmbeddings(DeterministicFakeEmbedding):
+    """Fake embeddings that count how many texts reach the model."""
+
+    calls: int = 0
+
+    def embed_documents(self, texts):
+        self.calls += len(texts)
+        return super().embed_documents(texts)
+
+    def embed_query(self, text):
+        self.calls += 1
+        return super().embed_query(text)
+
+
+def test_duplicate_texts_embedded_once(tmp_path):
+    """Test that duplicates and whitespace variants hit the cache."""
+    base = CountingEmbeddings(size=8)
+    cache = CachedEmbeddings(base, "fake", cache_path=str(tmp_path / "cache.sqlite3"))
+
+    first = cache.embed_documents(["hello world", "hello  world ", "other"])
+    second = cache.embed_documents(["hello world"])
+
+    assert base.calls == 2
+    assert first[0] == first[1] == second[0]
+    assert cache.stats()["hits"] == 1
+    assert cache.stats()["misses"] == 2
+    cache.close()
+    print("✓ Duplicate text caching test passed")
+
+
+def test_disk_tier_survives_restart(tmp_path):
+    """Test that vectors are served from disk by a fresh cache instance."""
+    path = str(tmp_path / "cache.sqlite3")
+    first = CachedEmbeddings(CountingEmbeddings(size=8), "fake", cache_path=path)
+    vector = first.embed_query("persisted text")
+    first.close()
+
+    base = CountingEmbeddings(size=8)
+    second = CachedEmbeddings(base, "fake", cache_path=path, max_memory_entries=1)
+    restored = second.embed_documents(["persisted text"])[0]
+
+    assert base.calls == 0
+    assert second.stats()["disk_hits"] == 1
+    assert restored == pytest.approx(vector, rel=1e-6)
+    second.close()
+    print("✓ Disk tier test passed")
+
+
+def test_model_name_is_part_of_key():
+    """Test that different models never share cached vectors."""
+    base = CountingEmbeddings(size=8)
+    CachedEmbeddings(base, "model-a").embed_query("text")
+    CachedEmbeddings(base, "model-b").embed_query("text")
+
+    assert base.calls == 2
+    print("✓ Model key test passed")
+
+
+@pytest.mark.asyncio
+async def test_async_embeddings_share_cache(tmp_path):
+    """Test that async embedding calls read and fill the same cache."""
+    base = CountingEmbeddings(size=8)
+    cache = CachedEmbeddings(base, "fake", cache_path=str(tmp_path / "cache.sqlite3"))
+
+    documents = await cache.aembed_documents(["alpha", "beta"])
+    query = await cache.aembed_query("gamma")
+
+    assert cache.embed_documents(["alpha", "beta"]) == documents
+    assert cache.embed_query("gamma") == query
+    assert base.calls == 3
+    cache.close()
+    print("✓ Async embedding cache test passed")
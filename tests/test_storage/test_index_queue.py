@@ -0,0 +1,88 @@
+"""
+Tests for the background index queue.
+"""
+
+import threading
+import time
+
+import pytest
+from langchain_core.embeddings import DeterministicFakeEmbedding
+from deep_agent.core.exceptions import BackendError
+from deep_agent.storage.index_queue import IndexQueue
+
+
+class GatedEmbeddings:
+    """Fake embeddings that wait for a gate before embedding."""
+
+    def __init__(self):
+        self.gate = threading.Event()
+        self.fake = DeterministicFakeEmbedding(size=8)
+
+    def embed_documents(self, texts):
+        self.gate.wait(5)
+        return self.fake.embed_documents(texts)
+
+    def embed_query(self, text):
+        return self.fake.embed_query(text)
+
+
+@pytest.fixture
+def pool(make_pool):
+    """Create a pool with gated fake embeddings, releasing the gate on teardown."""
+    embeddings = GatedEmbeddings()
+    yield make_pool(embeddings=embeddings)
+    embeddings.gate.set()
+
+
+def test_documents_indexed_in_background(pool):
+    """Test that submitted documents are chunked and upserted by the workers."""
+    pool.embeddings.gate.set()
+    index_queue = IndexQueue(pool, max_size=4)
+
+    job = index_queue.submit(
+        "# Page\n\nSome scraped text.", "queue_test", {"url": "https://a.test/"}, "https://a.test/"
+    )
+    assert index_queue.join(timeout=10)
+
+    assert index_queue.get(job.id).status == "done"
+    assert job.chunks_added == 1
+    stored = pool.get_collection("queue_test").get(include=["metadatas"])
+    assert stored["metadatas"][0]["url"] == "https://a.test/"
+    assert index_queue.status()["done"] == 1
+    index_queue.close()
+    print("✓ Background indexing test passed")
+
+
+def test_full_queue_applies_backpressure(pool):
+    """Test that a full queue rejects after the put timeout and recovers."""
+    index_queue = IndexQueue(pool, max_size=1, put_timeout=0.1)
+
+    index_queue.submit("first document", "queue_full")  # taken by the worker, blocked on the gate
+    while index_queue.status()["running"] == 0:
+        time.sleep(0.01)
+    index_queue.submit("second document", "queue_full")  # fills the queue
+    with pytest.raises(BackendError, match="full"):
+        index_queue.submit("third document", "queue_full")
+    assert index_queue.status()["rejected"] == 1
+    assert index_queue.status()["queued"] == 1  # the rejected job is not left behind
+
+    pool.embeddings.gate.set()
+    assert index_queue.join(timeout=10)
+    assert index_queue.status()["done"] == 2
+    index_queue.close()
+    print("✓ Backpressure test passed")
+
+
+def test_close_does_not_block_on_full_queue(pool):
+    """Test that close gives up after its timeout when the queue stays full."""
+    index_queue = IndexQueue(pool, max_size=1, put_timeout=0.1)
+    index_queue.submit("first document", "queue_close")
+    while index_queue.status()["running"] == 0:
+        time.sleep(0.01)
+    index_queue.submit("second document", "queue_close")
+
+    start = time.monotonic()
+    index_queue.close(timeout=0.2)
+
+    assert time.monotonic() - start < 2
+    print("✓ Close on full queue test passed")
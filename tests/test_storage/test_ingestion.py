@@ -0,0 +1,144 @@
+"""
+Tests for the batched ingestion pipeline.
+"""
+
+import pytest
+from langchain_core.embeddings import DeterministicFakeEmbedding
+from deep_agent.storage.ingestion import IngestionPipeline
+
+
+class FlakyEmbeddings(DeterministicFakeEmbedding):
+    """Fake embeddings that fail for batches containing a marker text."""
+
+    def embed_documents(self, texts):
+        if "FAIL" in texts:
+            raise RuntimeError("model unavailable")
+        return super().embed_documents(texts)
+
+
+@pytest.fixture
+def pool(make_pool):
+    """Create a pool whose embeddings fail for batches containing a marker text."""
+    return make_pool(embeddings=FlakyEmbeddings(size=8))
+
+
+def test_batches_are_upserted(pool):
+    """Test that all batches are embedded and written."""
+    seen = []
+    pipeline = IngestionPipeline(pool, batch_size=3, upsert_chunk_size=4, on_batch=seen.append)
+    texts = [f"document number {i}" for i in range(10)]
+
+    report = pipeline.run(texts, collection_name="ingest_test")
+
+    assert report.added == 10
+    assert len(report.batches) == 4
+    assert len(seen) == 4
+    assert pool.get_collection("ingest_test").count() == 10
+    print("✓ Batched ingestion test passed")
+
+
+def test_failed_batch_keeps_others(pool):
+    """Test that one failing batch does not discard the rest."""
+    pipeline = IngestionPipeline(pool, batch_size=2)
+    texts = ["alpha", "beta", "FAIL", "gamma", "delta"]
+
+    report = pipeline.run(texts, collection_name="ingest_partial")
+
+    assert report.added == 3
+    assert report.failed == 2
+    assert report.failed_batches[0].index == 1
+    assert "model unavailable" in report.failed_batches[0].error
+    assert pool.get_collection("ingest_partial").count() == 3
+    print("✓ Partial ingestion test passed")
+
+
+def test_metadata_length_mismatch(pool):
+    """Test that mismatched metadata is rejected up front."""
+    with pytest.raises(ValueError):
+        IngestionPipeline(pool).run(["a", "b"], metadatas=[{"k": "v"}])
+    print("✓ Metadata mismatch test passed")
+
+
+def test_unchanged_documents_skipped(pool):
+    """Test that re-ingesting identical content embeds nothing new."""
+    pipeline = IngestionPipeline(pool)
+    texts = ["first page content", "second page content"]
+
+    pipeline.run(texts, collection_name="ingest_incremental")
+    report = pipeline.run(texts + ["third page content"], collection_name="ingest_incremental")
+
+    assert report.unchanged == 2
+    assert report.added == 1
+    assert pool.get_collection("ingest_incremental").count() == 3
+    print("✓ Incremental upsert test passed")
+
+
+def test_source_key_replaces_previous_version(pool):
+    """Test that a keyed source is updated in place and stale chunks are removed."""
+    pool.config = pool.config.model_copy(update={"chunk_size": 200, "chunk_overlap": 0})
+    pipeline = IngestionPipeline(pool)
+    long_page = "\n\n".join(f"Paragraph {i} " + "text " * 30 for i in range(4))
+
+    first = pipeline.run([long_page], "ingest_keyed", source_keys=["https://x"], chunk=True)
+    second = pipeline.run(["Short page"], "ingest_keyed", source_keys=["https://x"], chunk=True)
+
+    collection = pool.get_collection("ingest_keyed")
+    assert first.added == 4
+    assert second.added == 1
+    assert second.removed == 3
+    assert collection.get()["ids"] == ["https://x#0"]
+    assert collection.get()["documents"] == ["Short page"]
+    print("✓ Source key replacement test passed")
+
+
+def test_deduplicated_chunks_removed_on_update(pool):
+    """Test that chunks whose slot becomes a duplicate are removed on re-ingestion."""
+    pool.config = pool.config.model_copy(
+        update={"chunk_size": 200, "chunk_overlap": 0, "dedup_threshold": 0}
+    )
+    pipeline = IngestionPipeline(pool)
+    a, b, c = ("Alpha " + "one " * 30, "Beta " + "two " * 30, "Gamma " + "three " * 30)
+    keys = ["https://x", "https://y"]
+    pipeline.run(
+        ["\n\n".join([a, b, c]), "Other page"], "ingest_dedup", source_keys=keys, chunk=True
+    )
+
+    report = pipeline.run(["\n\n".join([a, a, c]), a], "ingest_dedup", source_keys=keys, chunk=True)
+
+    stored = pool.get_collection("ingest_dedup").get()
+    assert sorted(stored["ids"]) == ["https://x#0", "https://x#2"]
+    assert report.removed == 2
+    assert all("Beta" not in doc for doc in stored["documents"])
+    print("✓ Deduplicated update test passed")
+
+
+def test_cache_invalidated_after_lexical_write(pool, monkeypatch):
+    """Test that cached results are invalidated only once the lexical index is updated."""
+    events = []
+    lexical = pool.get_lexical_index("ingest_order")
+    add = lexical.add
+    monkeypatch.setattr(lexical, "add", lambda *args: events.append("lexical") or add(*args))
+    invalidate = pool.invalidate
+    monkeypatch.setattr(
+        pool, "invalidate", lambda *args: events.append("invalidate") or invalidate(*args)
+    )
+
+    IngestionPipeline(pool).run(["some text"], collection_name="ingest_order")
+
+    assert events == ["lexical", "invalidate"]
+    print("✓ Invalidation order test passed")
+
+
+def test_failed_update_keeps_previous_version(pool):
+    """Test that stale chunks survive when the new version fails to embed."""
+    pool.config = pool.config.model_copy(update={"chunk_size": 200, "chunk_overlap": 0})
+    pipeline = IngestionPipeline(pool)
+    long_page = "\n\n".join(f"Paragraph {i} " + "text " * 30 for i in range(4))
+    pipeline.run([long_page], "ingest_failed_update", source_keys=["https://x"], chunk=True)
+
+    report = pipeline.run(["FAIL"], "ingest_failed_update", source_keys=["https://x"], chunk=True)
+
+    assert report.failed == 1
+    assert report.removed == 0
+    assert pool.get_collection("ingest_failed_update").count() == 4
+    print("✓ Failed update test passed")
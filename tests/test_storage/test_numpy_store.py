@@ -0,0 +1,132 @@
+"""
+Tests for the memory-mapped NumPy vector backend.
+"""
+
+import numpy as np
+import pytest
+from langchain_core.embeddings import DeterministicFakeEmbedding
+from deep_agent.config.settings import Settings
+from deep_agent.core.exceptions import BackendError
+from deep_agent.storage.numpy_store import NumpyStorage
+from deep_agent.storage.pool import VectorStorePool
+from deep_agent.storage.search import search_collection
+
+
+@pytest.fixture
+def storage(tmp_path):
+    """Create an initialized NumPy storage in a temporary directory."""
+    storage = NumpyStorage(persist_directory=str(tmp_path))
+    storage.initialize()
+    yield storage
+    storage.close()
+
+
+def test_exact_top_k(storage):
+    """Test that queries return the exact nearest neighbours by cosine."""
+    rng = np.random.default_rng(0)
+    vectors = rng.normal(size=(200, 16)).astype(np.float32)
+    collection = storage.get_collection("vectors")
+    collection.upsert(ids=[f"doc{i}" for i in range(200)], embeddings=vectors)
+
+    query = rng.normal(size=16)
+    results = collection.query(query_embeddings=[query], n_results=5)
+
+    normalized = vectors / np.linalg.norm(vectors, axis=1, keepdims=True)
+    expected = np.argsort(-(normalized @ (query / np.linalg.norm(query))))[:5]
+    assert results["ids"][0] == [f"doc{i}" for i in expected]
+    assert results["distances"][0] == sorted(results["distances"][0])
+    print("✓ Exact top-k test passed")
+
+
+def test_persistence_and_delete(tmp_path):
+    """Test that vectors and metadata survive reopening and deletes free slots."""
+    storage = NumpyStorage(persist_directory=str(tmp_path))
+    storage.initialize()
+    collection = storage.get_collection("persisted")
+    collection.upsert(
+        ids=["a", "b", "c"],
+        embeddings=[[1, 0], [0, 1], [1, 1]],
+        documents=["alpha", "beta", "gamma"],
+        metadatas=[{"n": 1}, {"n": 2}, {"n": 3}],
+    )
+    collection.delete(ids=["b"])
+    storage.close()
+
+    storage.initialize()
+    reopened = storage.get_collection("persisted")
+    assert reopened.count() == 2
+    assert reopened.get()["documents"] == ["alpha", "gamma"]
+
+    with pytest.raises(ValueError, match="At least one of ids"):
+        reopened.delete()
+    assert reopened.count() == 2
+
+    reopened.upsert(ids=["d"], embeddings=[[0, 1]], documents=["delta"])
+    result = reopened.query(query_embeddings=[[0, 1]], n_results=1)
+    assert result["ids"][0] == ["d"]
+    assert result["documents"][0] == ["delta"]
+    storage.close()
+    print("✓ Persistence test passed")
+
+
+def test_filters(storage):
+    """Test that metadata and document filters restrict results."""
+    collection = storage.get_collection("filtered")
+    collection.upsert(
+        ids=["a", "b", "c"],
+        embeddings=[[1, 0], [1, 0.1], [1, 0.2]],
+        documents=["python guide", "rust guide", "python tips"],
+        metadatas=[{"lang": "py", "year": 2023}, {"lang": "rs", "year": 2024}, {"lang": "py"}],
+    )
+
+    result = collection.query(query_embeddings=[[1, 0]], n_results=3, where={"lang": "py"})
+    assert result["ids"][0] == ["a", "c"]
+
+    found = collection.get(
+        where={"$and": [{"lang": "py"}, {"year": {"$gte": 2023}}]},
+        where_document={"$contains": "guide"},
+    )
+    assert found["ids"] == ["a"]
+
+    with pytest.raises(BackendError):
+        collection.get(where={"lang": {"$like": "p%"}})
+    print("✓ Filter test passed")
+
+
+def test_float16_and_dimension_check(tmp_path):
+    """Test float16 storage and rejection of mismatched dimensions."""
+    storage = NumpyStorage(persist_directory=str(tmp_path), dtype="float16")
+    storage.initialize()
+    collection = storage.get_collection("half")
+    collection.upsert(ids=["a"], embeddings=[[0.6, 0.8]])
+
+    assert collection.get(include=["embeddings"])["embeddings"].dtype == np.float32
+    assert collection.dtype == np.float16
+    with pytest.raises(BackendError):
+        collection.upsert(ids=["b"], embeddings=[[1, 0, 0]])
+    storage.close()
+    print("✓ Float16 test passed")
+
+
+def test_pool_selects_numpy_backend(tmp_path):
+    """Test that the pool uses the NumPy backend when configured."""
+    settings = Settings()
+    settings.backend.persist_directory = str(tmp_path)
+    settings.backend.vector_store = "numpy"
+    pool = VectorStorePool.from_settings(settings)
+    pool._base_embeddings = DeterministicFakeEmbedding(size=8)
+    embeddings = pool.embeddings
+
+    collection = pool.get_collection("pooled")
+    collection.upsert(
+        ids=["x", "y"],
+        embeddings=embeddings.embed_documents(["first text", "second text"]),
+        documents=["first text", "second text"],
+    )
+    hits = search_collection(pool, "second text", "pooled", n_results=1)
+
+    assert isinstance(pool.get_storage(), NumpyStorage)
+    assert hits[0].id == "y"
+    assert [s.name for s in pool.collection_stats()] == ["pooled"]
+    pool.close()
+    print("✓ Pool backend selection test passed")
@@ -0,0 +1,79 @@
+"""
+Tests for the shared vector store pool.
+"""
+
+
+def test_collection_handle_is_reused(pool):
+    """Test that repeated lookups return the same collection handle."""
+    first = pool.get_collection("pool_collection")
+    second = pool.get_collection("pool_collection")
+
+    assert first is second
+    assert pool.get_storage() is pool.get_storage()
+    print("✓ Collection handle reuse test passed")
+
+
+def test_lru_eviction(make_pool):
+    """Test that least recently used handles are evicted beyond the bound."""
+    pool = make_pool(max_open_collections=2)
+    first = pool.get_collection("collection_a")
+    pool.get_collection("collection_b")
+    pool.get_collection("collection_a")
+    pool.get_collection("collection_c")
+
+    assert pool.get_collection("collection_a") is first
+    assert len(pool._collections) == 2
+    assert (pool.persist_directory, "collection_b") not in pool._collections
+    print("✓ LRU eviction test passed")
+
+
+def test_close_releases_handles(make_pool):
+    """Test that close drops handles and keeps injected embeddings."""
+    pool = make_pool(embedding_cache_size=100)
+    base = pool.embeddings.embeddings
+    pool.get_collection("pool_collection")
+    pool.close()
+
+    assert not pool._collections
+    assert not pool._storages
+    assert pool.embeddings.embeddings is base
+    print("✓ Pool close test passed")
+
+
+def test_collection_stats_cached_until_write(pool):
+    """Test that stats are served from cache and refreshed after a write."""
+    collection = pool.get_collection("stats_collection")
+    collection.upsert(ids=["a"], embeddings=[[0.1] * 8], documents=["first"])
+
+    stats = {s.name: s for s in pool.collection_stats()}
+    assert stats["stats_collection"].count == 1
+    assert stats["stats_collection"].size_bytes > 0
+    assert stats["stats_collection"].last_modified is not None
+
+    collection.upsert(ids=["b"], embeddings=[[0.2] * 8], documents=["second"])
+    assert {s.name: s for s in pool.collection_stats()}["stats_collection"].count == 1
+
+    pool.invalidate("stats_collection")
+    assert {s.name: s for s in pool.collection_stats()}["stats_collection"].count == 2
+    print("✓ Collection stats cache test passed")
+
+
+def test_collection_stats_survive_concurrent_invalidate(pool, monkeypatch):
+    """Test that an invalidation while stats are computed does not break the result."""
+    from deep_agent.storage import pool as pool_module
+
+    for name in ("stats_first", "stats_second"):
+        pool.get_collection(name).upsert(ids=["a"], embeddings=[[0.1] * 8], documents=["doc"])
+    disk_usage = pool_module.disk_usage
+
+    def invalidating_disk_usage(paths):
+        # Runs for one collection after the other's stats were cached.
+        pool.invalidate("stats_first")
+        pool.invalidate("stats_second")
+        return disk_usage(paths)
+
+    monkeypatch.setattr(pool_module, "disk_usage", invalidating_disk_usage)
+
+    stats = {s.name: s.count for s in pool.collection_stats()}
+    assert stats == {"stats_first": 1, "stats_second": 1}
+    print("✓ Collection stats race test passed")
@@ -0,0 +1,42 @@
+"""
+Tests for the query result cache.
+"""
+
+import time
+from deep_agent.storage.result_cache import QueryResultCache
+
+
+def test_generation_invalidates_entries():
+    """Test that bumping a collection's generation invalidates only its entries."""
+    cache = QueryResultCache()
+    cache.put("a", "query", ["hit"])
+    cache.put("b", "query", ["other"])
+    cache.invalidate("a")
+
+    assert cache.get("a", "query") is None
+    assert cache.get("b", "query") == ["other"]
+    print("✓ Generation invalidation test passed")
+
+
+def test_stale_generation_not_stored():
+    """Test that results computed before a write are not cached."""
+    cache = QueryResultCache()
+    generation = cache.generation("a")
+    cache.invalidate("a")
+    cache.put("a", "query", ["old"], generation=generation)
+
+    assert cache.get("a", "query") is None
+    print("✓ Stale generation test passed")
+
+
+def test_ttl_and_size_bounds():
+    """Test that entries expire and the cache stays bounded."""
+    cache = QueryResultCache(max_entries=2, ttl_seconds=0.01)
+    for i in range(3):
+        cache.put("a", i, i)
+
+    assert cache.stats()["entries"] == 2
+    time.sleep(0.02)
+    assert cache.get("a", 2) is None
+    assert cache.stats()["hit_rate"] == 0.0
+    print("✓ TTL and size bound test passed")
@@ -0,0 +1,77 @@
+"""
+Tests for the persistent scrape cache.
+"""
+
+import time
+
+import pytest
+from deep_agent.storage.scrape_cache import ScrapeCache, canonicalize_url
+
+
+@pytest.fixture
+def cache(tmp_path):
+    cache = ScrapeCache(str(tmp_path / "scrape.sqlite3"), default_ttl=60)
+    yield cache
+    cache.close()
+
+
+def test_canonical_url():
+    """Test that equivalent URL spellings share one key."""
+    assert canonicalize_url("HTTPS://Docs.Example.com:443/a?b=2&a=1&utm_source=x#top") == (
+        "https://docs.example.com/a?a=1&b=2"
+    )
+    assert canonicalize_url("http://example.com") == "http://example.com/"
+    assert canonicalize_url("http://example.com:8080/x") == "http://example.com:8080/x"
+    print("✓ URL canonicalization test passed")
+
+
+def test_hit_and_miss(cache):
+    """Test that cached pages are keyed by canonical URL and format."""
+    cache.put("https://example.com/page#intro", "markdown", "# Page", etag='"v1"')
+
+    page = cache.get("https://EXAMPLE.com/page", "markdown")
+
+    assert page.fresh and page.content == "# Page" and page.etag == '"v1"'
+    assert cache.get("https://example.com/page", "text") is None
+    assert cache.stats()["hits"] == 1
+    assert cache.stats()["misses"] == 1
+    print("✓ Cache hit/miss test passed")
+
+
+def test_domain_ttl_and_refresh(tmp_path):
+    """Test per-domain TTLs and refreshing a stale entry after a 304."""
+    cache = ScrapeCache(
+        str(tmp_path / "scrape.sqlite3"),
+        default_ttl=60,
+        domain_ttls={"news.example.com": 0, "example.com": 3600},
+    )
+    cache.put("https://news.example.com/today", "markdown", "news", last_modified="Mon")
+    cache.put("https://docs.example.com/guide", "markdown", "guide")
+
+    stale = cache.get("https://news.example.com/today", "markdown")
+    assert not stale.fresh and stale.revalidatable
+    assert cache.get("https://docs.example.com/guide", "markdown").expires_at > time.time() + 3000
+
+    cache.domain_ttls["news.example.com"] = 60
+    refreshed = cache.refresh(stale)
+    assert refreshed.fresh
+    assert cache.get("https://news.example.com/today", "markdown").fresh
+    assert cache.stats()["revalidated"] == 1
+    cache.close()
+    print("✓ Domain TTL and refresh test passed")
+
+
+def test_size_bounded_eviction(tmp_path):
+    """Test that least recently read pages are evicted beyond max_bytes."""
+    cache = ScrapeCache(str(tmp_path / "scrape.sqlite3"), max_bytes=250)
+    cache.put("https://a.test/", "markdown", "a" * 100)
+    cache.put("https://b.test/", "markdown", "b" * 100)
+    cache.get("https://a.test/", "markdown")
+    cache.put("https://c.test/", "markdown", "c" * 100)
+
+    assert cache.get("https://b.test/", "markdown") is None
+    assert cache.get("https://a.test/", "markdown") is not None
+    assert cache.stats()["evictions"] == 1
+    assert cache.stats()["size_bytes"] == 200
+    cache.close()
+    print("✓ Eviction test passed")
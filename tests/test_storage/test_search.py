@@ -0,0 +1,247 @@
+"""
+Tests for vector, lexical and hybrid search.
+"""
+
+import numpy as np
+import pytest
+from langchain_core.embeddings import DeterministicFakeEmbedding, Embeddings
+from deep_agent.core.exceptions import ToolError
+from deep_agent.storage.ingestion import IngestionPipeline
+from deep_agent.storage.lexical import tokenize
+from deep_agent.storage.ranking import maximal_marginal_relevance, reciprocal_rank_fusion
+from deep_agent.storage.search import resolve_collections, search_collection, search_collections
+
+DOCUMENTS = [
+    "Chroma raised InvalidArgumentError when the collection name was too short",
+    "Upgrade to chromadb 1.4.0 to fix the persistent client",
+    "Embeddings are computed with nomic-embed-text through Ollama",
+    "The agent plans research tasks with write_todos",
+]
+
+
+@pytest.fixture
+def pool(make_pool):
+    """Create a pool with indexed sample documents."""
+    pool = make_pool(embeddings=DeterministicFakeEmbedding(size=16))
+    IngestionPipeline(pool).run(
+        DOCUMENTS,
+        collection_name="search_test",
+        metadatas=[{"topic": "errors"}, {"topic": "releases"}, {"topic": "models"}, None],
+    )
+    return pool
+
+
+def test_tokenize_keeps_identifiers():
+    """Test that identifiers and versions are kept whole and split into parts."""
+    tokens = tokenize("Upgrade chromadb to v1.4.0 after ERR_CONN_RESET")
+
+    assert "v1.4.0" in tokens
+    assert "err_conn_reset" in tokens
+    assert "conn" in tokens
+    print("✓ Tokenizer test passed")
+
+
+def test_lexical_search_matches_exact_terms(pool):
+    """Test that BM25 finds exact identifiers."""
+    hits = search_collection(pool, "InvalidArgumentError", "search_test", mode="lexical")
+
+    assert hits[0].document == DOCUMENTS[0]
+    print("✓ Lexical search test passed")
+
+
+def test_hybrid_search_fuses_rankings(pool):
+    """Test that hybrid mode returns the exact match and respects n_results."""
+    hits = search_collection(pool, "chromadb 1.4.0", "search_test", n_results=2, mode="hybrid")
+
+    assert len(hits) == 2
+    assert DOCUMENTS[1] in [hit.document for hit in hits]
+    print("✓ Hybrid search test passed")
+
+
+def test_lexical_index_rebuilt_when_out_of_sync(pool):
+    """Test that a missing lexical index is rebuilt from the collection."""
+    pool.get_lexical_index("search_test").rebuild([], [])
+
+    hits = search_collection(pool, "write_todos", "search_test", mode="lexical")
+
+    assert hits[0].document == DOCUMENTS[3]
+    print("✓ Lexical index rebuild test passed")
+
+
+def test_lexical_index_checked_only_after_writes(pool, monkeypatch):
+    """Test that queries only compare counts after a write marked the index dirty."""
+    index = pool.get_lexical_index("search_test")
+    search_collection(pool, "write_todos", "search_test", mode="lexical")
+    calls = []
+    monkeypatch.setattr(index, "count", lambda: calls.append(1) or 0)
+
+    search_collection(pool, "chromadb", "search_test", mode="lexical")
+    search_collection(pool, "Ollama", "search_test", mode="hybrid")
+    assert calls == []
+
+    index.mark_dirty()
+    search_collection(pool, "Ollama", "search_test", mode="lexical")
+    search_collection(pool, "agent", "search_test", mode="lexical")
+    assert len(calls) == 1
+    print("✓ Lexical index dirty check test passed")
+
+
+def test_reciprocal_rank_fusion_weights():
+    """Test that weights shift the fused ranking."""
+    fused = reciprocal_rank_fusion([["a", "b"], ["b", "a"]], weights=[2.0, 1.0])
+
+    assert [item for item, _ in fused] == ["a", "b"]
+    print("✓ Rank fusion test passed")
+
+
+def test_unknown_mode(pool):
+    """Test that an unknown search mode is rejected."""
+    with pytest.raises(ToolError):
+        search_collection(pool, "query", "search_test", mode="fuzzy")
+    print("✓ Unknown mode test passed")
+
+
+def test_unknown_option_rejected(pool):
+    """Test that misspelled search options are reported instead of ignored."""
+    with pytest.raises(ToolError, match="fetch_K"):
+        search_collection(pool, "query", "search_test", fetch_K=3)
+    with pytest.raises(ToolError, match="fetch_K"):
+        search_collections(pool, "query", ["search_test"], fetch_K=3)
+    print("✓ Unknown option test passed")
+
+
+def test_repeat_query_served_from_cache(pool):
+    """Test that repeat queries hit the result cache until the collection changes."""
+    first = search_collection(pool, "write_todos", "search_test", mode="hybrid")
+    second = search_collection(pool, "  write_todos ", "search_test", mode="hybrid")
+
+    assert [h.id for h in first] == [h.id for h in second]
+    assert pool.result_cache.stats()["hits"] == 1
+
+    IngestionPipeline(pool).run(["write_todos is also documented here"], "search_test")
+    third = search_collection(pool, "write_todos", "search_test", mode="hybrid")
+
+    assert pool.result_cache.stats()["hits"] == 1
+    assert len(third) == len(first) + 1
+    print("✓ Result cache invalidation test passed")
+
+
+def test_fan_out_across_collections(pool):
+    """Test that a glob pattern searches all matching collections with one embedding."""
+    IngestionPipeline(pool).run(["write_todos appears in project notes"], "search_notes")
+
+    hits = search_collections(pool, "write_todos", "search_*", n_results=3, mode="hybrid")
+
+    assert {hit.collection for hit in hits} == {"search_test", "search_notes"}
+    assert hits == sorted(hits, key=lambda hit: hit.score, reverse=True)
+    assert set(resolve_collections(pool, "search_*")) == {"search_test", "search_notes"}
+    assert resolve_collections(pool, ["search_test", "search_test"]) == ["search_test"]
+    print("✓ Fan-out search test passed")
+
+
+def test_lexical_fan_out_fuses_by_rank(pool):
+    """Test that BM25 scores from differently sized collections are merged by rank."""
+    big = [f"filler document number {i}" for i in range(18)] + ["zeta one", "zeta two"]
+    IngestionPipeline(pool).run(big, "rank_big")
+    IngestionPipeline(pool).run(["zeta three", "zeta four"], "rank_small")
+
+    hits = search_collections(pool, "zeta", ["rank_big", "rank_small"], n_results=2, mode="lexical")
+
+    assert {hit.collection for hit in hits} == {"rank_big", "rank_small"}
+    print("✓ Lexical fan-out fusion test passed")
+
+
+def test_filters_are_pushed_down(pool):
+    """Test that metadata and document filters apply in every mode."""
+    for mode in ("vector", "lexical", "hybrid"):
+        hits = search_collection(
+            pool, "chromadb collection", "search_test", mode=mode, where={"topic": "releases"}
+        )
+        assert [hit.document for hit in hits] == [DOCUMENTS[1]]
+
+    hits = search_collection(
+        pool, "agent", "search_test", where_document={"$contains": "write_todos"}
+    )
+    assert [hit.document for hit in hits] == [DOCUMENTS[3]]
+    print("✓ Filter pushdown test passed")
+
+
+def test_metadata_only_projection(pool):
+    """Test that documents are not fetched when only metadata is requested."""
+    hits = search_collection(pool, "chromadb", "search_test", include_documents=False)
+
+    assert hits and all(hit.document == "" for hit in hits)
+    assert any(hit.metadata.get("topic") == "releases" for hit in hits)
+    print("✓ Metadata projection test passed")
+
+
+def test_maximal_marginal_relevance_prefers_distinct_candidates():
+    """Test that MMR skips a near-duplicate of an already selected candidate."""
+    embeddings = np.array([[1.0, 0.0], [0.99, 0.01], [0.0, 1.0]])
+    relevance = [1.0, 0.95, 0.6]
+
+    assert maximal_marginal_relevance(relevance, embeddings, k=2, lambda_mult=1.0) == [0, 1]
+    assert maximal_marginal_relevance(relevance, embeddings, k=2, lambda_mult=0.5) == [0, 2]
+    assert maximal_marginal_relevance(relevance, embeddings, k=5) == [0, 2, 1]
+    print("✓ MMR selection test passed")
+
+
+def test_maximal_marginal_relevance_matches_greedy_definition():
+    """Test that the vectorized MMR picks the same ids as a step-by-step greedy selection."""
+    rng = np.random.default_rng(0)
+    embeddings = rng.normal(size=(100, 32))
+    relevance = rng.random(100)
+    unit = embeddings / np.linalg.norm(embeddings, axis=1, keepdims=True)
+    similarity = unit @ unit.T
+
+    expected = [int(np.argmax(relevance))]
+    while len(expected) < 10:
+        scores = {
+            i: 0.5 * relevance[i] - 0.5 * max(similarity[i][j] for j in expected)
+            for i in range(100)
+            if i not in expected
+        }
+        expected.append(max(scores, key=scores.get))
+
+    assert maximal_marginal_relevance(relevance, embeddings, k=10) == expected
+    print("✓ MMR reference test passed")
+
+
+class KeywordEmbeddings(Embeddings):
+    """Embeds texts by keyword counts and counts document embedding calls."""
+
+    KEYWORDS = ("chroma", "error", "release")
+
+    def __init__(self):
+        self.document_calls = 0
+
+    def embed_documents(self, texts: list[str]) -> list[list[float]]:
+        self.document_calls += 1
+        return [self.embed_query(text) for text in texts]
+
+    def embed_query(self, text: str) -> list[float]:
+        words = text.lower().split()
+        return [float(words.count(keyword)) + 0.01 for keyword in self.KEYWORDS]
+
+
+def test_diversity_option(make_pool):
+    """Test that diversity re-ranks over stored embeddings without re-embedding documents."""
+    embeddings = KeywordEmbeddings()
+    pool = make_pool(embeddings=embeddings)
+    IngestionPipeline(pool).run(
+        ["chroma error first", "chroma error second", "chroma release notes"],
+        collection_name="diverse",
+    )
+    calls = embeddings.document_calls
+
+    plain = search_collection(pool, "chroma error", "diverse", n_results=2)
+    diverse = search_collection(pool, "chroma error", "diverse", n_results=2, diversity=0.8)
+    merged = search_collections(
+        pool, "chroma error", ["diverse", "dive*"], n_results=2, diversity=0.8
+    )
+
+    assert {h.document for h in plain} == {"chroma error first", "chroma error second"}
+    assert "chroma release notes" in [h.document for h in diverse]
+    assert [h.id for h in merged] == [h.id for h in diverse]
+    assert embeddings.document_calls == calls
+    print("✓ Diversity option test passed")
@@ -0,0 +1,87 @@
+"""
+Tests for the async tool variants.
+"""
+
+import asyncio
+
+import pytest
+from langchain_core.embeddings import DeterministicFakeEmbedding
+from deep_agent.config.settings import SearchConfig
+from deep_agent.storage.pool import VectorStorePool
+from deep_agent.tools import scraper
+from deep_agent.tools.crawler_pool import CrawlerPool
+from deep_agent.tools import semantic_search as search_tools
+from deep_agent.utils.async_utils import run_sync
+
+
+@pytest.fixture
+def offline_pool(tmp_path, monkeypatch):
+    """Route the search tools to a temporary pool with fake embeddings."""
+    pool = VectorStorePool(
+        persist_directory=str(tmp_path / "chroma"),
+        config=SearchConfig(),
+        embeddings=DeterministicFakeEmbedding(size=16),
+    )
+    monkeypatch.setattr(search_tools, "get_vectorstore_pool", lambda: pool)
+    yield pool
+    pool.close()
+
+
+class FakeCrawler:
+    """Stand-in for AsyncWebCrawler that returns a canned page."""
+
+    async def start(self):
+        return self
+
+    async def close(self):
+        pass
+
+    async def arun(self, url, config=None):
+        await asyncio.sleep(0)
+        return type("Result", (), {"success": True, "markdown": f"# {url}", "cleaned_html": ""})
+
+
+@pytest.mark.asyncio
+async def test_run_sync_inside_running_loop():
+    """Test that sync wrappers work while an event loop is running."""
+
+    async def answer():
+        return 42
+
+    assert run_sync(answer()) == 42
+    print("✓ run_sync test passed")
+
+
+@pytest.mark.asyncio
+async def test_search_tools_async(offline_pool):
+    """Test the async search tools through the tool interface."""
+    added = await search_tools.add_to_search_index_tool.ainvoke(
+        {"texts": ["Async tools avoid blocking the event loop"], "collection_name": "async_test"}
+    )
+    found = await search_tools.semantic_search_tool.ainvoke(
+        {"query": "event loop", "collection_name": "async_test"}
+    )
+    listed = await search_tools.list_search_collections_tool.ainvoke({})
+
+    assert "Successfully added" in added
+    assert "Async tools avoid blocking" in found
+    assert "async_test" in listed
+    print("✓ Async search tools test passed")
+
+
+@pytest.mark.asyncio
+async def test_web_scraper_async_and_sync(monkeypatch):
+    """Test that the scraper runs natively async and its sync wrapper works in a loop."""
+    pool = CrawlerPool(crawler_factory=FakeCrawler)
+    monkeypatch.setattr(scraper, "get_crawler_pool", lambda: pool)
+    monkeypatch.setattr(scraper, "get_scrape_cache", lambda: None)
+
+    results = await asyncio.gather(
+        scraper.web_scraper_tool.ainvoke({"url": "https://a.test"}),
+        scraper.web_scraper_tool.ainvoke({"url": "https://b.test"}),
+    )
+
+    assert results == ["# https://a.test", "# https://b.test"]
+    assert scraper.web_scraper_tool.invoke({"url": "https://c.test"}) == "# https://c.test"
+    pool.close()
+    print("✓ Async web scraper test passed")
@@ -0,0 +1,165 @@
+"""
+Tests for the persistent browser manager and the browser tools.
+"""
+
+import asyncio
+
+import pytest
+from deep_agent.config.settings import BrowserToolsConfig
+from deep_agent.tools import browser
+from deep_agent.tools.browser_manager import BrowserManager
+
+
+class FakeResponse:
+    def __init__(self, url):
+        self.url = url
+        self.status = 200
+
+
+class FakePage:
+    def __init__(self):
+        self.url = "about:blank"
+        self.closed = False
+
+    def is_closed(self):
+        return self.closed
+
+    async def goto(self, url, wait_until=None):
+        await asyncio.sleep(0.01)
+        self.url = url
+        return FakeResponse(url)
+
+
+class FakeContext:
+    def __init__(self):
+        self.pages = []
+        self.closed = False
+
+    def set_default_timeout(self, timeout):
+        self.timeout = timeout
+
+    async def route(self, pattern, handler):
+        self.handler = handler
+
+    async def new_page(self):
+        page = FakePage()
+        self.pages.append(page)
+        return page
+
+    async def close(self):
+        self.closed = True
+
+
+class FakeBrowser:
+    def __init__(self):
+        self.contexts = []
+
+    def is_connected(self):
+        return True
+
+    async def new_context(self):
+        await asyncio.sleep(0.01)
+        context = FakeContext()
+        self.contexts.append(context)
+        return context
+
+    async def close(self):
+        pass
+
+
+@pytest.fixture
+def manager():
+    fake = FakeBrowser()
+
+    async def launcher(headless):
+        return None, fake
+
+    manager = BrowserManager(
+        BrowserToolsConfig(max_contexts=2, max_pages_per_context=2), launcher=launcher
+    )
+    manager.fake = fake
+    yield manager
+    manager.close()
+
+
+async def goto(page, url):
+    await page.goto(url)
+    return page
+
+
+def test_threads_get_own_contexts(manager):
+    """Test that one browser serves several threads, each with its own context."""
+    first = manager.run_sync("t1", lambda page: goto(page, "https://a.test/"))
+    again = manager.run_sync("t1", lambda page: asyncio.sleep(0, page))
+    other = manager.run_sync("t2", lambda page: asyncio.sleep(0, page))
+
+    assert again is first and again.url == "https://a.test/"
+    assert other is not first and other.url == "about:blank"
+    assert manager.launches == 1
+    assert manager.stats()["contexts"] == 2
+    assert manager.fake.contexts[0].handler == manager.policy.handle
+    print("✓ Per-thread context test passed")
+
+
+def test_concurrent_calls_use_page_pool(manager):
+    """Test that concurrent calls in one thread get separate pages up to the limit."""
+
+    async def burst():
+        return await asyncio.gather(
+            *(
+                manager.run("t1", lambda page, i=i: goto(page, f"https://a.test/{i}"))
+                for i in range(4)
+            )
+        )
+
+    pages = asyncio.run(burst())
+
+    assert len({id(page) for page in pages}) == 2
+    assert len(manager.fake.contexts[0].pages) == 2
+    print("✓ Page pool test passed")
+
+
+def test_concurrent_first_calls_share_context(manager):
+    """Test that concurrent first calls for a thread create a single context."""
+
+    async def burst():
+        return await asyncio.gather(
+            *(manager.run("t1", lambda page: asyncio.sleep(0.01, page)) for _ in range(3))
+        )
+
+    asyncio.run(burst())
+
+    assert len(manager.fake.contexts) == 1
+    assert manager.stats()["contexts"] == 1
+    print("✓ Concurrent context creation test passed")
+
+
+def test_idle_contexts_evicted(manager):
+    """Test LRU eviction beyond max_contexts and TTL eviction of idle contexts."""
+    for thread_id in ("t1", "t2", "t3"):
+        manager.run_sync(thread_id, lambda page: asyncio.sleep(0))
+
+    assert manager.fake.contexts[0].closed
+    assert manager.stats()["contexts"] == 2
+
+    manager.config.context_ttl = 0
+    manager.run_sync("t4", lambda page: asyncio.sleep(0))
+    assert manager.stats()["contexts"] == 1
+    assert manager.evictions == 3
+    print("✓ Context eviction test passed")
+
+
+def test_tools_bound_to_thread(manager, monkeypatch):
+    """Test that browser tools act on the calling thread's context."""
+    monkeypatch.setattr(browser, "get_browser_manager", lambda: manager)
+    tools = {tool.name: tool for tool in browser.get_browser_tools()}
+    t1 = {"configurable": {"thread_id": "t1"}}
+    t2 = {"configurable": {"thread_id": "t2"}}
+
+    result = tools["navigate_browser"].invoke({"url": "https://a.test/"}, config=t1)
+
+    assert result == "Navigating to https://a.test/ returned status code 200"
+    assert tools["current_webpage"].invoke({}, config=t1) == "https://a.test/"
+    assert asyncio.run(tools["current_webpage"].ainvoke({}, config=t2)) == "about:blank"
+    assert "scheme" in tools["navigate_browser"].invoke({"url": "file:///etc/passwd"}, config=t1)
+    print("✓ Thread-bound browser tools test passed")
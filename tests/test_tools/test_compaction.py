@@ -0,0 +1,118 @@
+"""
+Tests for token-budgeted page compaction.
+"""
+
+from deep_agent.tools import scraper
+from deep_agent.tools.compaction import compact, estimate_tokens, strip_boilerplate
+
+PAGE = """Skip to content
+[Home](/)
+[Docs](/docs)
+[Blog](/blog)
+[Pricing](/pricing)
+
+# Guide
+
+Intro paragraph with a [link](https://example.com/x) inside.
+
+## Installation
+
+{install}
+
+## Configuration
+
+{config}
+
+## Troubleshooting
+
+{trouble}
+
+© 2024 Example Inc. All rights reserved.
+"""
+
+
+def make_page() -> str:
+    return PAGE.format(
+        install="Run pip install example to install the package. " * 40,
+        config="Set the timeout option in the config file to tune timeouts. " * 40,
+        trouble="If the crawler hangs, restart the browser and clear the cache. " * 40,
+    )
+
+
+def test_strip_boilerplate():
+    """Test that navigation, link lists and footers are removed."""
+    cleaned = strip_boilerplate(make_page())
+
+    assert "Skip to content" not in cleaned
+    assert "©" not in cleaned
+    assert "[4 links: Home · Docs · Blog · Pricing]" in cleaned
+    assert "with a link inside" in cleaned
+    assert "https://example.com/x" not in cleaned
+    print("✓ Boilerplate stripping test passed")
+
+
+def test_compact_keeps_budget_and_outline():
+    """Test that compaction fits the budget and keeps omitted headings."""
+    page = make_page()
+    result = compact(page, max_tokens=700)
+
+    assert result.compacted
+    assert result.tokens <= 700
+    assert result.original_tokens == estimate_tokens(page)
+    assert "Run pip install" in result.text
+    assert "## Troubleshooting\n*(section omitted)*" in result.text
+    assert result.omitted_sections >= 1
+    print("✓ Compaction budget test passed")
+
+
+def test_compact_focus_ranks_sections():
+    """Test that a focus query keeps the most relevant section."""
+    result = compact(make_page(), max_tokens=700, focus="crawler hangs browser")
+
+    assert "restart the browser" in result.text
+    assert "## Installation\n*(section omitted)*" in result.text
+    assert result.text.index("## Installation") < result.text.index("## Troubleshooting")
+    print("✓ Focus ranking test passed")
+
+
+class PagePool:
+    async def run(self, fn):
+        return type(
+            "Result",
+            (),
+            {
+                "success": True,
+                "markdown": make_page(),
+                "cleaned_html": "",
+                "response_headers": {},
+            },
+        )
+
+
+def test_scraper_compacts_and_saves_full_text(monkeypatch):
+    """Test that the scraper compacts long pages and points at the full text."""
+    saved = {}
+    monkeypatch.setattr(scraper, "get_scrape_cache", lambda: None)
+    monkeypatch.setattr(scraper, "get_crawler_pool", lambda: PagePool())
+    monkeypatch.setattr(
+        scraper, "_save_full_text", lambda path, content: saved.setdefault(path, content)
+    )
+
+    output = scraper._scrape_webpage("https://example.com/guide/setup", max_tokens=700)
+
+    assert saved == {"/scrapes/example.com/guide-setup.md": make_page()}
+    assert "Full text saved to /scrapes/example.com/guide-setup.md" in output
+    assert estimate_tokens(output) < estimate_tokens(make_page())
+    assert scraper._scrape_webpage("https://example.com/guide", max_tokens=0) == make_page()
+    print("✓ Scraper compaction test passed")
+
+
+def test_full_text_not_saved_outside_agent(monkeypatch):
+    """Test the fallback note when no agent filesystem is available."""
+    monkeypatch.setattr(scraper, "get_scrape_cache", lambda: None)
+    monkeypatch.setattr(scraper, "get_crawler_pool", lambda: PagePool())
+
+    output = scraper._scrape_webpage("https://example.com/guide", max_tokens=700)
+
+    assert output.endswith("Scrape again with max_tokens=0 for the full page.]")
+    print("✓ Fallback note test passed")
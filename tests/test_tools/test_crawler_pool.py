@@ -0,0 +1,101 @@
+"""
+Tests for the warm crawler pool.
+"""
+
+import asyncio
+import threading
+
+import pytest
+from deep_agent.config.settings import ScraperConfig
+from deep_agent.tools.crawler_pool import CrawlerPool
+
+
+class FakeCrawler:
+    """Crawler stand-in that records the loop it runs on."""
+
+    instances: list["FakeCrawler"] = []
+
+    def __init__(self):
+        self.closed = False
+        self.thread = None
+        FakeCrawler.instances.append(self)
+
+    async def start(self):
+        self.thread = threading.current_thread()
+
+    async def close(self):
+        self.closed = True
+
+    async def arun(self, url, config=None):
+        await asyncio.sleep(0.01)
+        if url == "boom":
+            raise RuntimeError("browser crashed")
+        return url
+
+
+@pytest.fixture(autouse=True)
+def reset_instances():
+    FakeCrawler.instances = []
+
+
+def make_pool(**config) -> CrawlerPool:
+    return CrawlerPool(
+        config=ScraperConfig(max_memory_percent=0, **config), crawler_factory=FakeCrawler
+    )
+
+
+def test_crawler_reused_across_calls():
+    """Test that sequential scrapes share one started crawler on the background loop."""
+    pool = make_pool(crawler_pool_size=2)
+
+    results = [pool.run_sync(lambda c, u=u: c.arun(u)) for u in ("a", "b", "c")]
+
+    assert results == ["a", "b", "c"]
+    assert pool.stats()["started"] == 1
+    assert FakeCrawler.instances[0].thread is not threading.current_thread()
+    pool.close()
+    assert FakeCrawler.instances[0].closed
+    print("✓ Crawler reuse test passed")
+
+
+def test_concurrency_bounded_by_pool_size():
+    """Test that concurrent leases never start more crawlers than slots."""
+    pool = make_pool(crawler_pool_size=2)
+
+    async def scrape_many():
+        return await asyncio.gather(*(pool.run(lambda c, i=i: c.arun(str(i))) for i in range(6)))
+
+    assert asyncio.run(scrape_many()) == [str(i) for i in range(6)]
+    assert pool.stats()["started"] == 2
+    pool.close()
+    print("✓ Pool bound test passed")
+
+
+def test_recycle_after_page_limit_and_error():
+    """Test that crawlers are recycled after max pages and after a crash."""
+    pool = make_pool(crawler_pool_size=1, max_pages_per_crawler=2)
+
+    for url in ("a", "b", "c"):
+        pool.run_sync(lambda c, u=url: c.arun(u))
+    with pytest.raises(RuntimeError):
+        pool.run_sync(lambda c: c.arun("boom"))
+    pool.run_sync(lambda c: c.arun("d"))
+
+    assert pool.stats()["recycled"] == 2
+    assert pool.stats()["started"] == 3
+    assert [crawler.closed for crawler in FakeCrawler.instances] == [True, True, False]
+    pool.close()
+    print("✓ Crawler recycle test passed")
+
+
+def test_recycle_when_memory_high(monkeypatch):
+    """Test that a crawler is recycled when memory use crosses the threshold."""
+    pool = make_pool(crawler_pool_size=1)
+    monkeypatch.setattr(pool, "_memory_high", lambda: True)
+
+    pool.run_sync(lambda c: c.arun("a"))
+
+    assert pool.stats()["recycled"] == 1
+    assert pool.stats()["warm"] == 0
+    pool.close()
+    print("✓ Memory recycle test passed")
@@ -0,0 +1,60 @@
+"""
+Tests for lazy tool proxies.
+"""
+
+import asyncio
+
+from langchain_core.runnables import RunnableConfig
+from langchain_core.tools import StructuredTool
+from pydantic import BaseModel
+from deep_agent.tools import registry
+from deep_agent.tools.lazy import LazyTool
+
+
+class EchoInput(BaseModel):
+    text: str
+
+
+def _echo(text: str, config: RunnableConfig) -> str:
+    """Echo text with the calling thread."""
+    return f"{text} ({config['configurable']['thread_id']})"
+
+
+async def _aecho(text: str, config: RunnableConfig) -> str:
+    """Echo text with the calling thread."""
+    return f"async {text} ({config['configurable']['thread_id']})"
+
+
+echo_tool = StructuredTool.from_function(
+    func=_echo, coroutine=_aecho, name="echo", args_schema=EchoInput
+)
+
+
+def test_proxies_match_real_tools(monkeypatch):
+    """Test that every proxy advertises its real tool's name, description and schema."""
+    monkeypatch.setattr(registry, "_available_tools", None)
+    for proxy in registry.get_available_tools():
+        assert not proxy.loaded
+        real = proxy.load()
+        assert real.name == proxy.name
+        assert real.description == proxy.description
+        assert (
+            real.tool_call_schema.model_json_schema() == proxy.tool_call_schema.model_json_schema()
+        )
+    print("✓ Proxy schema test passed")
+
+
+def test_proxy_forwards_calls_with_config():
+    """Test that a proxy loads its target on first call and forwards the config."""
+    proxy = LazyTool(
+        name="echo",
+        description="Echo text",
+        args_schema=EchoInput,
+        target=f"{__name__}:echo_tool",
+    )
+    config = {"configurable": {"thread_id": "t1"}}
+
+    assert proxy.invoke({"text": "hi"}, config=config) == "hi (t1)"
+    assert proxy.loaded
+    assert asyncio.run(proxy.ainvoke({"text": "hi"}, config=config)) == "async hi (t1)"
+    print("✓ Proxy forwarding test passed")
@@ -0,0 +1,94 @@
+"""
+Tests for the request-blocking resource policy.
+"""
+
+import asyncio
+
+from deep_agent.config.settings import BrowserToolsConfig
+from deep_agent.tools.crawler_pool import CrawlerPool
+from deep_agent.tools.resource_policy import ResourcePolicy
+
+
+class FakeRequest:
+    def __init__(self, url, resource_type):
+        self.url = url
+        self.resource_type = resource_type
+
+
+class FakeRoute:
+    def __init__(self, url, resource_type):
+        self.request = FakeRequest(url, resource_type)
+        self.outcome = None
+
+    async def abort(self):
+        self.outcome = "aborted"
+
+    async def continue_(self):
+        self.outcome = "continued"
+
+
+def route(policy, url, resource_type):
+    fake = FakeRoute(url, resource_type)
+    asyncio.run(policy.handle(fake))
+    return fake.outcome
+
+
+def test_blocks_types_and_domains():
+    """Test blocking by resource type and domain, never the page document."""
+    policy = ResourcePolicy.from_config(BrowserToolsConfig())
+
+    assert route(policy, "https://site.test/logo.png", "image") == "aborted"
+    assert route(policy, "https://www.googletagmanager.com/gtm.js", "script") == "aborted"
+    assert route(policy, "https://site.test/app.js", "script") == "continued"
+    assert route(policy, "https://doubleclick.net/", "document") == "continued"
+    stats = policy.stats()
+    assert stats["blocked"] == {"resource_type": 1, "domain": 1}
+    assert stats["allowed"] == 2
+    assert stats["estimated_bytes_saved"] > 0
+    assert ResourcePolicy.from_config(BrowserToolsConfig(block_resources=False)) is None
+    print("✓ Type and domain blocking test passed")
+
+
+class FakeStrategy:
+    def __init__(self):
+        self.hooks = {}
+
+    def set_hook(self, name, hook):
+        self.hooks[name] = hook
+
+
+class FakeCrawler:
+    def __init__(self):
+        self.crawler_strategy = FakeStrategy()
+
+    async def start(self):
+        pass
+
+    async def close(self):
+        pass
+
+
+class FakePage:
+    async def route(self, pattern, handler):
+        self.handler = handler
+
+
+def test_crawler_pages_use_policy():
+    """Test that pooled crawlers install the policy on every new page."""
+    crawlers = []
+
+    def factory():
+        crawlers.append(FakeCrawler())
+        return crawlers[-1]
+
+    policy = ResourcePolicy(blocked_resource_types=["image"])
+    pool = CrawlerPool(crawler_factory=factory, policy=policy)
+
+    pool.run_sync(lambda crawler: asyncio.sleep(0))
+    hook = crawlers[0].crawler_strategy.hooks["on_page_context_created"]
+    page = FakePage()
+    assert pool._background.run(hook(page, context=None)) is page
+    assert page.handler == policy.handle
+    assert pool.stats()["requests"]["allowed"] == 0
+    pool.close()
+    print("✓ Crawler policy hook test passed")
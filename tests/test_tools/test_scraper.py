@@ -0,0 +1,195 @@
+"""
+Tests for the web scraper tools.
+"""
+
+import asyncio
+
+import pytest
+from deep_agent.storage.index_queue import IndexJob
+from deep_agent.storage.scrape_cache import ScrapeCache
+from deep_agent.tools import scraper
+from deep_agent.tools.crawler_pool import DomainLimitedDispatcher
+
+
+class CountingPool:
+    """Crawler pool stand-in that counts crawls."""
+
+    def __init__(self):
+        self.crawls = 0
+
+    async def run(self, fn):
+        self.crawls += 1
+        return type(
+            "Result",
+            (),
+            {
+                "success": True,
+                "markdown": f"# crawl {self.crawls}",
+                "cleaned_html": "",
+                "response_headers": {"ETag": '"abc"'},
+            },
+        )
+
+
+@pytest.fixture
+def setup(tmp_path, monkeypatch):
+    cache = ScrapeCache(str(tmp_path / "scrape.sqlite3"), default_ttl=60)
+    pool = CountingPool()
+    monkeypatch.setattr(scraper, "get_scrape_cache", lambda: cache)
+    monkeypatch.setattr(scraper, "get_crawler_pool", lambda: pool)
+    yield cache, pool
+    cache.close()
+
+
+def test_repeat_scrape_served_from_cache(setup):
+    """Test that a second scrape of the same page does not crawl."""
+    cache, pool = setup
+
+    first = scraper._scrape_webpage("https://example.com/docs")
+    second = scraper._scrape_webpage("https://example.com/docs#section")
+
+    assert first == second == "# crawl 1"
+    assert pool.crawls == 1
+    assert cache.get("https://example.com/docs", "markdown").etag == '"abc"'
+    print("✓ Scrape cache hit test passed")
+
+
+def test_stale_page_revalidated(setup, monkeypatch):
+    """Test that a 304 refreshes a stale page and a change triggers a crawl."""
+    cache, pool = setup
+    cache.default_ttl = 0
+    scraper._scrape_webpage("https://example.com/docs")
+
+    monkeypatch.setattr(scraper, "_not_modified", lambda page, timeout: True)
+    assert scraper._scrape_webpage("https://example.com/docs") == "# crawl 1"
+    assert pool.crawls == 1
+
+    monkeypatch.setattr(scraper, "_not_modified", lambda page, timeout: False)
+    assert scraper._scrape_webpage("https://example.com/docs") == "# crawl 2"
+    assert pool.crawls == 2
+    assert cache.stats()["revalidated"] == 1
+    print("✓ Revalidation test passed")
+
+
+class FakeBatchCrawler:
+    """Crawler stand-in that tracks per-domain concurrency."""
+
+    def __init__(self, delays=None):
+        self.delays = delays or {}
+        self.active: dict[str, int] = {}
+        self.peak: dict[str, int] = {}
+        self.calls: list[str] = []
+
+    async def arun(self, url, config=None, session_id=None):
+        domain = url.split("/")[2]
+        self.calls.append(url)
+        self.active[domain] = self.active.get(domain, 0) + 1
+        self.peak[domain] = max(self.peak.get(domain, 0), self.active[domain])
+        try:
+            await asyncio.sleep(self.delays.get(url, 0.01))
+        finally:
+            self.active[domain] -= 1
+        success = "fail" not in url
+        return type(
+            "Result",
+            (),
+            {
+                "success": success,
+                "markdown": f"content of {url}",
+                "cleaned_html": "",
+                "response_headers": {},
+                "status_code": 200 if success else 500,
+                "error_message": "" if success else "HTTP 500",
+            },
+        )
+
+    async def arun_many(self, urls, config=None, dispatcher=None):
+        results = await dispatcher.run_urls(crawler=self, urls=urls, config=config)
+        return [task.result for task in results]
+
+
+class BatchPool:
+    def __init__(self, crawler):
+        self.crawler = crawler
+
+    async def run(self, fn):
+        return await fn(self.crawler)
+
+
+def test_dispatcher_limits_domains_and_times_out():
+    """Test per-domain concurrency and that a slow URL fails alone."""
+    crawler = FakeBatchCrawler(delays={"https://slow.test/": 5})
+    dispatcher = DomainLimitedDispatcher(max_concurrency=4, per_domain_limit=2, url_timeout=0.2)
+    urls = [f"https://a.test/{i}" for i in range(6)] + ["https://slow.test/", "https://b.test/"]
+
+    results = asyncio.run(
+        dispatcher.run_urls(crawler=crawler, urls=urls, config=scraper._run_config())
+    )
+
+    assert [task.url for task in results] == urls
+    assert crawler.peak["a.test"] == 2
+    assert not results[6].result.success
+    assert "Timed out" in results[6].error_message
+    assert all(task.result.success for i, task in enumerate(results) if i != 6)
+    print("✓ Dispatcher limits test passed")
+
+
+def test_dispatcher_timeout_excludes_queueing():
+    """Test that time spent waiting for a global slot does not count as a timeout."""
+    urls = [f"https://site{i}.test/" for i in range(3)]
+    crawler = FakeBatchCrawler(delays={url: 0.15 for url in urls})
+    dispatcher = DomainLimitedDispatcher(max_concurrency=1, per_domain_limit=1, url_timeout=0.3)
+
+    results = asyncio.run(
+        dispatcher.run_urls(crawler=crawler, urls=urls, config=scraper._run_config())
+    )
+
+    assert all(task.result.success for task in results)
+    assert all(not task.error_message for task in results)
+    print("✓ Dispatcher queueing test passed")
+
+
+def test_batch_tool_orders_results_and_reports_failures(setup, monkeypatch):
+    """Test input-ordered output, per-URL failures, duplicates and cache reuse."""
+    cache, _ = setup
+    crawler = FakeBatchCrawler()
+    monkeypatch.setattr(scraper, "get_crawler_pool", lambda: BatchPool(crawler))
+    cache.put("https://cached.test/", "markdown", "from cache")
+
+    urls = ["https://b.test/", "https://cached.test/", "https://fail.test/", "https://b.test/"]
+    output = scraper.web_scraper_batch_tool.invoke({"urls": urls})
+
+    assert output.startswith("Scraped 2 of 3 URLs (1 failed)")
+    assert output.index("[1] https://b.test/") < output.index("[2] https://cached.test/")
+    assert "from cache" in output
+    assert "## [3] https://fail.test/\n\nError: HTTP 500" in output
+    assert output.count("content of https://b.test/") == 2
+    assert crawler.calls == ["https://b.test/", "https://fail.test/"]
+    print("✓ Batch tool test passed")
+
+
+class RecordingQueue:
+    def __init__(self):
+        self.submitted = []
+
+    def submit(self, text, collection_name, metadata=None, source_key=None):
+        self.submitted.append((text, collection_name, source_key))
+        return IndexJob(id=f"job{len(self.submitted)}", collection_name=collection_name)
+
+
+def test_scrape_queues_full_text_for_indexing(setup, monkeypatch):
+    """Test that index_collection hands the page to the index queue, not the model."""
+    index_queue = RecordingQueue()
+    monkeypatch.setattr(scraper, "get_index_queue", lambda: index_queue)
+
+    output = scraper._scrape_webpage(
+        "https://example.com/docs?utm_source=x", index_collection="web"
+    )
+    monkeypatch.setattr(scraper, "get_crawler_pool", lambda: BatchPool(FakeBatchCrawler()))
+    jobs = scraper.scrape_to_index(["https://example.com/other", "https://fail.test/"], "web")
+
+    assert index_queue.submitted[0] == ("# crawl 1", "web", "https://example.com/docs")
+    assert output.endswith("[Indexing into 'web' in the background (job job1)]")
+    assert [job.id for job in jobs] == ["job2"]
+    assert index_queue.submitted[1][0] == "content of https://example.com/other"
+    print("✓ Scrape-to-index test passed")
@@ -0,0 +1,65 @@
+"""
+Tests for semantic search output projection.
+"""
+
+import pytest
+from langchain_core.embeddings import DeterministicFakeEmbedding
+from deep_agent.config.settings import SearchConfig
+from deep_agent.storage.pool import VectorStorePool
+from deep_agent.tools import semantic_search as search_tools
+
+
+@pytest.fixture(autouse=True)
+def offline_pool(tmp_path, monkeypatch):
+    """Route the search tools to a temporary pool with fake embeddings."""
+    pool = VectorStorePool(
+        persist_directory=str(tmp_path / "chroma"),
+        config=SearchConfig(snippet_chars=60),
+        embeddings=DeterministicFakeEmbedding(size=16),
+    )
+    monkeypatch.setattr(search_tools, "get_vectorstore_pool", lambda: pool)
+    yield pool
+    pool.close()
+
+
+def test_snippet_projection():
+    """Test that snippets are cut around the matching term."""
+    long_text = "Filler sentence. " * 20 + "The retry timeout is 30 seconds. " + "More text. " * 20
+    search_tools.add_to_search_index([long_text], collection_name="projection_test")
+
+    result = search_tools.semantic_search(
+        "timeout", collection_name="projection_test", mode="lexical", projection="snippet"
+    )
+
+    assert "timeout" in result
+    assert long_text.strip() not in result
+    print("✓ Snippet projection test passed")
+
+
+def test_metadata_projection():
+    """Test that metadata projection omits document content."""
+    search_tools.add_to_search_index(
+        ["Deep Learning with PyTorch"],
+        collection_name="projection_test",
+        metadata=[{"source": "doc1", "category": "ML"}],
+    )
+
+    result = search_tools.semantic_search(
+        "pytorch",
+        collection_name="projection_test",
+        projection="metadata",
+        metadata_fields=["source"],
+    )
+
+    assert "source: doc1" in result
+    assert "category" not in result
+    assert "Deep Learning" not in result
+    print("✓ Metadata projection test passed")
+
+
+def test_unknown_projection():
+    """Test that an unknown projection is reported."""
+    result = search_tools.semantic_search("query", projection="everything")
+
+    assert "Error searching" in result
+    print("✓ Unknown projection test passed")
@@ -0,0 +1,64 @@
+"""
+Tests for tool selection by name and group.
+"""
+
+import pytest
+from deep_agent.config.models import AgentConfig, ModelConfig
+from deep_agent.core import agent as agent_module
+from deep_agent.core.agent import AgentFactory
+from deep_agent.core.exceptions import ConfigurationError
+from deep_agent.tools.registry import (
+    TOOL_GROUPS,
+    get_tools,
+    log_tool_costs,
+    resolve_tool_names,
+)
+
+
+def test_resolve_groups_and_names():
+    """Test that groups expand to their tools and names keep registry order."""
+    names = resolve_tool_names(["semantic_search", "scrape"])
+
+    assert names == ["web_scraper", "web_scraper_batch", "semantic_search"]
+    assert resolve_tool_names(["browser"]) == TOOL_GROUPS["browser"]
+    assert len(resolve_tool_names([])) == sum(len(group) for group in TOOL_GROUPS.values())
+    print("✓ Tool selection test passed")
+
+
+def test_unknown_tool_rejected():
+    """Test that unknown tool or group names raise a configuration error."""
+    with pytest.raises(ConfigurationError, match="nope"):
+        resolve_tool_names(["search", "nope"])
+    print("✓ Unknown tool test passed")
+
+
+def test_schema_costs():
+    """Test that every bound tool reports a positive schema token cost."""
+    costs = log_tool_costs(get_tools(["search"]))
+
+    assert list(costs) == TOOL_GROUPS["search"]
+    assert all(tokens > 0 for tokens in costs.values())
+    assert costs["semantic_search"] > costs["list_search_collections"]
+    print("✓ Schema cost test passed")
+
+
+def test_create_agent_binds_configured_tools(monkeypatch):
+    """Test that create_agent binds only the tools selected in AgentConfig."""
+    captured = {}
+    monkeypatch.setattr(
+        agent_module, "create_deep_agent", lambda **kwargs: captured.update(kwargs) or object()
+    )
+    config = AgentConfig(
+        model=ModelConfig(model_name="test-model"),
+        system_prompt="Test",
+        tools=["scrape", "semantic_search"],
+    )
+
+    AgentFactory().create_agent(config, use_cache=False)
+
+    assert [tool.name for tool in captured["tools"]] == [
+        "web_scraper",
+        "web_scraper_batch",
+        "semantic_search",
+    ]
+    print("✓ Configured tools test passed")